@@ -4,12 +4,14 @@
 
 import os
 import time
-from typing import Set
+from contextlib import nullcontext
+from typing import Dict, List
 
 from doorstop import common, server
 from doorstop.cli import utilities
-from doorstop.core import editor, exporter, importer, publisher
+from doorstop.core import editor, exporter, importer, publisher, report
 from doorstop.core.builder import build
+from doorstop.core.types import UID
 
 log = common.logger(__name__)
 
@@ -17,55 +19,36 @@ log = common.logger(__name__)
 class CycleTracker:
     """A cycle tracker to detect cyclic references between items.
 
-    The cycle tracker uses a standard algorithm to detect cycles in a directed
-    graph (not necessarily connected) using a depth first search with a bit of
-    graph colouring.  The time complexity is O(|V| + |E|).  The vertices are
-    the items.  The edges are the links between items.
+    The cycles are found once per tree by
+    :meth:`~doorstop.core.tree.Tree.get_cycles`, which searches the
+    graph of links between items for strongly connected components in
+    O(|V| + |E|) time. Each cycle is reported on its first item.
 
     """
 
     def __init__(self):
         """Initialize a cycle tracker."""
-        self.discovered: Set[str] = set()
-        self.finished: Set[str] = set()
-
-    def _dfs_visit(self, uid, tree):
-        """Do a depth first search visit of the specified item.
-
-        :param uid: the UID of the item to visit
-        :param tree: the document hierarchy tree
-
-        :return: generator of :class:`~doorstop.common.DoorstopWarning`
-
-        """
-        self.discovered.add(uid)
-        item = tree.find_item(uid)
-
-        for pid in item.links:
-            # Detect cycles via a back edge
-            if pid in self.discovered:
-                msg = "detected a cycle with a back edge from {} to {}".format(pid, uid)
-                yield common.DoorstopWarning(msg)
-
-            # Recurse, if this a fresh item
-            if pid not in self.discovered and pid not in self.finished:
-                yield from self._dfs_visit(pid, tree)
-
-        self.discovered.remove(uid)
-        self.finished.add(uid)
+        self._tree = None
+        self._cycles: Dict[UID, List[List[UID]]] = {}
 
     def __call__(self, item, document, tree):
-        """Get cycles which include the specified item.
+        """Get cycles which start with the specified item.
 
-        :param item: the UID of the item to get the cycles for
+        :param item: the item to get the cycles for
         :param document: unused
         :param tree: the document hierarchy tree
 
         :return: generator of :class:`~doorstop.common.DoorstopWarning`
 
         """
-        if item not in self.discovered and item not in self.finished:
-            yield from self._dfs_visit(item, tree)
+        if tree is not self._tree:
+            self._tree = tree
+            self._cycles = {}
+            for cycle in tree.get_cycles():
+                self._cycles.setdefault(cycle[0], []).append(cycle)
+        for cycle in self._cycles.get(item.uid, []):
+            path = " -> ".join(str(uid) for uid in cycle)
+            yield common.DoorstopWarning("detected a cycle: {}".format(path))
 
 
 def get(name):
@@ -87,14 +70,33 @@ def run(args, cwd, error, catch=True):  # pylint: disable=W0613
     :param catch: catch and log :class:`~doorstop.common.DoorstopError`
 
     """
+    fmt, path = args.report or (None, None)
+    if fmt and fmt not in report.FORMATS:
+        error("argument --report: invalid format: {}".format(fmt))
+
     with utilities.capture(catch=catch) as success:
         # get the tree
         tree = _get_tree(args, cwd, load=True)
 
+        # limit it to the items affected by changes
+        scope = None
+        if args.since:
+            items = tree.find_changed_items(args.since)
+            scope = {item.path for item in items}
+            count = sum(len(document.items) for document in tree)
+            msg = "skipped {} of {} items unaffected by changes since {}"
+            utilities.show(msg.format(count - len(scope), count, args.since))
+
         # validate it
         utilities.show("validating items...", flush=True)
         cycle_tracker = CycleTracker()
-        valid = tree.validate(skip=args.skip, item_hook=cycle_tracker)
+        with report.collect(path, fmt) if path else nullcontext():
+            valid = tree.validate(
+                skip=args.skip,
+                item_hook=cycle_tracker,
+                workers=args.jobs,
+                scope=scope,
+            )
 
     if not success:
         return False
@@ -287,7 +289,8 @@ def run_reorder(args, cwd, error, catch=True, _tree=None):
         if args.auto:
             msg = "reordering document {}...".format(document)
             utilities.show(msg, flush=True)
-            document.reorder(manual=False)
+            with tree.batch():
+                document.reorder(manual=False)
             reordered = True
 
         # or, reorder from a previously updated index
@@ -296,7 +299,8 @@ def run_reorder(args, cwd, error, catch=True, _tree=None):
             if utilities.ask("reorder from '{}'?".format(relpath)):
                 msg = "reordering document {}...".format(document)
                 utilities.show(msg, flush=True)
-                document.reorder(automatic=not args.manual)
+                with tree.batch():
+                    document.reorder(automatic=not args.manual)
                 reordered = True
             else:
                 del document.index
@@ -394,10 +398,11 @@ def run_clear(args, cwd, error, catch=True):
         else:
             pids = ""
 
-        for item in _iter_items(args, tree, error):
-            msg = "clearing item {}'s suspect links{}...".format(item.uid, pids)
-            utilities.show(msg)
-            item.clear(parents=args.parents)
+        with tree.batch(workers=args.jobs):
+            for item in _iter_items(args, tree, error):
+                msg = "clearing item {}'s suspect links{}...".format(item.uid, pids)
+                utilities.show(msg)
+                item.clear(parents=args.parents)
 
     if not success:
         return False
@@ -417,9 +422,10 @@ def run_review(args, cwd, error, catch=True):
     with utilities.capture(catch=catch) as success:
         tree = _get_tree(args, cwd)
 
-        for item in _iter_items(args, tree, error):
-            utilities.show("marking item {} as reviewed...".format(item.uid))
-            item.review()
+        with tree.batch(workers=args.jobs):
+            for item in _iter_items(args, tree, error):
+                utilities.show("marking item {} as reviewed...".format(item.uid))
+                item.review()
 
     if not success:
         return False
@@ -574,7 +580,7 @@ def run_publish(args, cwd, error, catch=True):
             msg = "publishing tree to '{}'...".format(path)
             utilities.show(msg, flush=True)
             published_path = publisher.publish(
-                tree, path, ext, template=args.template, **kwargs
+                tree, path, ext, template=args.template, jobs=args.jobs, **kwargs
             )
         else:
             msg = "publishing document {} to '{}'...".format(document, path)
@@ -621,7 +627,7 @@ def _get_tree(args, cwd, request_next_number=None, load=False):
 
     if load:
         utilities.show("loading documents...", flush=True)
-        tree.load()
+        tree.load(workers=args.jobs)
 
     return tree
 
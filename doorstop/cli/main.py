@@ -10,7 +10,7 @@ import sys
 
 from doorstop import common, settings
 from doorstop.cli import commands, utilities
-from doorstop.core import document, vcs
+from doorstop.core import cache, document, vcs
 
 log = common.logger(__name__)
 
@@ -34,7 +34,18 @@ def main(args=None):  # pylint: disable=R0915
         help="path to the root of the project",
         default=root,
     )
-    project.add_argument("--no-cache", action="store_true", help=argparse.SUPPRESS)
+    project.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="do not cache documents, items, parsed files, issues, and published files",
+    )
+    project.add_argument(
+        "--jobs",
+        metavar="N",
+        type=int,
+        default=1,
+        help="number of processes used to load, validate, and publish documents",
+    )
     server = argparse.ArgumentParser(add_help=False)
     server.add_argument(
         "--server",
@@ -147,6 +158,19 @@ def main(args=None):  # pylint: disable=R0915
         action="store_true",
         help="display all warning-level issues as errors",
     )
+    parser.add_argument(
+        "--since",
+        metavar="REV",
+        help="only validate items changed since a Git revision "
+        "(and the items linked to or from them)",
+    )
+    parser.add_argument(
+        "--report",
+        nargs=2,
+        metavar=("FORMAT", "PATH"),
+        help="stream issues and the time spent on each check to a report "
+        "(FORMAT: json, jsonl, sarif)",
+    )
 
     # Build sub-parsers
     subs = parser.add_subparsers(help="", dest="command", metavar="<command>")
@@ -176,13 +200,19 @@ def main(args=None):  # pylint: disable=R0915
     # Run the program
     function = commands.get(args.command)
     try:
-        success = function(args, os.getcwd(), parser.error)
+        with vcs.queued():
+            success = function(args, os.getcwd(), parser.error)
     except common.DoorstopFileError as exc:
         log.error(exc)
         success = False
+    except common.DoorstopError as exc:  # from queued version control commands
+        log.error(exc)
+        success = False
     except KeyboardInterrupt:
         log.debug(f"command cancelled: {args}")
         success = False
+    if settings.CACHE_FILES or settings.CACHE_VALIDATION:
+        cache.save()
     if success:
         log.debug("command succeeded: {args}")
     else:
@@ -34,6 +34,9 @@ class SettingsTestCase(unittest.TestCase):
             settings.CACHE_DOCUMENTS,
             settings.CACHE_ITEMS,
             settings.CACHE_PATHS,
+            settings.CACHE_FILES,
+            settings.CACHE_VALIDATION,
+            settings.CACHE_PUBLISH,
             settings.WARN_ALL,
             settings.ERROR_ALL,
             settings.SERVER_HOST,
@@ -54,6 +57,9 @@ class SettingsTestCase(unittest.TestCase):
             settings.CACHE_DOCUMENTS,
             settings.CACHE_ITEMS,
             settings.CACHE_PATHS,
+            settings.CACHE_FILES,
+            settings.CACHE_VALIDATION,
+            settings.CACHE_PUBLISH,
             settings.WARN_ALL,
             settings.ERROR_ALL,
             settings.SERVER_HOST,
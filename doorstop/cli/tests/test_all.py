@@ -69,6 +69,22 @@ class TestMain(SettingsTestCase):
         """Verify 'doorstop' can be called."""
         self.assertIs(None, main([]))
 
+    def test_main_jobs(self):
+        """Verify 'doorstop' can load items in multiple processes."""
+        self.assertIs(None, main(["--jobs", "2"]))
+
+    def test_main_report(self):
+        """Verify 'doorstop' can stream issues to a report."""
+        path = os.path.join(self.temp, "report.jsonl")
+        self.assertIs(None, main(["--report", "jsonl", path]))
+        lines = common.read_lines(path)
+        self.assertIn('"summary": ', list(lines)[-1])
+
+    def test_main_report_error(self):
+        """Verify 'doorstop' returns an error with an unknown report format."""
+        path = os.path.join(self.temp, "report.xml")
+        self.assertRaises(SystemExit, main, ["--report", "xml", path])
+
     def test_main_error(self):
         """Verify 'doorstop' returns an error in an empty directory."""
         os.chdir(self.temp)
@@ -817,6 +833,12 @@ class TestPublish(TempTestCase):
         self.assertTrue(os.path.isdir(path))
         self.assertTrue(os.path.isfile(os.path.join(path, "index.md")))
 
+    def test_publish_tree_jobs(self):
+        """Verify 'doorstop publish' can publish documents in parallel."""
+        path = os.path.join(self.temp, "all")
+        self.assertIs(None, main(["publish", "all", path, "--text", "--jobs", "2"]))
+        self.assertTrue(os.path.isfile(os.path.join(path, "REQ.txt")))
+
     def test_publish_tree_no_path(self):
         """Verify 'doorstop publish' returns an error with no path."""
         self.assertRaises(SystemExit, main, ["publish", "all"])
@@ -843,6 +865,7 @@ class TestPublish(TempTestCase):
         )
 
 
+@patch("doorstop.settings.CACHE_PUBLISH", False)  # restored after main() sets it
 class TestPublishCommand(TempTestCase):
     """Tests 'doorstop publish' options toc and template"""
 
@@ -867,7 +890,7 @@ class TestPublishCommand(TempTestCase):
 
 
 @patch("doorstop.cli.commands.run", Mock(return_value=True))
-class TestLogging(unittest.TestCase):
+class TestLogging(SettingsTestCase):
     """Integration tests for the Doorstop CLI logging."""
 
     def test_verbose_0(self):
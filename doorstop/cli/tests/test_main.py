@@ -3,13 +3,17 @@
 """Unit tests for the doorstop.cli.main module."""
 
 import importlib.util
+import os
+import shutil
 import sys
+import tempfile
 from os import sep
 from unittest.mock import Mock, patch
 
 from doorstop import settings
 from doorstop.cli import main
 from doorstop.cli.tests import SettingsTestCase
+from doorstop.core.builder import _clear_tree
 
 
 class TestMain(SettingsTestCase):
@@ -26,6 +30,25 @@ class TestMain(SettingsTestCase):
         """Verify the CLI can be interrupted."""
         self.assertRaises(SystemExit, main.main, [])
 
+    @patch("doorstop.core.cache.save")
+    @patch("subprocess.call", Mock(side_effect=FileNotFoundError))
+    def test_vcs_error(self, mock_save):
+        """Verify errors from queued version control commands are reported."""
+        cwd = os.getcwd()
+        temp = tempfile.mkdtemp()
+        try:
+            os.chdir(temp)
+            os.mkdir(".git")
+            _clear_tree()
+            with self.assertLogs("doorstop.cli.main", "ERROR") as logs:
+                self.assertRaises(SystemExit, main.main, ["create", "REQ", "./reqs"])
+        finally:
+            os.chdir(cwd)
+            shutil.rmtree(temp)
+            _clear_tree()
+        self.assertIn("Command not found: git", logs.output[0])
+        mock_save.assert_called_once()
+
     @patch("doorstop.cli.commands.run", Mock())
     def test_empty(self):
         """Verify 'doorstop' can be run in a working copy with no docs."""
@@ -40,6 +63,9 @@ class TestMain(SettingsTestCase):
         self.assertTrue(settings.CACHE_DOCUMENTS)
         self.assertTrue(settings.CACHE_ITEMS)
         self.assertTrue(settings.CACHE_PATHS)
+        self.assertTrue(settings.CACHE_FILES)
+        self.assertTrue(settings.CACHE_VALIDATION)
+        self.assertTrue(settings.CACHE_PUBLISH)
         self.assertFalse(settings.WARN_ALL)
         self.assertFalse(settings.ERROR_ALL)
 
@@ -73,6 +99,9 @@ class TestMain(SettingsTestCase):
         self.assertFalse(settings.CACHE_DOCUMENTS)
         self.assertFalse(settings.CACHE_ITEMS)
         self.assertFalse(settings.CACHE_PATHS)
+        self.assertFalse(settings.CACHE_FILES)
+        self.assertFalse(settings.CACHE_VALIDATION)
+        self.assertFalse(settings.CACHE_PUBLISH)
         self.assertTrue(settings.WARN_ALL)
         self.assertTrue(settings.ERROR_ALL)
 
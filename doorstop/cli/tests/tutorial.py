@@ -178,11 +178,11 @@ class TestSection1(TestBase):
 
         cp = self.doorstop()
         self.assertIn(
-            b"WARNING: A: A001: detected a cycle with a back edge from B001 to A001",
+            b"WARNING: A: A001: detected a cycle: A001 -> B001 -> B002 -> A001",
             cp.stderr,
         )
         self.assertIn(
-            b"WARNING: A: A001: detected a cycle with a back edge from A002 to A002",
+            b"WARNING: A: A002: detected a cycle: A002 -> A002",
             cp.stderr,
         )
 
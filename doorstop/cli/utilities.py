@@ -103,6 +103,9 @@ def configure_settings(args):
         settings.CACHE_DOCUMENTS = args.no_cache is False
         settings.CACHE_ITEMS = args.no_cache is False
         settings.CACHE_PATHS = args.no_cache is False
+        settings.CACHE_FILES = args.no_cache is False
+        settings.CACHE_VALIDATION = args.no_cache is False
+        settings.CACHE_PUBLISH = args.no_cache is False
     if args.warn_all is not None:
         settings.WARN_ALL = args.warn_all is True
     if args.error_all is not None:
@@ -4,6 +4,7 @@
 
 import argparse
 import csv
+import filecmp
 import glob
 import io
 import logging
@@ -15,16 +16,20 @@ from importlib.machinery import ModuleSpec
 from importlib.util import module_from_spec, spec_from_file_location
 from pathlib import Path
 from types import ModuleType
-from typing import Union, cast
+from typing import Dict, Tuple, Union, cast
 
 import frontmatter
 import yaml
 
+from doorstop import settings
+
 verbosity = 0  # global verbosity setting for controlling string formatting
 PRINT_VERBOSITY = 0  # minimum verbosity to using `print`
 STR_VERBOSITY = 3  # minimum verbosity to use verbose `__str__`
 MAX_VERBOSITY = 4  # maximum verbosity level implemented
 
+_modules: Dict[str, Tuple[int, int, ModuleType]] = {}  # imported modules by path
+
 
 def _trace(self, message, *args, **kws):
     if self.isEnabledFor(logging.DEBUG - 1):
@@ -130,18 +135,82 @@ def read_text(path):
         raise DoorstopError(msg)
 
 
-def load_yaml(text, path, loader=yaml.SafeLoader):
+def yaml_loader():
+    """Get the fastest available safe YAML loader class."""
+    if settings.LIBYAML and yaml.__with_libyaml__:
+        return yaml.CSafeLoader
+    return yaml.SafeLoader
+
+
+def yaml_dumper(data):
+    """Get the fastest YAML dumper class that formats data like `yaml.Dumper`.
+
+    The libyaml emitter only produces identical text for some scalars, so
+    the pure-Python dumper is used whenever another scalar is present.
+
+    :param data: data to be dumped
+
+    :return: dumper class
+
+    """
+    if settings.LIBYAML and yaml.__with_libyaml__ and _libyaml_safe(data):
+        return yaml.CDumper
+    return yaml.Dumper
+
+
+def _libyaml_safe(data):
+    """Determine if libyaml emits the same text as PyYAML for this data."""
+    from doorstop.core.types import _Literal  # avoid a circular import
+
+    if isinstance(data, dict):
+        return all(_libyaml_safe(k) and _libyaml_safe(v) for k, v in data.items())
+    if isinstance(data, (list, tuple)):
+        return all(_libyaml_safe(value) for value in data)
+    if not isinstance(data, str):
+        return True
+    # libyaml escapes characters outside the Basic Multilingual Plane
+    if max(data, default=" ") > "\uffff":
+        return False
+    # Plain and single-quoted scalars are folded the same way
+    if data.isprintable() and data == data.strip():
+        return True
+    # Literal blocks match when no quoting or indentation hints are needed
+    if isinstance(data, _Literal) and data.endswith("\n"):
+        lines = data.split("\n")
+        return (
+            all(line.isprintable() and line == line.rstrip() for line in lines)
+            and not data.startswith(" ")
+            and "\n\n\n" not in data
+        )
+    return False
+
+
+def dump_yaml(data):
+    """Dump data to YAML text in Doorstop's formatting.
+
+    :param data: data to be dumped
+
+    :return: YAML text
+
+    """
+    return yaml.dump(
+        data, Dumper=yaml_dumper(data), default_flow_style=False, allow_unicode=True
+    )
+
+
+def load_yaml(text, path, loader=None):
     """Parse a dictionary from YAML text.
 
     :param text: string containing dumped YAML data
     :param path: file path for error messages
+    :param loader: YAML loader class (default: `yaml_loader()`)
 
     :return: dictionary
 
     """
     # Load the YAML data
     try:
-        data = yaml.load(text, Loader=loader) or {}
+        data = yaml.load(text, Loader=loader or yaml_loader()) or {}
     except yaml.error.YAMLError as exc:
         msg = "invalid contents: {}:\n{}".format(path, exc)
         raise DoorstopError(msg) from None
@@ -219,6 +288,26 @@ def write_text(text, path, end="\n"):
     return path
 
 
+def text_matches(text, path, end="\n"):
+    """Check if a file already contains the text that would be written.
+
+    :param text: string
+    :param path: file to compare with
+    :param end: string to end lines
+
+    :return: indication that writing the text would not change the file
+
+    """
+    data = text.replace("\n", end).encode("utf-8")
+    try:
+        if os.path.getsize(path) != len(data):
+            return False
+        with open(path, "rb") as stream:
+            return stream.read() == data
+    except OSError:
+        return False
+
+
 def write_csv(table, path, delimiter=",", newline="", encoding="utf-8"):
     """Write table to a file.
 
@@ -246,11 +335,22 @@ def touch(path):
         write_text("", path)
 
 
-def copy_dir_contents(src, dst):
-    """Copy the contents of a directory."""
+def copy_dir_contents(src, dst, copied=None):
+    """Copy the contents of a directory.
+
+    :param src: source directory
+    :param dst: destination directory
+    :param copied: set of destination paths copied so far, which switches
+        to updating only the destination files that differ from the source
+
+    """
     for fpath in glob.glob("{}/*".format(src)):
         dest_path = os.path.join(dst, os.path.split(fpath)[-1])
-        if os.path.exists(dest_path):
+        if copied is None:
+            exists = os.path.exists(dest_path)
+        else:
+            exists = dest_path in copied
+        if exists:
             if os.path.basename(fpath) == "doorstop":
                 msg = "Skipping '{}' as this directory name is required by doorstop".format(
                     fpath
@@ -260,6 +360,8 @@ def copy_dir_contents(src, dst):
                     fpath
                 )
             log.warning(msg)
+        elif copied is not None:
+            _update_copy(fpath, dest_path, copied)
         else:
             if os.path.isdir(fpath):
                 shutil.copytree(fpath, dest_path)
@@ -267,6 +369,24 @@ def copy_dir_contents(src, dst):
                 shutil.copyfile(fpath, dest_path)
 
 
+def _update_copy(src, dst, copied):
+    """Copy a file or directory tree, skipping files that are unchanged."""
+    copied.add(dst)
+    if os.path.isdir(src):
+        if os.path.isfile(dst):
+            os.remove(dst)
+        os.makedirs(dst, exist_ok=True)
+        for name in os.listdir(src):
+            _update_copy(os.path.join(src, name), os.path.join(dst, name), copied)
+        return
+    if os.path.isdir(dst):
+        shutil.rmtree(dst)
+    elif os.path.isfile(dst) and filecmp.cmp(src, dst):
+        return
+    log.trace("copying '{}' to '{}'...".format(src, dst))  # type: ignore
+    shutil.copy2(src, dst)
+
+
 def delete(path):
     """Delete a file or directory with error handling."""
     if os.path.isdir(path):
@@ -282,8 +402,20 @@ def delete(path):
         os.remove(path)
 
 
-def delete_contents(dirname):
-    """Delete the contents of a directory."""
+def delete_contents(dirname, keep=None):
+    """Delete the contents of a directory.
+
+    :param dirname: directory to empty
+    :param keep: set of paths in the directory to leave in place
+
+    """
+    if keep is not None:
+        for path in glob.glob("{}/*".format(dirname)):
+            if path not in keep:
+                delete(path)
+            elif os.path.isdir(path):
+                delete_contents(path, keep=keep)
+        return
     for file in glob.glob("{}/*".format(dirname)):
         if os.path.isdir(file):
             shutil.rmtree(os.path.join(dirname, file))
@@ -350,15 +482,32 @@ def dump_markdown(data, textattr):
     content += textattr["text"]
 
     text = frontmatter.dumps(
-        frontmatter.Post(content, **data), Dumper=yaml.dumper.Dumper
+        frontmatter.Post(content, **data), Dumper=yaml_dumper(data)
     )
     return text
 
 
 def import_path_as_module(path: Union[Path, str]) -> ModuleType:
+    """Import a Python file as a module.
+
+    The module is executed again only when the file's modification time
+    or size changes.
+
+    :param path: path of the Python file to import
+
+    :return: imported module
+
+    """
+    key = os.path.abspath(path)
+    stat = os.stat(key)
+    cached = _modules.get(key)
+    if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+    log.debug("importing {}...".format(path))
     name = Path(path).stem
     spec = cast(ModuleSpec, spec_from_file_location(name, path))
     module = cast(ModuleType, module_from_spec(spec))
     loader = cast(Loader, spec.loader)
     loader.exec_module(module)
+    _modules[key] = (stat.st_mtime_ns, stat.st_size, module)
     return module
@@ -5,12 +5,12 @@
 import abc
 import functools
 import os
-from typing import Dict
-
-import yaml
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
 
 from doorstop import common, settings
 from doorstop.common import DoorstopError, DoorstopInfo, DoorstopWarning
+from doorstop.core import report
 
 log = common.logger(__name__)
 
@@ -24,11 +24,13 @@ def add_item(func):
         if settings.ADDREMOVE_FILES and item.tree:
             item.tree.vcs.add(item.path)
         # pylint: disable=W0212
-        if item not in item.document._items:
-            item.document._items.append(item)
+        item.document._index_item(item)
         if settings.CACHE_ITEMS and item.tree:
             item.tree._item_cache[item.uid] = item
             log.trace("cached item: {}".format(item))  # type: ignore
+        batch = getattr(item.tree, "_batch", None)
+        if isinstance(batch, Batch):
+            batch.create(item)
         return item
 
     return wrapped
@@ -40,7 +42,7 @@ def edit_item(func):
     @functools.wraps(func)
     def wrapped(self, *args, **kwargs):
         item = func(self, *args, **kwargs) or self
-        if settings.ADDREMOVE_FILES and item.tree:
+        if settings.ADDREMOVE_FILES and item.tree and not item._unchanged:
             item.tree.vcs.edit(item.path)
         return item
 
@@ -56,11 +58,12 @@ def delete_item(func):
         if settings.ADDREMOVE_FILES and item.tree:
             item.tree.vcs.delete(item.path)
         # pylint: disable=W0212
-        if item in item.document._items:
-            item.document._items.remove(item)
+        item.document._unindex_item(item)
         if settings.CACHE_ITEMS and item.tree:
             item.tree._item_cache[item.uid] = None
             log.trace("expunged item: {}".format(item))  # type: ignore
+        if item.tree:
+            item.tree._update_child_index(item, old=item._data.get("links", ()))
         BaseFileObject.delete(item, item.path)
         return item
 
@@ -90,7 +93,7 @@ def edit_document(func):
     @functools.wraps(func)
     def wrapped(self, *args, **kwargs):
         document = func(self, *args, **kwargs) or self
-        if settings.ADDREMOVE_FILES and document.tree:
+        if settings.ADDREMOVE_FILES and document.tree and not document._unchanged:
             document.tree.vcs.edit(document.config)
         return document
 
@@ -122,29 +125,38 @@ def delete_document(func):
 class BaseValidatable(metaclass=abc.ABCMeta):
     """Abstract Base Class for objects that can be validated."""
 
-    def validate(self, skip=None, document_hook=None, item_hook=None):
+    def validate(self, skip=None, document_hook=None, item_hook=None, **kwargs):
         """Check the object for validity.
 
         :param skip: list of document prefixes to skip
         :param document_hook: function to call for custom document
             validation
         :param item_hook: function to call for custom item validation
+        :param kwargs: additional options for :meth:`get_issues`
 
         :return: indication that the object is valid
 
         """
         valid = True
-        # Display all issues
-        for issue in self.get_issues(
-            skip=skip, document_hook=document_hook, item_hook=item_hook
-        ):
+        issues = functools.partial(
+            self.get_issues,
+            skip=skip,
+            document_hook=document_hook,
+            item_hook=item_hook,
+            **kwargs,
+        )
+        # Display all issues (and write them to the report, if any)
+        for issue in report.check("setup", issues):
             if isinstance(issue, DoorstopInfo) and not settings.WARN_ALL:
                 log.info(issue)
+                report.write(issue, "info")
             elif isinstance(issue, DoorstopWarning) and not settings.ERROR_ALL:
                 log.warning(issue)
+                report.write(issue, "warning")
             else:
                 assert isinstance(issue, DoorstopError)
                 log.error(issue)
+                report.write(issue, "error")
                 valid = False
         # Return the result
         return valid
@@ -182,11 +194,16 @@ def auto_load(func):
 
 
 def auto_save(func):
-    """Call self.save() after execution."""
+    """Call self.save() after execution (or once at the end of a batch)."""
 
     @functools.wraps(func)
     def wrapped(self, *args, **kwargs):
+        batch = getattr(getattr(self, "tree", None), "_batch", None)
+        if isinstance(batch, Batch):
+            batch.add(self)
+        self._invalidate()
         result = func(self, *args, **kwargs)
+        self._invalidate()
         if self.auto:
             self.save()
         return result
@@ -194,6 +211,70 @@ def auto_save(func):
     return wrapped
 
 
+class Batch:
+    """Objects changed while automatic saves are deferred.
+
+    See :meth:`doorstop.core.tree.Tree.batch`.
+
+    """
+
+    def __init__(self):
+        self._objects: Dict[int, Tuple["BaseFileObject", bool]] = {}
+        self._created: List["BaseFileObject"] = []
+
+    def __len__(self):
+        return len(self._objects)
+
+    def add(self, obj):
+        """Record a changed object and delay its automatic save."""
+        if id(obj) not in self._objects:
+            self._objects[id(obj)] = (obj, obj.auto)
+        obj.auto = False  # saving the object turns automatic saves back on
+
+    def create(self, obj):
+        """Record an object whose file was created during the batch."""
+        self._created.append(obj)
+
+    def save(self, workers=None):
+        """Save every changed object once.
+
+        :param workers: number of threads used to write files
+
+        """
+        objects = [obj for obj, auto in self._restore() if auto and obj._exists]
+        log.debug("saving {} changed file(s)...".format(len(objects)))
+        if workers and workers > 1 and len(objects) > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for _ in executor.map(lambda obj: obj.save(), objects):
+                    pass
+        else:
+            for obj in objects:
+                obj.save()
+
+    def rollback(self):
+        """Discard changes by reloading objects from their unchanged files.
+
+        Objects created during the batch are deleted.
+
+        """
+        created = self._created
+        for obj, _ in self._restore():
+            if obj._exists and obj not in created:
+                obj.load(reload=True)
+        for obj in created:
+            if obj._exists:
+                obj.delete()
+
+    def _restore(self) -> List[Tuple["BaseFileObject", bool]]:
+        """Restore automatic saving and stop tracking the changed objects."""
+        objects = list(self._objects.values())
+        self._objects.clear()
+        self._created = []
+        for obj, auto in objects:
+            obj.auto = auto
+        return objects
+
+
 class BaseFileObject(metaclass=abc.ABCMeta):
     """Abstract Base Class for objects whose attributes save to a file.
 
@@ -210,6 +291,7 @@ class BaseFileObject(metaclass=abc.ABCMeta):
         self._data: Dict[str, str] = {}
         self._exists = True
         self._loaded = False
+        self._unchanged = False  # the last write found the file up to date
 
     def __hash__(self):
         return hash(self.path)
@@ -271,6 +353,9 @@ class BaseFileObject(metaclass=abc.ABCMeta):
         """
         return common.load_yaml(text, path, **kwargs)
 
+    def _invalidate(self):
+        """Discard values computed from the object's properties."""
+
     @abc.abstractmethod
     def save(self):
         """Format and save the object's properties to its file."""
@@ -280,7 +365,7 @@ class BaseFileObject(metaclass=abc.ABCMeta):
         self.auto = True
 
     def _write(self, text, path):
-        """Write text to the object's file.
+        """Write text to the object's file unless it already contains the text.
 
         :param text: text to write to a file
         :param path: path to the file
@@ -288,7 +373,12 @@ class BaseFileObject(metaclass=abc.ABCMeta):
         """
         if not self._exists:
             raise DoorstopError("cannot save to deleted: {}".format(self))
-        common.write_text(text, path, end=settings.WRITE_LINESEPERATOR)
+        end = settings.WRITE_LINESEPERATOR
+        self._unchanged = common.text_matches(text, path, end=end)
+        if self._unchanged:
+            log.trace("unchanged: {}".format(path))  # type: ignore
+        else:
+            common.write_text(text, path, end=end)
 
     @staticmethod
     def _dump(data):
@@ -299,7 +389,7 @@ class BaseFileObject(metaclass=abc.ABCMeta):
         :return: text to write to a file
 
         """
-        return yaml.dump(data, default_flow_style=False, allow_unicode=True)
+        return common.dump_yaml(data)
 
     # properties #############################################################
 
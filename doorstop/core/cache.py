@@ -0,0 +1,596 @@
+# SPDX-License-Identifier: LGPL-3.0-only
+
+"""Persistent caches of parsed item files, validation results, and publishing."""
+
+import hashlib
+import io
+import json
+import os
+import pickle
+import time
+from typing import Any, Dict, Optional, Set, Tuple
+
+from doorstop import common, settings
+from doorstop.common import DoorstopError, DoorstopInfo, DoorstopWarning
+from doorstop.core.types import is_item
+
+log = common.logger(__name__)
+
+DIRECTORY = ".doorstop"  # hidden directory next to the project's root
+FILENAME = "cache.pickle"
+VALIDATION_FILENAME = "validation.pickle"
+MANIFEST_FILENAME = ".doorstop-publish.json"  # in the publishing output directory
+VERSION = 2  # increment when the format of cached data changes
+RACY_NS = 2 * 10**9  # files modified this recently are not cached
+
+ISSUES = {cls.__name__: cls for cls in (DoorstopError, DoorstopWarning, DoorstopInfo)}
+
+_caches: Dict[str, "FileCache"] = {}  # open caches by project root
+_validation_caches: Dict[str, "ValidationCache"] = {}  # by project root
+
+
+class _Unpickler(pickle.Unpickler):
+    """Unpickler limited to the types produced by a safe YAML load."""
+
+    SAFE = {
+        ("datetime", "date"),
+        ("datetime", "datetime"),
+        ("datetime", "time"),
+        ("datetime", "timedelta"),
+        ("datetime", "timezone"),
+    }
+
+    def find_class(self, module, name):
+        if (module, name) in self.SAFE:
+            return super().find_class(module, name)
+        msg = "forbidden global in cache: {}.{}".format(module, name)
+        raise pickle.UnpicklingError(msg)
+
+
+def _loads(data):
+    """Unpickle data without allowing arbitrary globals."""
+    return _Unpickler(io.BytesIO(data)).load()
+
+
+class FileCache:
+    """Parsed file data keyed by path, modification time, and size.
+
+    Entries are stored pickled so every lookup returns a fresh copy that
+    is safe for the caller to modify.
+
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.path = os.path.join(root, DIRECTORY, FILENAME)
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[str, Tuple[int, int, str, bytes]] = {}
+        self._loaded = False
+        self._dirty = False
+
+    def __repr__(self):
+        return "FileCache('{}')".format(self.path)
+
+    def load(self):
+        """Read the cache file if it has not been read yet."""
+        if self._loaded:
+            return
+        self._loaded = True
+        if not os.path.isfile(self.path):
+            log.debug("no cache file: {}".format(self.path))
+            return
+        log.debug("reading cache file {}...".format(self.path))
+        try:
+            with open(self.path, "rb") as stream:
+                data = _loads(stream.read())
+            if data["version"] != VERSION:
+                log.debug("discarding outdated cache: {}".format(self.path))
+            else:
+                self._entries = data["entries"]
+        except Exception as exc:  # pylint: disable=broad-except
+            log.debug("discarding unreadable cache {}: {}".format(self.path, exc))
+
+    def get(self, path, kind):
+        """Get cached data for an unchanged file.
+
+        :param path: path to the parsed file
+        :param kind: format used to parse the file
+
+        :return: copy of the parsed data or `None` on a miss
+
+        """
+        self.load()
+        key = os.path.abspath(path)
+        entry = self._entries.get(key)
+        if entry:
+            try:
+                stat = os.stat(key)
+            except OSError:
+                stat = None
+            if stat and entry[:3] == (stat.st_mtime_ns, stat.st_size, kind):
+                try:
+                    data = _loads(entry[3])
+                except Exception:  # pylint: disable=broad-except
+                    log.debug("unreadable cache entry: {}".format(key))
+                else:
+                    self.hits += 1
+                    log.trace("cache hit: {}".format(key))  # type: ignore
+                    return data
+            del self._entries[key]
+            self._dirty = True
+        self.misses += 1
+        log.trace("cache miss: {}".format(key))  # type: ignore
+        return None
+
+    def set(self, path, kind, data):
+        """Store parsed data for a file.
+
+        :param path: path to the parsed file
+        :param kind: format used to parse the file
+        :param data: parsed data
+
+        """
+        self.load()
+        key = os.path.abspath(path)
+        try:
+            stat = os.stat(key)
+        except OSError:
+            return
+        # Skip files that could still change within the timestamp resolution
+        if stat.st_mtime_ns > time.time_ns() - RACY_NS:
+            log.trace("not caching recently modified: {}".format(key))  # type: ignore
+            return
+        try:
+            value = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:  # pylint: disable=broad-except
+            log.debug("unable to cache data for: {}".format(key))
+            return
+        self._entries[key] = (stat.st_mtime_ns, stat.st_size, kind, value)
+        self._dirty = True
+
+    def save(self):
+        """Write the cache file if entries changed."""
+        log.info("item cache: {} hit(s), {} miss(es)".format(self.hits, self.misses))
+        if not self._dirty:
+            return
+        # Drop entries for files that no longer exist
+        for key in [k for k in self._entries if not os.path.isfile(k)]:
+            del self._entries[key]
+        if _write(self.path, {"version": VERSION, "entries": self._entries}):
+            self._dirty = False
+
+    def clear(self):
+        """Remove all entries and delete the cache file."""
+        self._entries = {}
+        self._loaded = True
+        self._dirty = False
+        common.delete(self.path)
+
+
+class ValidationCache:
+    """Item issues from the last validation and the files they depend on.
+
+    An item is checked again when its file changed, when an item it links
+    to or that links to it changed, or when a file found for one of its
+    external references changed. Issues for all other items are reused.
+
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.path = os.path.join(root, DIRECTORY, VALIDATION_FILENAME)
+        self.hits = 0
+        self.misses = 0
+        self._context: Any = None
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._results: Dict[str, Dict[str, Any]] = {}
+        self._recheck: Set[str] = set()
+        self._started = False
+        self._dirty = False
+
+    def __repr__(self):
+        return "ValidationCache('{}')".format(self.path)
+
+    def start(self, tree, skip=None):
+        """Determine which items must be checked again.
+
+        :param tree: :class:`~doorstop.core.tree.Tree` being validated
+        :param skip: list of document prefixes to skip
+
+        """
+        skip = [] if skip is None else skip
+        self.hits = self.misses = 0
+        context = _context(tree, skip)
+        if context != self._context:
+            self._entries = self._load(context)
+            self._context = context
+        self._results = {}
+        self._recheck = set()
+        self._started = True
+        items = {}
+        for document in tree:
+            for item in document.items:
+                items[item.path] = item
+                # Items of skipped documents are only tracked for changes
+                if document.prefix in skip:
+                    entry = self._entry(item, None, [])
+                    if entry:
+                        self._results[item.path] = entry
+        changed = []
+        for path, item in items.items():
+            entry = self._entries.get(path)
+            if (
+                entry is None
+                or entry["uid"] != str(item.uid)
+                or not _unchanged(path, entry["file"])
+            ):
+                changed.append((item.uid, entry))
+                self._recheck.add(path)
+            elif entry["refs"] is None or not all(
+                _unchanged(ref, stat) for ref, stat in entry["refs"].items()
+            ):
+                self._recheck.add(path)
+        for path, entry in self._entries.items():
+            if path not in items:
+                changed.append((entry["uid"], entry))
+        # Check the neighbors of changed items through the link graph
+        for uid, entry in changed:
+            neighbors = list(tree.find_child_items(uid))
+            links = list(entry["links"]) if entry else []
+            try:
+                links.extend(tree.find_item(uid).links)
+            except DoorstopError:
+                pass  # deleted or inactive item
+            for link in links:
+                try:
+                    neighbors.append(tree.find_item(link))
+                except DoorstopError:
+                    pass  # unknown items are reported by the linking item
+            self._recheck.update(item.path for item in neighbors)
+        log.info(
+            "checking {} of {} item(s) again...".format(
+                len(self._recheck & set(items)), len(items)
+            )
+        )
+
+    def check_needed(self, item):
+        """Determine if an item must be checked again."""
+        return (
+            not self._started
+            or item.path not in self._entries
+            or item.path in self._recheck
+        )
+
+    def get_issues(self, item) -> Optional[list]:
+        """Get the issues from the last run for an unaffected item.
+
+        :param item: :class:`~doorstop.core.item.Item` to look up
+
+        :return: list of issues or `None` when the item must be checked
+
+        """
+        if self.check_needed(item):
+            self.misses += 1
+            return None
+        entry = self._entries[item.path]
+        self.hits += 1
+        self._results[item.path] = entry
+        return [_issue(*issue) for issue in entry["issues"]]
+
+    def record(self, item, issues, validator):
+        """Yield the issues found while checking an item and record them.
+
+        :param item: :class:`~doorstop.core.item.Item` being checked
+        :param issues: generator of the item's issues
+        :param validator: item validator producing the issues
+
+        """
+        found = []
+        for issue in issues:
+            found.append(issue)
+            yield issue
+        if not self._started:
+            return
+        refs = validator.found_refs
+        if refs is not None:
+            refs = [os.path.join(item.tree.vcs.path, relpath) for relpath in refs]
+        entry = self._entry(item, found, refs)
+        if entry:
+            self._results[item.path] = entry
+
+    @staticmethod
+    def _entry(item, issues, refs):
+        """Create an entry for an item's file, links, and issues."""
+        stat = _stat(item.path)
+        if stat is None:
+            return None
+        return {
+            "uid": str(item.uid),
+            "file": stat,
+            "links": [str(uid) for uid in item.links],
+            "refs": None if refs is None else {path: _stat(path) for path in refs},
+            "issues": [
+                (type(issue).__name__, str(issue), getattr(issue, "check", None))
+                for issue in issues or []
+            ],
+        }
+
+    def finish(self):
+        """Keep the results of a completed validation."""
+        if not self._started:
+            return
+        log.info(
+            "validation cache: {} hit(s), {} miss(es)".format(self.hits, self.misses)
+        )
+        self._entries = self._results
+        self._results = {}
+        self._started = False
+        self._dirty = True
+
+    def save(self):
+        """Write the cache file if a validation completed."""
+        if not self._dirty:
+            return
+        data = {
+            "version": VERSION,
+            "context": self._context,
+            "entries": self._entries,
+        }
+        if _write(self.path, data):
+            self._dirty = False
+
+    def clear(self):
+        """Remove all entries and delete the cache file."""
+        self._context = None
+        self._entries = {}
+        self._results = {}
+        self._started = False
+        self._dirty = False
+        common.delete(self.path)
+
+    def _load(self, context):
+        """Read entries from the cache file for a matching validation."""
+        if not os.path.isfile(self.path):
+            log.debug("no cache file: {}".format(self.path))
+            return {}
+        log.debug("reading cache file {}...".format(self.path))
+        try:
+            with open(self.path, "rb") as stream:
+                data = _loads(stream.read())
+            if data["version"] == VERSION and data["context"] == context:
+                return data["entries"]
+            log.debug("discarding outdated cache: {}".format(self.path))
+        except Exception as exc:  # pylint: disable=broad-except
+            log.debug("discarding unreadable cache {}: {}".format(self.path, exc))
+        return {}
+
+
+class PublishManifest:
+    """Digests of the documents published to an output directory.
+
+    A document is published again when anything its output is generated
+    from changes or when its output file no longer matches the one written.
+
+    """
+
+    def __init__(self, path, context):
+        self.root = path
+        self.path = os.path.join(path, MANIFEST_FILENAME)
+        # Templates copied to the output directory are used by every document
+        template = _digest_dir(os.path.join(path, "template"))
+        self.context = "{}\n{}".format(context, template)
+        self.skipped = 0
+        self._previous: Optional[Dict[str, list]] = None
+        self._digests: Dict[str, str] = {}
+
+    def __repr__(self):
+        return "PublishManifest('{}')".format(self.path)
+
+    def unchanged(self, document, output):
+        """Determine if a document's published output is up to date.
+
+        :param document: document to publish
+        :param output: path to the document's published file
+
+        """
+        digest = _publish_digest(document, self.context)
+        key = os.path.relpath(output, self.root)
+        self._digests[key] = digest
+        previous = self._load().get(key)
+        if not previous or previous[0] != digest:
+            return False
+        try:
+            stat = os.stat(output)
+        except OSError:
+            return False
+        if [stat.st_mtime_ns, stat.st_size] != previous[1:]:
+            return False
+        self.skipped += 1
+        return True
+
+    def save(self):
+        """Record the digests of the documents published."""
+        entries = {}
+        for key, digest in sorted(self._digests.items()):
+            try:
+                stat = os.stat(os.path.join(self.root, key))
+            except OSError:
+                continue
+            entries[key] = [digest, stat.st_mtime_ns, stat.st_size]
+        log.debug("writing publish manifest {}...".format(self.path))
+        data = {"version": VERSION, "documents": entries}
+        temp = self.path + ".tmp"
+        try:
+            with open(temp, "w", encoding="utf-8") as stream:
+                json.dump(data, stream, indent=1)
+            os.replace(temp, self.path)
+        except OSError as exc:
+            log.warning("unable to write manifest {}: {}".format(self.path, exc))
+
+    def _load(self):
+        """Read the digests recorded by the previous publish."""
+        if self._previous is None:
+            self._previous = {}
+            try:
+                with open(self.path, "r", encoding="utf-8") as stream:
+                    data = json.load(stream)
+                if data["version"] == VERSION:
+                    self._previous = data["documents"]
+            except FileNotFoundError:
+                log.debug("no publish manifest: {}".format(self.path))
+            except (OSError, ValueError, KeyError, TypeError) as exc:
+                msg = "discarding unreadable manifest {}: {}".format(self.path, exc)
+                log.debug(msg)
+        return self._previous
+
+
+def _context(tree, skip):
+    """Get the settings and documents that all cached issues depend on."""
+    options = (
+        settings.REFORMAT,
+        settings.CHECK_REF,
+        settings.CHECK_CHILD_LINKS,
+        settings.CHECK_CHILD_LINKS_STRICT,
+        settings.CHECK_SUSPECT_LINKS,
+        settings.CHECK_REVIEW_STATUS,
+        settings.REVIEW_NEW_ITEMS,
+        settings.STAMP_NEW_LINKS,
+        settings.ENABLE_HEADERS,
+    )
+    documents = tuple(
+        (str(document.prefix), document.path, _digest(document.config))
+        for document in tree
+    )
+    return options, tuple(sorted(skip or [])), documents
+
+
+def _issue(name, message, check):
+    """Recreate an issue recorded in the validation cache."""
+    issue = ISSUES[name](message)
+    if check:
+        issue.check = check
+    return issue
+
+
+def _stat(path):
+    """Get the modification time, size, and (when racy) digest of a file."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    digest = None
+    # Timestamps cannot tell apart changes made within their resolution
+    if stat.st_mtime_ns > time.time_ns() - RACY_NS:
+        digest = _digest(path)
+    return stat.st_mtime_ns, stat.st_size, digest
+
+
+def _unchanged(path, previous):
+    """Determine if a file matches its recorded status."""
+    if previous is None:
+        return not os.path.exists(path)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return False
+    mtime, size, digest = previous
+    if (stat.st_mtime_ns, stat.st_size) != (mtime, size):
+        return False
+    return digest is None or digest == _digest(path)
+
+
+def _digest(path):
+    """Get a digest of a file's contents."""
+    try:
+        with open(path, "rb") as stream:
+            return hashlib.sha256(stream.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def _digest_dir(path):
+    """Get a digest of the names and contents of the files in a directory."""
+    hasher = hashlib.sha256()
+    for dirpath, dirnames, filenames in os.walk(path):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            filepath = os.path.join(dirpath, filename)
+            relpath = os.path.relpath(filepath, path)
+            hasher.update("{}:{}\n".format(relpath, _digest(filepath)).encode())
+    return hasher.hexdigest()
+
+
+def _publish_digest(document, context):
+    """Get a digest of everything a document's published output depends on."""
+    hasher = hashlib.sha256(context.encode())
+    parts = [str(document.prefix), str(document.parent), _digest(document.config)]
+    for item in document:
+        parts.append(str(item.uid))
+        parts.append(json.dumps(item.data, sort_keys=True, default=str))
+        # Linked items appear in the output with their UIDs and headers
+        for linked in item.parent_items + item.find_child_items():
+            if is_item(linked):
+                header = linked.header
+                prefix = linked.document.prefix if linked.document else None
+                parts.append(repr((str(linked.uid), header, str(prefix))))
+                parts.append(str(linked.stamp()))
+            else:
+                parts.append(str(linked.uid))
+        # External references appear with the lines they were found on
+        if settings.CHECK_REF:
+            try:
+                if item.ref:
+                    parts.append(repr(item.find_ref()))
+                if item.references:
+                    parts.append(repr(item.find_references()))
+            except DoorstopError as exc:
+                parts.append(str(exc))
+    for part in parts:
+        hasher.update(str(part).encode("utf-8", "surrogatepass"))
+        hasher.update(b"\0")
+    return hasher.hexdigest()
+
+
+def _write(path, data):
+    """Atomically write pickled data to a cache file."""
+    log.debug("writing cache file {}...".format(path))
+    dirpath = os.path.dirname(path)
+    try:
+        if not os.path.isdir(dirpath):
+            os.makedirs(dirpath)
+            common.write_text("*\n", os.path.join(dirpath, ".gitignore"))
+        temp = path + ".tmp"
+        with open(temp, "wb") as stream:
+            pickle.dump(data, stream, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp, path)
+    except OSError as exc:
+        log.warning("unable to write cache {}: {}".format(path, exc))
+        return False
+    return True
+
+
+def get(root) -> FileCache:
+    """Get the cache for a project root."""
+    key = os.path.abspath(root)
+    cache = _caches.get(key)
+    if cache is None:
+        cache = _caches[key] = FileCache(key)
+    return cache
+
+
+def get_validation(root) -> ValidationCache:
+    """Get the validation cache for a project root."""
+    key = os.path.abspath(root)
+    cache = _validation_caches.get(key)
+    if cache is None:
+        cache = _validation_caches[key] = ValidationCache(key)
+    return cache
+
+
+def save():
+    """Write all opened caches to disk."""
+    for cache in _caches.values():
+        cache.save()
+    for validation in _validation_caches.values():
+        validation.save()
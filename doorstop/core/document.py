@@ -2,9 +2,11 @@
 
 """Representation of a collection of items."""
 
+import bisect
 import os
 import re
 from collections import OrderedDict
+from functools import partial
 from itertools import chain
 from typing import Any, Dict, List, Optional
 
@@ -17,6 +19,7 @@ from doorstop.common import (
     DoorstopWarning,
     import_path_as_module,
 )
+from doorstop.core import report
 from doorstop.core.base import (
     BaseFileObject,
     BaseValidatable,
@@ -33,6 +36,54 @@ from doorstop.core.validators.item_validator import ItemValidator
 log = common.logger(__name__)
 
 
+class _LevelIndex:
+    """Items of a document kept in outline order (level, then UID)."""
+
+    def __init__(self, items):
+        self._keys: Dict[Item, tuple] = {}  # sort key each item was added with
+        self._sorted_keys: List[tuple] = []
+        self._items: List[Item] = []
+        for item in items:
+            self._keys[item] = self._key(item)
+        for item, key in sorted(self._keys.items(), key=lambda pair: pair[1]):
+            self._sorted_keys.append(key)
+            self._items.append(item)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __reversed__(self):
+        return reversed(self._items)
+
+    @staticmethod
+    def _key(item):
+        return tuple(item.level), item.uid
+
+    def add(self, item):
+        """Insert an item at its position in the outline."""
+        key = self._key(item)
+        index = bisect.bisect_right(self._sorted_keys, key)
+        self._keys[item] = key
+        self._sorted_keys.insert(index, key)
+        self._items.insert(index, item)
+
+    def discard(self, item):
+        """Remove an item if it is in the index.
+
+        :return: indication that the item was removed
+
+        """
+        key = self._keys.pop(item, None)
+        if key is None:
+            return False
+        index = bisect.bisect_left(self._sorted_keys, key)
+        while self._items[index] is not item:
+            index += 1
+        del self._sorted_keys[index]
+        del self._items[index]
+        return True
+
+
 class Document(BaseValidatable, BaseFileObject):  # pylint: disable=R0902
     """Represents a document directory containing an outline of items."""
 
@@ -76,6 +127,9 @@ class Document(BaseValidatable, BaseFileObject):  # pylint: disable=R0902
         self.extensions: Dict[str, Any] = {}
         self._items: List[Item] = []
         self._itered = False
+        self._max_number: Optional[int] = None  # highest item number if known
+        self._level_index: Optional[_LevelIndex] = None  # items in outline order
+        self._item_index: Optional[Dict[Any, List[Item]]] = None  # items by UID
         self.children: List[Document] = []
 
         if not self._data["itemformat"]:
@@ -173,7 +227,7 @@ class Document(BaseValidatable, BaseFileObject):  # pylint: disable=R0902
         text = self._read(yamlfile)
 
         # Parse YAML data from text
-        class IncludeLoader(yaml.SafeLoader):
+        class IncludeLoader(common.yaml_loader()):  # type: ignore
             def include(self, node):
                 container = IncludeLoader.filenames[0]  # type: ignore
                 dirname = os.path.dirname(container)
@@ -192,8 +246,13 @@ class Document(BaseValidatable, BaseFileObject):  # pylint: disable=R0902
         IncludeLoader.filenames = [yamlfile]  # type: ignore
         return self._load(text, yamlfile, loader=IncludeLoader)
 
-    def load(self, reload=False):
-        """Load the document's properties from its file."""
+    def load(self, reload=False, parsed=None):
+        """Load the document's properties from its file.
+
+        :param reload: reload the properties and items if already loaded
+        :param parsed: dictionary of data already parsed from item files
+
+        """
         if self._loaded and not reload:
             return
         log.debug("loading {}...".format(repr(self)))
@@ -240,7 +299,7 @@ class Document(BaseValidatable, BaseFileObject):  # pylint: disable=R0902
         # Set meta attributes
         self._loaded = True
         if reload:
-            list(self._iter(reload=reload))
+            list(self._iter(reload=reload, parsed=parsed))
 
     @edit_document
     def save(self):
@@ -274,8 +333,14 @@ class Document(BaseValidatable, BaseFileObject):  # pylint: disable=R0902
         self._loaded = False
         self.auto = True
 
-    def _iter(self, reload=False):
-        """Yield the document's items."""
+    def _iter(self, reload=False, parsed=None):
+        """Yield the document's items.
+
+        :param reload: reload the items if already loaded
+        :param parsed: dictionary of data (or exceptions) keyed by item path
+            and format, parsed before loading
+
+        """
         if self._itered and not reload:
             msg = "iterating document {}'s loaded items...".format(self)
             log.debug(msg)
@@ -284,6 +349,72 @@ class Document(BaseValidatable, BaseFileObject):  # pylint: disable=R0902
         log.info("loading document {}'s items...".format(self))
         # Reload the document's item
         self._items = []
+        self._max_number = None
+        self._level_index = None
+        self._item_index = None
+        if self.tree:
+            self.tree._clear_child_index()  # pylint: disable=protected-access
+        for path in self._iter_paths():
+            try:
+                item = Item(
+                    self,
+                    path,
+                    root=self.root,
+                    tree=self.tree,
+                    itemformat=self.itemformat,
+                )
+            except DoorstopError:
+                pass  # skip non-item files
+            else:
+                self._items.append(item)
+                if reload:
+                    try:
+                        data = parsed.get((path, self.itemformat)) if parsed else None
+                        if isinstance(data, Exception):
+                            raise data
+                        item.load(reload=reload, data=data)
+                    except Exception:
+                        log.error("Unable to load: %s", item)
+                        raise
+                if settings.CACHE_ITEMS and self.tree:
+                    self.tree._item_cache[  # pylint: disable=protected-access
+                        item.uid
+                    ] = item
+                    log.trace("cached item: {}".format(item))  # type: ignore
+        # Set meta attributes
+        self._itered = True
+        self._max_number = max((i.uid.number for i in self._items), default=0)
+        # Yield items
+        yield from list(self._items)
+
+    def _index_item(self, item):
+        """Add an item to the document's list of items and its indexes."""
+        if item in self._items:
+            return
+        self._items.append(item)
+        if self._max_number is not None:
+            self._max_number = max(self._max_number, item.uid.number)
+        if self._level_index is not None:
+            self._level_index.add(item)
+        if self._item_index is not None:
+            self._item_index.setdefault(item.uid.key, []).append(item)
+
+    def _unindex_item(self, item):
+        """Remove an item from the document's list of items and its indexes."""
+        if item not in self._items:
+            return
+        self._items.remove(item)
+        if item.uid.number == self._max_number:
+            self._max_number = None  # recount on next use
+        if self._level_index is not None:
+            self._level_index.discard(item)
+        if self._item_index is not None:
+            items = self._item_index.get(item.uid.key, [])
+            if item in items:
+                items.remove(item)
+
+    def _iter_paths(self):
+        """Yield paths to the document's files, skipping embedded documents."""
         for dirpath, dirnames, filenames in os.walk(self.path):
             for dirname in list(dirnames):
                 path = os.path.join(dirpath, dirname, Document.CONFIG)
@@ -294,43 +425,32 @@ class Document(BaseValidatable, BaseFileObject):  # pylint: disable=R0902
                         "skipped embedded document: {}".format(path)
                     )
             for filename in filenames:
-                path = os.path.join(dirpath, filename)
-                try:
-                    item = Item(
-                        self,
-                        path,
-                        root=self.root,
-                        tree=self.tree,
-                        itemformat=self.itemformat,
-                    )
-                except DoorstopError:
-                    pass  # skip non-item files
-                else:
-                    self._items.append(item)
-                    if reload:
-                        try:
-                            item.load(reload=reload)
-                        except Exception:
-                            log.error("Unable to load: %s", item)
-                            raise
-                    if settings.CACHE_ITEMS and self.tree:
-                        self.tree._item_cache[  # pylint: disable=protected-access
-                            item.uid
-                        ] = item
-                        log.trace("cached item: {}".format(item))  # type: ignore
-        # Set meta attributes
-        self._itered = True
-        # Yield items
-        yield from list(self._items)
+                yield os.path.join(dirpath, filename)
+
+    def _iter_item_paths(self):
+        """Yield paths to files that may contain the document's items."""
+        extensions = Item.EXTENSIONS[self.itemformat]
+        for path in self._iter_paths():
+            filename = os.path.basename(path)
+            if filename == Document.CONFIG:
+                continue
+            if os.path.splitext(filename)[-1].lower() in extensions:
+                yield path
+
+    def copy_assets(self, dest, copied=None):
+        """Copy the contents of the assets directory.
+
+        :param dest: destination assets directory
+        :param copied: set of destination paths copied so far, which switches
+            to updating only the assets that changed
 
-    def copy_assets(self, dest):
-        """Copy the contents of the assets directory."""
+        """
         if not self.assets:
             return
         # Create folder if it does not exist.
         if not os.path.isdir(dest):
             os.makedirs(dest)
-        common.copy_dir_contents(self.assets, dest)
+        common.copy_dir_contents(self.assets, dest, copied)
 
     # properties #############################################################
 
@@ -431,7 +551,13 @@ class Document(BaseValidatable, BaseFileObject):  # pylint: disable=R0902
     @property
     def items(self):
         """Get an ordered list of active items in the document."""
-        return sorted(i for i in self._iter() if i.active)
+        return [i for i in self._ordered_items() if i.active]
+
+    def _ordered_items(self):
+        """Get all of the document's items in outline order."""
+        if self._level_index is None:
+            self._level_index = _LevelIndex(self._iter())
+        return self._level_index
 
     @property
     def depth(self):
@@ -441,10 +567,9 @@ class Document(BaseValidatable, BaseFileObject):  # pylint: disable=R0902
     @property
     def next_number(self):
         """Get the next item number for the document."""
-        try:
-            number = max(item.uid.number for item in self) + 1
-        except ValueError:
-            number = 1
+        if self._max_number is None:
+            self._max_number = max((item.uid.number for item in self), default=0)
+        number = self._max_number + 1
         log.debug("next number (local): {}".format(number))
 
         if self.tree and self.tree.request_next_number:
@@ -526,9 +651,8 @@ class Document(BaseValidatable, BaseFileObject):  # pylint: disable=R0902
                     msg = "invalid item name '{}'".format(name)
                     raise DoorstopError(msg)
 
-        try:
-            last = self.items[-1]
-        except IndexError:
+        last = next((i for i in reversed(self._ordered_items()) if i.active), None)
+        if last is None:
             next_level = level
         else:
             if level:
@@ -785,7 +909,7 @@ class Document(BaseValidatable, BaseFileObject):  # pylint: disable=R0902
             # Determine the next level
             if nlevel is None:
                 # Use the specified or current starting level
-                nlevel = Level(start) if start else clevel
+                nlevel = Level(start) if start else clevel.copy()
                 nlevel.heading = clevel.heading
                 log.debug("next level (start): {}".format(nlevel))
             else:
@@ -823,7 +947,7 @@ class Document(BaseValidatable, BaseFileObject):  # pylint: disable=R0902
                 log.info("{}: {}".format(item, clevel))
             else:
                 log.info("{}: {} to {}".format(item, clevel, nlevel))
-            item.level = nlevel.copy()
+                item.level = nlevel.copy()
             # Save the current level as the previous level
             plevel = clevel.copy()
 
@@ -865,22 +989,38 @@ class Document(BaseValidatable, BaseFileObject):  # pylint: disable=R0902
 
         """
         uid = UID(value)
-        for item in self:
-            if item.uid == uid:
-                if item.active:
-                    return item
-                else:
-                    log.trace("item is inactive: {}".format(item))  # type: ignore
+        if self._item_index is None:
+            index: Dict[Any, List[Item]] = {}
+            for item in self:
+                index.setdefault(item.uid.key, []).append(item)
+            self._item_index = index
+        for item in self._item_index.get(uid.key, []):
+            if item.active:
+                return item
+            else:
+                log.trace("item is inactive: {}".format(item))  # type: ignore
 
         raise DoorstopError("no matching{} UID: {}".format(_kind, uid))
 
     def get_issues(
-        self, skip=None, document_hook=None, item_hook=None
+        self,
+        skip=None,
+        document_hook=None,
+        item_hook=None,
+        validation_cache=None,
+        checked=None,
+        scope=None,
     ):  # pylint: disable=unused-argument
         """Yield all the document's issues.
 
         :param skip: list of document prefixes to skip
         :param item_hook: function to call for custom item validation
+        :param validation_cache: :class:`~doorstop.core.cache.ValidationCache`
+            with issues to reuse for items unaffected by changes
+        :param checked: results of
+            :meth:`~doorstop.core.validators.item_validator.ItemValidator.check`
+            keyed by item path for items already checked in worker processes
+        :param scope: paths of the items to check (all items when None)
 
         :return: generator of :class:`~doorstop.common.DoorstopError`,
                               :class:`~doorstop.common.DoorstopWarning`,
@@ -890,12 +1030,14 @@ class Document(BaseValidatable, BaseFileObject):  # pylint: disable=R0902
         assert document_hook is None
         skip = [] if skip is None else skip
 
-        ext_validator = None
+        ext_validator = batch_validator = None
         if "item_validator" in self.extensions:  # type: ignore
             validator = self.extensions["item_validator"]  # type: ignore
             path = os.path.join(self.path, validator)  # type: ignore
-            ext_validator = self._import_validator(path)
-            ext_validator = getattr(ext_validator, "item_validator")
+            module = self._import_validator(path)
+            batch_validator = getattr(module, "items_validator", None)
+            if not batch_validator:
+                ext_validator = getattr(module, "item_validator")
 
         extension_validator = ext_validator if ext_validator else lambda **kwargs: []
         hook = item_hook if item_hook else lambda **kwargs: []
@@ -916,21 +1058,66 @@ class Document(BaseValidatable, BaseFileObject):  # pylint: disable=R0902
         if settings.REORDER:
             self.reorder(_items=items)
         elif settings.CHECK_LEVELS:
-            yield from self._get_issues_level(items)
+            yield from report.check("levels", self._get_issues_level(items))
+
+        # Only check the items in scope (levels are checked for all items)
+        if scope is not None:
+            items = [item for item in items if item.path in scope]
+
+        # Check all items at once with an extension's batch entry point
+        if batch_validator:
+            found = self._get_issues_batch(batch_validator, items)
+            extension_validator = partial(self._get_issues_found, found)
 
         item_validator = ItemValidator()
 
         # Check each item
         for item in items:
+            # Reuse issues from the last run for unaffected items
+            issues = validation_cache.get_issues(item) if validation_cache else None
+            if issues is None:
+                if checked and item.path in checked:
+                    issues = item_validator.apply(item, checked[item.path])
+                else:
+                    issues = item_validator.get_issues(item, skip=skip)
+                if validation_cache:
+                    issues = validation_cache.record(item, issues, item_validator)
             # Check item
-            for issue in chain(
-                hook(item=item, document=self, tree=self.tree),
-                item_validator.get_issues(item, skip=skip),
-                extension_validator(item=item),
+            for issue in report.check(
+                "item",
+                chain(
+                    report.check(
+                        "hooks", partial(hook, item=item, document=self, tree=self.tree)
+                    ),
+                    issues,
+                    report.check("extensions", partial(extension_validator, item=item)),
+                ),
+                item=item,
             ):
                 # Prepend the item's UID to yielded exceptions
                 if isinstance(issue, Exception):
-                    yield type(issue)("{}: {}".format(item.uid, issue))
+                    yield report.prepend(issue, item.uid)
+
+        if settings.REFORMAT:
+            count = item_validator.reformatted
+            msg = "reformatted {} of {} item files in {}".format(
+                count, len(items), self
+            )
+            log.info(msg)
+
+    @staticmethod
+    def _get_issues_batch(validator, items):
+        """Get the issues of an extension's batch validator by item path."""
+        issues: Dict[str, List[Exception]] = {}
+        with report.timer("extensions"):
+            for item, issue in validator(items):
+                issues.setdefault(item.path, []).append(issue)
+        return issues
+
+    @staticmethod
+    def _get_issues_found(found, item):
+        """Get the issues found for an item by an extension's batch validator."""
+        return found.get(item.path, [])
 
     @staticmethod
     def _get_issues_level(items):
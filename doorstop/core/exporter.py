@@ -8,7 +8,6 @@ from collections import defaultdict
 from typing import Any, Dict
 
 import openpyxl
-import yaml
 
 from doorstop import common, settings
 from doorstop.common import DoorstopError
@@ -115,7 +114,7 @@ def _lines_yaml(obj, **_):
     """
     for item in iter_items(obj):
         data = {str(item.uid): item.data}
-        text = yaml.dump(data, default_flow_style=False, allow_unicode=True)
+        text = common.dump_yaml(data)
         yield text
 
 
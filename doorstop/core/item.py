@@ -6,11 +6,11 @@ import functools
 import hashlib
 import linecache
 import os
-from typing import Any, List, Union
+from typing import Any, Dict, List, Optional, Union
 
 from doorstop import common, settings
 from doorstop.common import DoorstopError
-from doorstop.core import editor
+from doorstop.core import cache, editor
 from doorstop.core.base import (
     BaseFileObject,
     add_item,
@@ -92,6 +92,23 @@ def requires_tree(func):
     return wrapped
 
 
+def parse_text(text, path, itemformat):
+    """Parse an item's data from the text of its file.
+
+    :param text: contents of the item file
+    :param path: path to the item file for error messages
+    :param itemformat: storage format of the item file
+
+    :return: dictionary of parsed data
+
+    """
+    if itemformat == "markdown":
+        # Parse YAML data from markdown with YAML frontmatter
+        return common.load_markdown(text, path, Item.MARKDOWN_TEXT_ATTRIBUTES)
+    # Parse YAML data from text
+    return common.load_yaml(text, path)
+
+
 class Item(BaseFileObject):  # pylint: disable=R0902
     """Represents an item file with linkable text."""
 
@@ -110,6 +127,23 @@ class Item(BaseFileObject):  # pylint: disable=R0902
     DEFAULT_REF = ""
     DEFAULT_HEADER = Text()
     DEFAULT_ITEMFORMAT = "yaml"
+    DEFAULTS = {  # values that are only stored once they differ
+        "level": DEFAULT_LEVEL,
+        "active": DEFAULT_ACTIVE,
+        "normative": DEFAULT_NORMATIVE,
+        "derived": DEFAULT_DERIVED,
+        "reviewed": DEFAULT_REVIEWED,
+        "text": DEFAULT_TEXT,
+        "ref": DEFAULT_REF,
+        "references": None,
+        "links": frozenset(),
+    }
+
+    # Stateless helpers shared by all items
+    reference_finder = ReferenceFinder()
+    yaml_validator = YamlValidator()
+    stamp_calls = 0  # number of stamps requested from all items
+    stamp_hits = 0  # number of stamps reused from the items' caches
 
     def __init__(self, document, path, root=os.getcwd(), **kwargs):
         """Initialize an item from an existing file.
@@ -131,24 +165,16 @@ class Item(BaseFileObject):  # pylint: disable=R0902
             msg = "invalid item filename: {}".format(filename)
             raise DoorstopError(msg) from None
         # Initialize the item
+        self._uid: Optional[UID] = None
+        self._uid_path: Optional[str] = None  # path the cached UID was built from
+        self._stamps: Dict[Any, Stamp] = {}  # cached stamps until the next change
         self.path = path
         self.root: str = root
         self.document = document
         self.tree = kwargs.get("tree")
         self.auto = kwargs.get("auto", Item.auto)
         self.itemformat = kwargs.get("itemformat", Item.DEFAULT_ITEMFORMAT)
-        self.reference_finder = ReferenceFinder()
-        self.yaml_validator = YamlValidator()
-        # Set default values
-        self._data["level"] = Item.DEFAULT_LEVEL  # type: ignore
-        self._data["active"] = Item.DEFAULT_ACTIVE  # type: ignore
-        self._data["normative"] = Item.DEFAULT_NORMATIVE  # type: ignore
-        self._data["derived"] = Item.DEFAULT_DERIVED  # type: ignore
-        self._data["reviewed"] = Item.DEFAULT_REVIEWED  # type: ignore
-        self._data["text"] = Item.DEFAULT_TEXT
-        self._data["ref"] = Item.DEFAULT_REF
-        self._data["references"] = None  # type: ignore
-        self._data["links"] = set()  # type: ignore
+        # Set default values (others are read from `Item.DEFAULTS`)
         if settings.ENABLE_HEADERS:
             self._data["header"] = Item.DEFAULT_HEADER
 
@@ -238,6 +264,7 @@ class Item(BaseFileObject):  # pylint: disable=R0902
 
     def _set_attributes(self, attributes):
         """Set the item's attributes."""
+        self._invalidate()
         self.yaml_validator.validate_item_yaml(attributes)
         for key, value in attributes.items():
             if key == "level":
@@ -271,34 +298,77 @@ class Item(BaseFileObject):  # pylint: disable=R0902
                 value = stripped_value
             elif key == "links":
                 value = set(UID(part) for part in value)
+                self._index_links(old=self._get_value("links"), new=value)
             elif key == "header":
                 value = Text(value)
+            if key == "level":
+                self._set_level(value)
+            else:
+                self._set_value(key, value)
+
+    def _get_value(self, key):
+        """Get a stored value or its default."""
+        try:
+            return self._data[key]
+        except KeyError:
+            return Item.DEFAULTS[key]
+
+    def _invalidate(self):
+        self._stamps.clear()
+
+    def _set_value(self, key, value):
+        """Store a value unless it matches its default."""
+        if key in Item.DEFAULTS and key != "level" and value == Item.DEFAULTS[key]:
+            self._data.pop(key, None)
+        else:
             self._data[key] = value
 
-    def load(self, reload=False):
-        """Load the item's properties from its file."""
+    def _set_level(self, level):
+        """Store the level and move the item in its document's outline."""
+        index = getattr(self.document, "_level_index", None)
+        indexed = index is not None and index.discard(self)
+        self._data["level"] = level
+        if indexed:
+            index.add(self)
+
+    def _get_data(self):
+        """Get all the item's values including defaults."""
+        data = dict(Item.DEFAULTS)
+        data.update(self._data)
+        return data
+
+    def load(self, reload=False, data=None):
+        """Load the item's properties from its file.
+
+        :param reload: reload the properties if already loaded
+        :param data: data already parsed from the item's file
+
+        """
         if self._loaded and not reload:
             return
         log.debug("loading {}...".format(repr(self)))
-        # Read text from file
-        text = self._read(self.path)
-
-        if self.itemformat == "markdown":
-            # Parse YAML data from markdown with YAML frontmatter
-            data = common.load_markdown(text, self.path, Item.MARKDOWN_TEXT_ATTRIBUTES)
-        elif self.itemformat == "yaml":
-            # Parse YAML data from text
-            data = common.load_yaml(text, self.path)
-        else:
-            msg = "unknwon item format detected during load: {}({})".format(
-                self.uid, self.itemformat
-            )
-            raise DoorstopError(msg) from None
+        # Reuse previously parsed data for an unchanged file
+        filecache = cache.get(self.root) if settings.CACHE_FILES else None
+        if data is None and filecache:
+            data = filecache.get(self.path, self.itemformat)
+        if data is None:
+            data = self._parse(self._read(self.path))
+            if filecache:
+                filecache.set(self.path, self.itemformat, data)
         # Store parsed data
         self._set_attributes(data)
         # Set meta attributes
         self._loaded = True
 
+    def _parse(self, text):
+        """Parse the item's data from the text of its file."""
+        if self.itemformat in Item.EXTENSIONS:
+            return parse_text(text, self.path, self.itemformat)
+        msg = "unknwon item format detected during load: {}({})".format(
+            self.uid, self.itemformat
+        )
+        raise DoorstopError(msg) from None
+
     def _hash_reference(self, path):
         """
         Extension method created to generate checksum from the list of find_references.
@@ -367,7 +437,7 @@ class Item(BaseFileObject):  # pylint: disable=R0902
         if not textattributekeys:
             textattributekeys = []
 
-        for key, value in self._data.items():
+        for key, value in self._get_data().items():
             # if key in list of pure text attributes,
             # then store as-is in extra textattribute dict
             if key in textattributekeys:
@@ -420,20 +490,23 @@ class Item(BaseFileObject):  # pylint: disable=R0902
     def uid(self):
         """Get the item's UID."""
         assert self.path
-        filename = os.path.basename(self.path)
-        return UID(os.path.splitext(filename)[0])
+        if self._uid_path != self.path:
+            filename = os.path.basename(self.path)
+            self._uid = UID(os.path.splitext(filename)[0])
+            self._uid_path = self.path
+        return self._uid
 
     @property  # type: ignore
     @auto_load
     def level(self):
         """Get the item's level."""
-        return self._data["level"]
+        return self._get_value("level")
 
     @level.setter  # type: ignore
     @auto_save
     def level(self, value):
         """Set the item's level."""
-        self._data["level"] = Level(value)  # type: ignore
+        self._set_level(Level(value))
 
     @property
     def depth(self):
@@ -454,13 +527,13 @@ class Item(BaseFileObject):  # pylint: disable=R0902
         - etc.
 
         """
-        return self._data["active"]
+        return self._get_value("active")
 
     @active.setter  # type: ignore
     @auto_save
     def active(self, value):
         """Set the item's active status."""
-        self._data["active"] = to_bool(value)
+        self._set_value("active", to_bool(value))
 
     @property  # type: ignore
     @auto_load
@@ -472,13 +545,13 @@ class Item(BaseFileObject):  # pylint: disable=R0902
         documents.
 
         """
-        return self._data["derived"]
+        return self._get_value("derived")
 
     @derived.setter  # type: ignore
     @auto_save
     def derived(self, value):
         """Set the item's derived status."""
-        self._data["derived"] = to_bool(value)
+        self._set_value("derived", to_bool(value))
 
     @property  # type: ignore
     @auto_load
@@ -493,13 +566,13 @@ class Item(BaseFileObject):  # pylint: disable=R0902
         - etc.
 
         """
-        return self._data["normative"]
+        return self._get_value("normative")
 
     @normative.setter  # type: ignore
     @auto_save
     def normative(self, value):
         """Set the item's normative status."""
-        self._data["normative"] = to_bool(value)
+        self._set_value("normative", to_bool(value))
 
     @property
     def heading(self):
@@ -536,27 +609,27 @@ class Item(BaseFileObject):  # pylint: disable=R0902
     def reviewed(self):
         """Indicate if the item has been reviewed."""
         stamp = self.stamp(links=True)
-        if self._data["reviewed"] == Stamp(True):
-            self._data["reviewed"] = stamp
-        return self._data["reviewed"] == stamp
+        if self._get_value("reviewed") == Stamp(True):
+            self._set_value("reviewed", stamp)
+        return self._get_value("reviewed") == stamp
 
     @reviewed.setter  # type: ignore
     @auto_save
     def reviewed(self, value):
         """Set the item's review status."""
-        self._data["reviewed"] = Stamp(value)  # type: ignore
+        self._set_value("reviewed", Stamp(value))
 
     @property  # type: ignore
     @auto_load
     def text(self):
         """Get the item's text."""
-        return self._data["text"]
+        return self._get_value("text")
 
     @text.setter  # type: ignore
     @auto_save
     def text(self, value):
         """Set the item's text."""
-        self._data["text"] = Text(value)
+        self._set_value("text", Text(value))
 
     @property  # type: ignore
     @auto_load
@@ -582,23 +655,23 @@ class Item(BaseFileObject):  # pylint: disable=R0902
         the filename of any type of file.
 
         """
-        return self._data["ref"]
+        return self._get_value("ref")
 
     @ref.setter  # type: ignore
     @auto_save
     def ref(self, value):
         """Set the item's external file reference."""
-        self._data["ref"] = str(value) if value else ""
+        self._set_value("ref", str(value) if value else "")
 
     @property  # type: ignore
     @auto_load
     def references(self):
         """Get the item's external file references."""
-        return self._data["references"]
+        return self._get_value("references")
 
     def attribute(self, attrib):
         """Get the item's custom attribute."""
-        return self._data.get(attrib)
+        return self._data.get(attrib, Item.DEFAULTS.get(attrib))
 
     @references.setter  # type: ignore
     @auto_save
@@ -606,19 +679,28 @@ class Item(BaseFileObject):  # pylint: disable=R0902
         """Set the item's external file references."""
         if value is not None:
             assert isinstance(value, list)
-        self._data["references"] = value
+        self._set_value("references", value)
 
     @property  # type: ignore
     @auto_load
     def links(self):
         """Get a list of the item UIDs this item links to."""
-        return sorted(self._data["links"])
+        return sorted(self._get_value("links"))
 
     @links.setter  # type: ignore
     @auto_save
     def links(self, value):
         """Set the list of item UIDs this item links to."""
-        self._data["links"] = set(UID(v) for v in value)  # type: ignore
+        links = set(UID(v) for v in value)
+        self._index_links(old=self._get_value("links"), new=links)
+        self._set_value("links", links)
+
+    def _index_links(self, old=(), new=()):
+        """Update the tree's reverse-link index for changed links."""
+        if self.tree:
+            self.tree._update_child_index(  # pylint: disable=protected-access
+                self, old=old, new=new
+            )
 
     @property
     def parent_links(self):
@@ -703,7 +785,8 @@ class Item(BaseFileObject):  # pylint: disable=R0902
         """
         uid = UID(value)
         log.info("linking to '{}'...".format(uid))
-        self._data["links"].add(uid)  # type: ignore
+        self._data.setdefault("links", set()).add(uid)  # type: ignore
+        self._index_links(new=[uid])
 
     @auto_save
     def unlink(self, value):
@@ -714,12 +797,14 @@ class Item(BaseFileObject):  # pylint: disable=R0902
         """
         uid = UID(value)
         try:
-            self._data["links"].remove(uid)  # type: ignore
+            self._data.get("links", set()).remove(uid)  # type: ignore
         except KeyError:
             log.warning("link to {0} does not exist".format(uid))
+        else:
+            self._index_links(old=[uid])
 
     def is_reviewed(self):
-        return self._data["reviewed"]
+        return self._get_value("reviewed")
 
     @requires_tree
     def find_ref(self):
@@ -833,12 +918,17 @@ class Item(BaseFileObject):  # pylint: disable=R0902
             return child_items, child_documents
         # Find child objects
         log.debug("finding item {}'s child objects...".format(self))
+        linking_items = self._find_linking_items(tree)
         for document2 in tree:
             if document2.parent == document.prefix:
                 child_documents.append(document2)
                 # Search for child items unless we only need to find one
                 if not child_items or find_all:
-                    for item2 in document2:
+                    if linking_items is None:
+                        items2 = iter(document2)
+                    else:
+                        items2 = (i for i in linking_items if i.document == document2)
+                    for item2 in items2:
                         if self.uid in item2.links:
                             if not item2.active:
                                 item2 = UnknownItem(item2.uid)
@@ -860,9 +950,43 @@ class Item(BaseFileObject):  # pylint: disable=R0902
             log.debug("child documents: {}".format(joined))
         return sorted(child_items), child_documents
 
+    def _find_linking_items(self, tree):
+        """Get items that link to this item from the tree's index.
+
+        :return: list of linking items or `None` when the tree does not
+            maintain a reverse-link index (requiring a full scan)
+
+        """
+        from doorstop.core.tree import Tree  # pylint: disable=import-outside-toplevel
+
+        if isinstance(tree, Tree):
+            return tree.find_child_items(self.uid)
+        return None
+
     @auto_load
     def stamp(self, links=False):
-        """Hash the item's key content for later comparison."""
+        """Hash the item's key content for later comparison.
+
+        Stamps are cached until the item's attributes are set or loaded.
+        The values of extended reviewed attributes are part of the cache
+        key, so they may also be changed directly.
+
+        """
+        Item.stamp_calls += 1
+        extended = ()
+        if self.document.extended_reviewed:
+            data = self._get_data()
+            extended = tuple(
+                _convert_to_str(data[key], "")
+                for key in self.document.extended_reviewed
+                if key in data
+            )
+        cache_key = (links, self.uid, extended)
+        stamp = self._stamps.get(cache_key)
+        if stamp is not None:
+            Item.stamp_hits += 1
+            return stamp
+
         values = [self.uid, self.text, self.ref]
 
         if self.references:
@@ -870,10 +994,9 @@ class Item(BaseFileObject):  # pylint: disable=R0902
 
         if links:
             values.extend(self.links)
-        for key in self.document.extended_reviewed:
-            if key in self._data:
-                values.append(_convert_to_str(self._data[key], ""))
-        return Stamp(*values)
+        values.extend(extended)
+        stamp = self._stamps[cache_key] = Stamp(*values)
+        return stamp
 
     @auto_save
     def clear(self, parents=None):
@@ -911,7 +1034,7 @@ class Item(BaseFileObject):  # pylint: disable=R0902
                     log.info(f"Inserting checksum for {references[ref]['path']}")
                     references[ref]["sha"] = temp_sha
 
-        self._data["reviewed"] = self.stamp(links=True)
+        self._set_value("reviewed", self.stamp(links=True))
 
     @delete_item
     def delete(self, path=None):
@@ -3,9 +3,12 @@
 """Functions to publish documents and items."""
 
 import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict
 
 from doorstop import common, settings
 from doorstop.common import DoorstopError
+from doorstop.core import cache
 from doorstop.core.publishers.html import HtmlPublisher
 from doorstop.core.publishers.latex import LaTeXPublisher
 from doorstop.core.publishers.markdown import MarkdownPublisher
@@ -14,6 +17,8 @@ from doorstop.core.types import is_tree, iter_documents
 
 log = common.logger(__name__)
 
+_worker: Dict[str, Any] = {}  # publishing state in a worker process
+
 
 def publish(
     obj,
@@ -24,6 +29,7 @@ def publish(
     matrix=None,
     template=None,
     toc=True,
+    jobs=1,
     **kwargs,
 ):
     """Publish an object to a given format.
@@ -39,6 +45,7 @@ def publish(
     :param linkify: turn links into hyperlinks (for Markdown, HTML or LaTeX)
     :param index: create an index.html (for HTML)
     :param matrix: create a traceability matrix, traceability.csv
+    :param jobs: number of processes used to publish a tree's documents
 
     :raises: :class:`doorstop.common.DoorstopError` for unknown file formats
 
@@ -59,36 +66,47 @@ def publish(
     publisher.setup(linkify, index, matrix)
 
     # Process templates.
+    if settings.CACHE_PUBLISH:
+        publisher.copied = set()
     publisher.processTemplates(template)
     log.info("Template = {}".format(publisher.getTemplate()))
     # Run all preparations.
     publisher.preparePublish()
+    manifest = None
+    if settings.CACHE_PUBLISH and is_tree(obj):
+        context = _get_context(publisher, toc, kwargs)
+        manifest = cache.PublishManifest(path, context)
 
     # Publish documents
     count = 0
+    tasks = []
     for obj2, path2 in iter_documents(obj, path, ext):
         count += 1
         # Run all special actions.
         publisher.publishAction(obj2, path2)
 
         # Publish content to the specified path
-        log.info("publishing to {}...".format(publisher.getDocumentPath()))
-        lines = publish_lines(
-            obj2,
-            ext,
-            publisher=publisher,
-            linkify=publisher.getLinkify(),
-            template=publisher.getTemplate(),
-            toc=toc,
-            **kwargs,
-        )
-        common.write_lines(
-            lines, publisher.getDocumentPath(), end=settings.WRITE_LINESEPERATOR
-        )
-        if obj2.copy_assets(publisher.getAssetsPath()):
+        if manifest and manifest.unchanged(obj2, publisher.getDocumentPath()):
+            log.info("unchanged: {}".format(publisher.getDocumentPath()))
+        elif jobs > 1 and is_tree(obj):
+            log.info("publishing to {}...".format(publisher.getDocumentPath()))
+            tasks.append((obj2, publisher.getDocumentPath()))
+        else:
+            log.info("publishing to {}...".format(publisher.getDocumentPath()))
+            _write_document(publisher, obj2, ext, toc=toc, **kwargs)
+        if _copy_assets(publisher, obj2):
             log.info(
                 "Copied assets from %s to %s", obj.assets, publisher.getAssetsPath()
             )
+    if tasks:
+        _write_documents(publisher, tasks, ext, jobs, toc=toc, **kwargs)
+
+    # Remove assets that are no longer published
+    if publisher.copied is not None and os.path.isdir(publisher.getAssetsPath()):
+        common.delete_contents(publisher.getAssetsPath(), keep=publisher.copied)
+    if manifest:
+        manifest.save()
+        log.info("skipped {} unchanged document(s)".format(manifest.skipped))
 
     # Create index
     if publisher.getIndex():
@@ -107,6 +125,93 @@ def publish(
     return path
 
 
+def _get_context(publisher, toc, kwargs):
+    """Get the options and templates that all published documents depend on."""
+    from doorstop import VERSION  # pylint: disable=import-outside-toplevel
+
+    values = [
+        (name, getattr(settings, name))
+        for name in dir(settings)
+        if name.isupper() and not name.startswith("CACHE_")
+    ]
+    return repr(
+        (
+            VERSION,
+            type(publisher).__name__,
+            publisher.getLinkify(),
+            publisher.getIndex(),
+            publisher.getMatrix(),
+            publisher.getTemplate(),
+            toc,
+            sorted(kwargs.items()),
+            values,
+        )
+    )
+
+
+def _copy_assets(publisher, document):
+    """Copy a document's assets, updating only changed files when caching."""
+    if publisher.copied is None:
+        return document.copy_assets(publisher.getAssetsPath())
+    return document.copy_assets(publisher.getAssetsPath(), copied=publisher.copied)
+
+
+def _write_document(publisher, document, ext, toc=True, **kwargs):
+    """Write a document to the publisher's current document path."""
+    lines = publish_lines(
+        document,
+        ext,
+        publisher=publisher,
+        linkify=publisher.getLinkify(),
+        template=publisher.getTemplate(),
+        toc=toc,
+        **kwargs,
+    )
+    common.write_lines(
+        lines, publisher.getDocumentPath(), end=settings.WRITE_LINESEPERATOR
+    )
+
+
+def _write_documents(publisher, tasks, ext, jobs, **kwargs):
+    """Write documents in a pool of worker processes.
+
+    :param publisher: publisher prepared for the documents
+    :param tasks: list of (document, output file path) pairs
+    :param ext: file extension to specify the output format
+    :param jobs: number of worker processes
+
+    """
+    log.info("publishing {} documents in {} processes...".format(len(tasks), jobs))
+    documents = [document for document, _ in tasks]
+    values = {name: getattr(settings, name) for name in dir(settings) if name.isupper()}
+    initargs = (publisher, documents, ext, kwargs, values)
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=_init_worker, initargs=initargs
+    ) as executor:
+        # Consume the results to raise errors from the workers
+        list(executor.map(_write_worker_document, enumerate(p for _, p in tasks)))
+
+
+def _init_worker(publisher, documents, ext, kwargs, values):
+    """Store the publishing state in a worker process."""
+    for name, value in values.items():
+        setattr(settings, name, value)
+    _worker.update(publisher=publisher, documents=documents, ext=ext, kwargs=kwargs)
+
+
+def _write_worker_document(task):
+    """Write one document in a worker process.
+
+    :param task: index of the document and its output file path
+
+    """
+    index, path = task
+    publisher = _worker["publisher"]
+    publisher.document = document = _worker["documents"][index]
+    publisher.documentPath = path
+    _write_document(publisher, document, _worker["ext"], **_worker["kwargs"])
+
+
 def publish_lines(obj, ext=".txt", publisher=None, **kwargs):
     """Yield lines for a report in the specified format.
 
@@ -5,7 +5,7 @@
 import os
 from abc import ABCMeta, abstractmethod
 from re import compile as re_compile
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Set
 
 from markdown import markdown
 
@@ -38,6 +38,7 @@ class BasePublisher(metaclass=ABCMeta):
         self.linkify = None
         self.index = None
         self.matrix = None
+        self.copied: Optional[Set[str]] = None  # template and asset paths kept
         # Define lists.
         self.list: Dict[str, Dict[str, Any]] = {}
         self.list["depth"] = {"itemize": 0, "enumerate": 0}
@@ -188,7 +189,7 @@ class BasePublisher(metaclass=ABCMeta):
     def processTemplates(self, template):
         """Retrieve the template and its path."""
         self.assetsPath, self.template = get_template(
-            self.object, self.path, self.ext, template
+            self.object, self.path, self.ext, template, copied=self.copied
         )
 
     def getAssetsPath(self):
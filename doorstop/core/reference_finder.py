@@ -2,15 +2,243 @@
 
 """Finding external references."""
 
+import functools
 import linecache
 import os
 import re
+import weakref
+from typing import Dict, List, Optional, Set, Tuple
 
 from doorstop import common, settings
 from doorstop.common import DoorstopError
 
 log = common.logger(__name__)
 
+_indexes: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()  # by VCS
+
+
+@functools.lru_cache(maxsize=1024)
+def _keyword_regex(keyword):
+    """Get the compiled pattern matching a keyword as a whole word."""
+    pattern = r"(\b|\W){}(\b|\W)".format(re.escape(keyword))
+    log.trace("regex: {}".format(pattern))  # type: ignore
+    return re.compile(pattern)
+
+
+@functools.lru_cache(maxsize=256)
+def _keyword_matcher(keywords):
+    """Get the matcher for a set of keywords searched in the same file."""
+    return KeywordMatcher(keywords)
+
+
+class KeywordMatcher:
+    """Finds many keywords in lines of text in a single pass.
+
+    A keyword matches the same way as the pattern ``(\\b|\\W)keyword(\\b|\\W)``.
+
+    """
+
+    WORD = re.compile(r"\w")
+
+    def __init__(self, keywords):
+        keywords = set(keywords)
+        trie: Dict = {}
+        for keyword in keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[""] = keyword
+        # Match the longest keyword at every position (including overlaps)
+        self._regex = re.compile("(?=({}))".format(self._pattern(trie)))
+        # Shorter keywords matching at the same position are its prefixes
+        self._prefixes = {
+            keyword: [
+                keyword[:index]
+                for index in range(len(keyword) - 1, 0, -1)
+                if keyword[:index] in keywords
+            ]
+            for keyword in keywords
+        }
+
+    @classmethod
+    def _pattern(cls, node):
+        """Build a regular expression matching the longest keyword in a trie."""
+        branches = [
+            re.escape(char) + cls._pattern(child)
+            for char, child in node.items()
+            if char
+        ]
+        if not branches:
+            return ""
+        pattern = "(?:{})".format("|".join(branches))
+        return pattern + "?" if "" in node else pattern
+
+    def search(self, line):
+        """Get the set of keywords found in a line."""
+        found = set()
+        for match in self._regex.finditer(line):
+            start = match.start()
+            longest = match.group(1)
+            for keyword in [longest] + self._prefixes[longest]:
+                if self._bounded(line, start, start + len(keyword)):
+                    found.add(keyword)
+        return found
+
+    @classmethod
+    def _bounded(cls, line, start, end):
+        """Determine if a match is surrounded by boundaries or non-word characters."""
+        return cls._edge(line, start, start - 1) and cls._edge(line, end, end)
+
+    @classmethod
+    def _edge(cls, line, index, outside):
+        """Check one side of a match for ``(\\b|\\W)``."""
+        before = index > 0 and cls.WORD.match(line, index - 1) is not None
+        after = index < len(line) and cls.WORD.match(line, index) is not None
+        if before != after:
+            return True  # word boundary
+        return 0 <= outside < len(line) and cls.WORD.match(line, outside) is None
+
+
+class ReferenceIndex:
+    """Locations of external references found in a working copy.
+
+    Every search for new keywords reads each candidate file once.
+
+    """
+
+    def __init__(self, vcs):
+        self.vcs = vcs
+        self._refs: Dict[str, List[Tuple[str, str, Optional[int]]]] = {}
+        self._keywords: Dict[Tuple[str, str], Optional[int]] = {}
+        self._pending_refs: Set[str] = set()
+        self._pending_keywords: Set[Tuple[str, str]] = set()
+
+    @staticmethod
+    def get(vcs):
+        """Get the index for a working copy."""
+        index = _indexes.get(vcs)
+        if index is None:
+            index = _indexes[vcs] = ReferenceIndex(vcs)
+        return index
+
+    @staticmethod
+    def set(index):
+        """Use an index (e.g. copied from another process) for its working copy."""
+        _indexes[index.vcs] = index
+
+    def defer(self, refs=(), keywords=()):
+        """Queue references to include in the next search.
+
+        :param refs: `ref` values to find in any file
+        :param keywords: (absolute path, keyword) pairs to find in one file
+
+        """
+        self._pending_refs.update(ref for ref in refs if ref not in self._refs)
+        self._pending_keywords.update(
+            pair for pair in keywords if pair not in self._keywords
+        )
+
+    def add(self, refs=(), keywords=()):
+        """Search for new references along with any queued references.
+
+        :param refs: `ref` values to find in any file
+        :param keywords: (absolute path, keyword) pairs to find in one file
+
+        """
+        refs = {ref for ref in refs if ref and ref not in self._refs}
+        keywords = {pair for pair in keywords if pair not in self._keywords}
+        if refs:
+            refs.update(ref for ref in self._pending_refs if ref)
+            self._pending_refs.clear()
+            self._add_refs(refs - set(self._refs))
+        if keywords:
+            keywords.update(self._pending_keywords)
+            self._pending_keywords.clear()
+            self._add_keywords(keywords - set(self._keywords))
+
+    def search(self):
+        """Search for all queued references now."""
+        refs = {ref for ref in self._pending_refs if ref} - set(self._refs)
+        keywords = self._pending_keywords - set(self._keywords)
+        self._pending_refs.clear()
+        self._pending_keywords.clear()
+        if refs:
+            self._add_refs(refs)
+        if keywords:
+            self._add_keywords(keywords)
+
+    def _add_refs(self, refs):
+        """Record the first two files matching each `ref` value."""
+        log.debug("searching for {} ref(s)...".format(len(refs)))
+        for ref in refs:
+            self._refs[ref] = []
+        # Two locations are kept so one remains when skipping an item's file
+        pending = set(refs)
+        matcher = KeywordMatcher(refs)
+        for path, filename, relpath in self.vcs.paths:
+            if not pending:
+                break
+            found = set()
+            # Check for a matching filename
+            if filename in pending:
+                self._refs[filename].append((path, relpath, None))
+                found.add(filename)
+            # Skip extensions that should not be considered text
+            if os.path.splitext(filename)[-1] in settings.SKIP_EXTS:
+                pending -= {ref for ref in found if len(self._refs[ref]) > 1}
+                continue
+            # Search for the references in the file
+            try:
+                lines = linecache.getlines(path)
+            except (SyntaxError, UnicodeDecodeError):
+                log.trace("unable to read lines from: {}".format(path))  # type: ignore
+                lines = []
+            for lineno, line in enumerate(lines, start=1):
+                for ref in matcher.search(line) & pending - found:
+                    self._refs[ref].append((path, relpath, lineno))
+                    found.add(ref)
+            pending -= {ref for ref in found if len(self._refs[ref]) > 1}
+
+    def _add_keywords(self, keywords):
+        """Record the first line matching each keyword in its file."""
+        paths: Dict[str, List[str]] = {}
+        for path, keyword in keywords:
+            paths.setdefault(path, []).append(keyword)
+            self._keywords[(path, keyword)] = None
+        for path, names in paths.items():
+            try:
+                lines = linecache.getlines(path)
+            except SyntaxError:
+                log.trace("unable to read lines from: {}".format(path))  # type: ignore
+                continue
+            pending = set(names)
+            matcher = _keyword_matcher(frozenset(names))
+            for lineno, line in enumerate(lines, start=1):
+                for keyword in matcher.search(line) & pending:
+                    self._keywords[(path, keyword)] = lineno
+                    pending.discard(keyword)
+                if not pending:
+                    break
+
+    def find_ref(self, ref, item_path):
+        """Get the first file (and line) matching a `ref` value.
+
+        :param ref: indexed `ref` value
+        :param item_path: path to the item's file to skip
+
+        :return: relative path and line number (`None` for a filename match)
+            or `None` when not found
+
+        """
+        for path, relpath, lineno in self._refs[ref]:
+            if path != item_path:
+                return relpath, lineno
+        return None
+
+    def find_keyword(self, path, keyword):
+        """Get the first line number matching an indexed keyword in a file."""
+        return self._keywords[(path, keyword)]
+
 
 class ReferenceFinder:
     """Finds files referenced from an Item."""
@@ -31,9 +259,16 @@ class ReferenceFinder:
 
         # Search for the external reference
         log.debug("searching for ref '{}'...".format(ref))
-        pattern = r"(\b|\W){}(\b|\W)".format(re.escape(ref))
-        log.trace("regex: {}".format(pattern))  # type: ignore
-        regex = re.compile(pattern)
+        if settings.CACHE_PATHS:
+            index = ReferenceIndex.get(tree.vcs)
+            index.add(refs=[ref])
+            found = index.find_ref(ref, item_path)
+            if found:
+                log.debug("found ref: {}".format(found[0]))
+                return found
+            msg = "external reference not found: {}".format(ref)
+            raise DoorstopError(msg)
+        regex = _keyword_regex(ref)
         for path, filename, relpath in tree.vcs.paths:
             # Skip the item's file while searching
             if path == item_path:
@@ -71,30 +306,60 @@ class ReferenceFinder:
 
         log.debug("searching for ref '{}'...".format(ref_path))
         ref_full_path = os.path.normpath(os.path.join(root, ref_path))
+        relpath = tree.vcs.find_path(ref_full_path)
 
-        for path, _filename, relpath in tree.vcs.paths:
-            # Skip the item's file while searching
-            if path == item_path:
-                continue
-            if path == ref_full_path:
-                if keyword is None:
-                    return relpath, None
-
-                # Search for the reference in the file
-                try:
-                    lines = linecache.getlines(path)
-                except SyntaxError:
-                    log.trace("unable to read lines from: {}".format(path))  # type: ignore
-                    continue
-
-                log.debug("searching for ref '{}'...".format(keyword))
-                pattern = r"(\b|\W){}(\b|\W)".format(re.escape(keyword))
-                log.trace("regex: {}".format(pattern))  # type: ignore
-                regex = re.compile(pattern)
-                for lineno, line in enumerate(lines, start=1):
-                    if regex.search(line):
-                        log.debug("found ref: {}".format(relpath))
-                        return relpath, lineno
+        # Skip the item's file while searching
+        if relpath is not None and ref_full_path != os.path.normpath(item_path):
+            if keyword is None:
+                return relpath, None
+
+            if settings.CACHE_PATHS:
+                index = ReferenceIndex.get(tree.vcs)
+                index.add(keywords=[(ref_full_path, keyword)])
+                lineno = index.find_keyword(ref_full_path, keyword)
+            else:
+                lineno = ReferenceFinder._search_file(ref_full_path, keyword)
+            if lineno:
+                log.debug("found ref: {}".format(relpath))
+                return relpath, lineno
 
         msg = "external reference not found: {}".format(ref_path)
         raise DoorstopError(msg)
+
+    @staticmethod
+    def _search_file(path, keyword):
+        """Get the first line number in a file containing a keyword."""
+        try:
+            lines = linecache.getlines(path)
+        except SyntaxError:
+            log.trace("unable to read lines from: {}".format(path))  # type: ignore
+            return None
+
+        log.debug("searching for ref '{}'...".format(keyword))
+        regex = _keyword_regex(keyword)
+        for lineno, line in enumerate(lines, start=1):
+            if regex.search(line):
+                return lineno
+        return None
+
+    @staticmethod
+    def index(tree, items):
+        """Search for the external references of many items in a single pass.
+
+        The search runs when the first of these references is looked up.
+
+        :param tree: tree containing the items
+        :param items: items whose `ref` and `references` will be searched
+
+        """
+        if not settings.CACHE_PATHS:
+            return
+        refs = []
+        keywords = []
+        for item in items:
+            refs.append(item.ref)
+            for ref_item in item.references or []:
+                if ref_item.get("keyword"):
+                    path = os.path.normpath(os.path.join(item.root, ref_item["path"]))
+                    keywords.append((path, ref_item["keyword"]))
+        ReferenceIndex.get(tree.vcs).defer(refs=refs, keywords=keywords)
@@ -0,0 +1,337 @@
+# SPDX-License-Identifier: LGPL-3.0-only
+
+"""Streaming reports of validation issues and the time spent on each check."""
+
+import json
+import os
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, List, Optional, Tuple
+
+from doorstop import common
+
+log = common.logger(__name__)
+
+FORMATS = ("json", "jsonl", "sarif")
+CHECKS = {
+    "setup": "preparing the tree for validation",
+    "workers": "waiting for items checked in worker processes",
+    "document": "document checks",
+    "levels": "document levels",
+    "item": "item files, text, and review status",
+    "references": "searching for external references",
+    "links": "links to parent items",
+    "suspect": "link stamps and suspect links",
+    "child-links": "links from child documents",
+    "hooks": "custom validation hooks",
+    "extensions": "item validator extensions",
+}
+SARIF_LEVELS = {"error": "error", "warning": "warning", "info": "note"}
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+
+_report: Optional["Report"] = None  # report collecting issues in this process
+
+
+class Report:
+    """Issues and check timings written to a stream as they are found.
+
+    Time is charged to the innermost check being run, so the times of all
+    checks add up to the time spent validating.
+
+    """
+
+    def __init__(self, stream=None, fmt="jsonl"):
+        assert fmt in FORMATS
+        self.stream = stream
+        self.fmt = fmt
+        self.checks: Dict[str, float] = {}  # seconds spent by check
+        self.documents: Dict[str, float] = {}  # seconds spent by document prefix
+        self.counts = {"error": 0, "warning": 0, "info": 0}
+        self.stamps = {"hits": 0, "calls": 0}  # item stamps reused and requested
+        self._frames: List[Tuple[str, Optional[str]]] = []
+        self._since = 0.0
+        self._start = time.perf_counter()
+        self._written = 0
+
+    def __repr__(self):
+        return "Report('{}')".format(self.fmt)
+
+    # timing #################################################################
+
+    def _switch(self):
+        """Charge the time since the last switch to the current check."""
+        now = time.perf_counter()
+        if self._frames:
+            check, prefix = self._frames[-1]
+            elapsed = now - self._since
+            self.checks[check] = self.checks.get(check, 0.0) + elapsed
+            if prefix:
+                self.documents[prefix] = self.documents.get(prefix, 0.0) + elapsed
+        self._since = now
+
+    def _enter(self, check, prefix=None):
+        self._switch()
+        if prefix is None and self._frames:
+            prefix = self._frames[-1][1]
+        self._frames.append((check, prefix))
+
+    def _exit(self):
+        self._switch()
+        self._frames.pop()
+
+    @contextmanager
+    def timer(self, check, document=None):
+        """Charge the time spent in a block to a check."""
+        self._enter(check, _prefix(document))
+        try:
+            yield
+        finally:
+            self._exit()
+
+    def measure(self, check, issues, document=None, item=None):
+        """Yield issues and charge the time spent finding them to a check.
+
+        :param check: name of the check finding the issues
+        :param issues: iterable of issues or a function returning one
+        :param document: document being checked (if any)
+        :param item: item being checked (if any)
+
+        """
+        prefix = _prefix(document)
+        iterator = None
+        while True:
+            self._enter(check, prefix)
+            try:
+                if iterator is None:
+                    iterator = iter(issues() if callable(issues) else issues)
+                issue = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self._exit()
+            yield _tag(issue, check, prefix, item)
+
+    def pop_timings(self):
+        """Get and reset the timings collected so far."""
+        timings = self.checks, self.documents
+        self.checks, self.documents = {}, {}
+        return timings
+
+    def add_timings(self, timings):
+        """Add timings collected by another report (e.g. in a worker)."""
+        checks, documents = timings
+        for totals, values in ((self.checks, checks), (self.documents, documents)):
+            for key, value in values.items():
+                totals[key] = totals.get(key, 0.0) + value
+
+    # writing ################################################################
+
+    def begin(self):
+        """Write the start of the report."""
+        self._start = time.perf_counter()
+        if self.fmt == "json":
+            self._write('{"issues": [')
+        elif self.fmt == "sarif":
+            from doorstop import VERSION  # pylint: disable=import-outside-toplevel
+
+            driver = {
+                "name": "doorstop",
+                "version": VERSION,
+                "rules": [
+                    {"id": key, "shortDescription": {"text": value}}
+                    for key, value in CHECKS.items()
+                ],
+            }
+            self._write(
+                '{{"$schema": "{}", "version": "2.1.0", "runs": [{{"tool": '
+                '{{"driver": {}}}, "results": ['.format(
+                    SARIF_SCHEMA, json.dumps(driver)
+                )
+            )
+
+    def write(self, issue, severity):
+        """Write an issue to the report.
+
+        :param issue: issue yielded while validating
+        :param severity: 'error', 'warning', or 'info' as displayed
+
+        """
+        self.counts[severity] += 1
+        record = {
+            "document": getattr(issue, "document", None),
+            "uid": getattr(issue, "uid", None),
+            "severity": severity,
+            "check": getattr(issue, "check", None),
+            "message": str(issue),
+            "path": getattr(issue, "relpath", None),
+        }
+        if self.fmt == "jsonl":
+            self._write(json.dumps(record))
+        elif self.fmt == "json":
+            self._write(("," if self._written else "") + json.dumps(record))
+        elif self.fmt == "sarif":
+            result: Dict[str, Any] = {
+                "ruleId": record["check"] or "document",
+                "level": SARIF_LEVELS[severity],
+                "message": {"text": record["message"]},
+                "properties": {"document": record["document"], "uid": record["uid"]},
+            }
+            if record["path"]:
+                location = {"artifactLocation": {"uri": record["path"]}}
+                result["locations"] = [{"physicalLocation": location}]
+            self._write(("," if self._written else "") + json.dumps(result))
+        self._written += 1
+
+    def add_stamps(self, hits, calls):
+        """Count item stamps reused from the items' caches and requested."""
+        self.stamps["hits"] += hits
+        self.stamps["calls"] += calls
+
+    def summary(self):
+        """Get the issue counts, the stamps reused, and the time spent."""
+        return {
+            "issues": sum(self.counts.values()),
+            "errors": self.counts["error"],
+            "warnings": self.counts["warning"],
+            "infos": self.counts["info"],
+            "stamps": dict(self.stamps),
+            "time": round(time.perf_counter() - self._start, 6),
+            "checks": _rounded(self.checks),
+            "documents": _rounded(self.documents),
+        }
+
+    def end(self):
+        """Write the summary and the end of the report."""
+        summary = json.dumps(self.summary())
+        if self.fmt == "jsonl":
+            self._write('{"summary": ' + summary + "}")
+        elif self.fmt == "json":
+            self._write('], "summary": ' + summary + "}")
+        elif self.fmt == "sarif":
+            self._write('], "properties": {"summary": ' + summary + "}}]}")
+
+    def _write(self, text):
+        if self.stream:
+            self.stream.write(text + "\n")
+            self.stream.flush()
+
+
+def _prefix(document):
+    """Get a document's prefix (if any) as a string."""
+    return None if document is None else str(document.prefix)
+
+
+def _rounded(values):
+    """Sort timings by the time spent and round them."""
+    ordered = sorted(values.items(), key=lambda pair: pair[1], reverse=True)
+    return {key: round(value, 6) for key, value in ordered}
+
+
+def _tag(issue, check, prefix=None, item=None):
+    """Record which check, document, and item an issue came from."""
+    if not isinstance(issue, Exception):
+        return issue
+    if getattr(issue, "check", None) is None:
+        issue.check = check
+    if prefix and getattr(issue, "document", None) is None:
+        issue.document = prefix
+    if item is not None and getattr(issue, "uid", None) is None:
+        issue.uid = str(item.uid)
+        relpath = os.path.relpath(item.path, item.root)
+        issue.relpath = relpath.replace(os.sep, "/")
+    return issue
+
+
+def _tagged(check, issues):
+    """Yield issues recording the check they came from."""
+    for issue in issues() if callable(issues) else issues:
+        yield _tag(issue, check)
+
+
+def get():
+    """Get the report collecting issues in this process (if any)."""
+    return _report
+
+
+def enable():
+    """Collect check timings in this process without writing a report.
+
+    Worker processes call this to replace any report copied from the
+    parent process.
+
+    """
+    global _report  # pylint: disable=W0603
+    _report = Report()
+    return _report
+
+
+@contextmanager
+def collect(path=None, fmt="jsonl"):
+    """Stream the issues found while validating to a report file.
+
+    The report is completed with the issues found so far even when
+    validation raises an exception.
+
+    :param path: path of the report to write (or None to only time checks)
+    :param fmt: format of the report: 'json', 'jsonl', or 'sarif'
+
+    """
+    global _report  # pylint: disable=W0603
+    if _report is not None:
+        yield _report
+        return
+    stream = None
+    if path:
+        common.create_dirname(path)
+        stream = open(path, "w", encoding="utf-8")  # pylint: disable=R1732
+    _report = Report(stream, fmt)
+    try:
+        _report.begin()
+        yield _report
+    finally:
+        try:
+            _report.end()
+        finally:
+            if stream:
+                stream.close()
+            _report = None
+
+
+def check(name, issues, document=None, item=None):
+    """Yield issues found by a check (timing it when a report is collected).
+
+    :param name: name of the check (see :data:`CHECKS`)
+    :param issues: iterable of issues or a function returning one
+    :param document: document being checked (if any)
+    :param item: item being checked (if any)
+
+    """
+    if _report is None:
+        return _tagged(name, issues)
+    return _report.measure(name, issues, document=document, item=item)
+
+
+def timer(name, document=None):
+    """Charge the time spent in a block to a check (when a report is collected)."""
+    if _report is None:
+        return nullcontext()
+    return _report.timer(name, document=document)
+
+
+def write(issue, severity):
+    """Write an issue to the current report (if any)."""
+    if _report is not None:
+        _report.write(issue, severity)
+
+
+def count_stamps(hits, calls):
+    """Count item stamps reused and requested in the current report (if any)."""
+    if _report is not None:
+        _report.add_stamps(hits, calls)
+
+
+def prepend(issue, text):
+    """Prepend text to an issue's message keeping the details of its check."""
+    prepended = type(issue)("{}: {}".format(text, issue))
+    prepended.__dict__.update(issue.__dict__)
+    return prepended
@@ -30,7 +30,7 @@ REQUIRED_LATEX_PACKAGES = {
 log = common.logger(__name__)
 
 
-def get_template(obj, path, ext, template):
+def get_template(obj, path, ext, template, copied=None):
     """Return the correct template.
 
     Return correct template according to the published type.
@@ -38,6 +38,10 @@ def get_template(obj, path, ext, template):
     built-in templates.
 
     Create the output folder and template folder.
+
+    When a set of copied paths is given, existing templates and assets are
+    kept and only the files that changed are copied. The paths copied are
+    added to the set so assets no longer published can be removed later.
     """
 
     # Set assets, ouput and template folders.
@@ -89,10 +93,12 @@ I.e., only one of the documents in the tree should have a template folder."""
         builtin_template = HTMLTEMPLATE
 
     # Remove existing templates and assets first.
-    if os.path.isdir(assets_dir):
+    if copied is not None:
+        log.info("Updating template directory %s", template_dir)
+    elif os.path.isdir(assets_dir):
         log.info("Deleting contents of assets directory %s", assets_dir)
         common.delete_contents(assets_dir)
-    if os.path.isdir(template_dir):
+    if copied is None and os.path.isdir(template_dir):
         log.info("Deleting contents of template directory %s", template_dir)
         common.delete(template_dir)
 
@@ -102,7 +108,7 @@ I.e., only one of the documents in the tree should have a template folder."""
 
     # Copy template from document if it exists and template is given.
     if document_template and template:
-        os.makedirs(template_dir)
+        _make_template_dir(template_dir, copied)
         if is_tree(obj):
             for each in obj.documents:
                 log.info(
@@ -111,31 +117,38 @@ I.e., only one of the documents in the tree should have a template folder."""
                     template,
                     # os.path.join(os.path.dirname(path), "template"),
                 )
-                common.copy_dir_contents(each.template, template_dir)
+                common.copy_dir_contents(each.template, template_dir, copied)
         else:
             log.info(
                 "Copying %s to %s",
                 document_template,
                 os.path.join(os.path.dirname(path), "template"),
             )
-            common.copy_dir_contents(document_template, template_dir)
+            common.copy_dir_contents(document_template, template_dir, copied)
 
     # Only create template_dir if template actually exists.
     elif os.path.isdir(template_assets):
-        os.makedirs(template_dir)
+        _make_template_dir(template_dir, copied)
         log.info(
             "Copying %s to %s",
             template_assets,
             os.path.join(os.path.dirname(path), "template"),
         )
-        common.copy_dir_contents(template_assets, template_dir)
+        common.copy_dir_contents(template_assets, template_dir, copied)
         # If html template, also copy the default views files.
         if ext == ".html" and builtin_template:
             views_src_dir = os.path.join(os.path.dirname(__file__), "..", "views")
             views_tgt_dir = os.path.join(template_dir, "views")
             log.info("Copying %s to %s", views_src_dir, views_tgt_dir)
-            os.makedirs(views_tgt_dir)
-            common.copy_dir_contents(views_src_dir, views_tgt_dir)
+            _make_template_dir(views_tgt_dir, copied)
+            common.copy_dir_contents(views_src_dir, views_tgt_dir, copied)
+
+    # Remove templates that are no longer copied.
+    if copied is not None and os.path.isdir(template_dir):
+        if template_dir in copied:
+            common.delete_contents(template_dir, keep=copied)
+        else:
+            common.delete(template_dir)
 
     # Return correct template and assets folder.
     if not template:
@@ -144,6 +157,15 @@ I.e., only one of the documents in the tree should have a template folder."""
     return assets_dir, template
 
 
+def _make_template_dir(path, copied):
+    """Create a template directory that did not exist or is being updated."""
+    if copied is None:
+        os.makedirs(path)
+    else:
+        os.makedirs(path, exist_ok=True)
+        copied.add(path)
+
+
 def read_template_data(assets_dir, template):
     """Read the template data file and return the data."""
     try:
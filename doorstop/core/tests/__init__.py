@@ -116,6 +116,14 @@ class MockSimpleDocument:
     def set_items(self, items):
         self._items = items
 
+    def _index_item(self, item):
+        if item not in self._items:
+            self._items.append(item)
+
+    def _unindex_item(self, item):
+        if item in self._items:
+            self._items.remove(item)
+
 
 class MockSimpleDocumentExtensions(MockSimpleDocument):
     """Mock Document class that enable extensions."""
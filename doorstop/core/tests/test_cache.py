@@ -0,0 +1,240 @@
+# SPDX-License-Identifier: LGPL-3.0-only
+
+"""Unit tests for the doorstop.core.cache module."""
+
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from doorstop import common
+from doorstop.core import cache, publisher
+from doorstop.core.builder import build
+from doorstop.core.item import Item
+from doorstop.core.tests import MockSimpleDocument
+
+
+class TestFileCache(unittest.TestCase):
+    """Unit tests for the FileCache class."""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.path = os.path.join(self.root, "REQ001.yml")
+        with open(self.path, "w") as stream:
+            stream.write("text: abc\n")
+        self.cache = cache.FileCache(self.root)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    @patch("doorstop.core.cache.RACY_NS", 0)
+    def test_get_hit(self):
+        """Verify cached data is returned for an unchanged file."""
+        self.cache.set(self.path, "yaml", {"text": "abc"})
+        data = self.cache.get(self.path, "yaml")
+        self.assertEqual({"text": "abc"}, data)
+        self.assertEqual(1, self.cache.hits)
+        self.assertEqual(0, self.cache.misses)
+
+    @patch("doorstop.core.cache.RACY_NS", 0)
+    def test_get_copy(self):
+        """Verify cached data cannot be modified by callers."""
+        self.cache.set(self.path, "yaml", {"links": []})
+        self.cache.get(self.path, "yaml")["links"].append("REQ002")
+        self.assertEqual({"links": []}, self.cache.get(self.path, "yaml"))
+
+    @patch("doorstop.core.cache.RACY_NS", 0)
+    def test_get_miss_changed(self):
+        """Verify a changed file invalidates its cached data."""
+        self.cache.set(self.path, "yaml", {"text": "abc"})
+        with open(self.path, "w") as stream:
+            stream.write("text: abcdef\n")
+        self.assertIs(None, self.cache.get(self.path, "yaml"))
+        self.assertEqual(1, self.cache.misses)
+
+    @patch("doorstop.core.cache.RACY_NS", 0)
+    def test_get_miss_format(self):
+        """Verify data parsed as another format is not returned."""
+        self.cache.set(self.path, "yaml", {"text": "abc"})
+        self.assertIs(None, self.cache.get(self.path, "markdown"))
+
+    def test_set_recent(self):
+        """Verify recently modified files are not cached."""
+        self.cache.set(self.path, "yaml", {"text": "abc"})
+        self.assertIs(None, self.cache.get(self.path, "yaml"))
+
+    @patch("doorstop.core.cache.RACY_NS", 0)
+    def test_save_load(self):
+        """Verify the cache persists between instances."""
+        self.cache.set(self.path, "yaml", {"text": "abc"})
+        self.cache.save()
+        path = os.path.join(self.root, cache.DIRECTORY, ".gitignore")
+        self.assertTrue(os.path.isfile(path))
+        cache2 = cache.FileCache(self.root)
+        self.assertEqual({"text": "abc"}, cache2.get(self.path, "yaml"))
+
+    def test_load_forbidden(self):
+        """Verify a cache file cannot load arbitrary objects."""
+        os.makedirs(os.path.dirname(self.cache.path))
+        with open(self.cache.path, "wb") as stream:
+            pickle.dump({"version": cache.VERSION, "entries": os.system}, stream)
+        self.assertIs(None, self.cache.get(self.path, "yaml"))
+
+    def test_load_corrupt(self):
+        """Verify an unreadable cache file is discarded."""
+        os.makedirs(os.path.dirname(self.cache.path))
+        with open(self.cache.path, "wb") as stream:
+            stream.write(b"not a pickle")
+        self.assertIs(None, self.cache.get(self.path, "yaml"))
+
+    @patch("doorstop.settings.CACHE_FILES", True)
+    @patch("doorstop.core.cache.RACY_NS", 0)
+    def test_item_load(self):
+        """Verify items reuse cached data instead of parsing their file."""
+        item = Item(MockSimpleDocument(), self.path, root=self.root)
+        item.load()
+        with patch("doorstop.common.load_yaml") as mock_load_yaml:
+            item2 = Item(MockSimpleDocument(), self.path, root=self.root)
+            item2.load()
+        mock_load_yaml.assert_not_called()
+        self.assertEqual("abc", item2.text)
+        self.assertEqual(1, cache.get(self.root).hits)
+
+
+@patch("doorstop.settings.CACHE_VALIDATION", True)
+@patch("doorstop.settings.ADDREMOVE_FILES", False)
+class TestValidationCache(unittest.TestCase):
+    """Unit tests for the ValidationCache class."""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        common.touch(os.path.join(self.root, ".mockvcs"))
+        tree = build(root=self.root)
+        tree.create_document(os.path.join(self.root, "sys"), "SYS")
+        tree.create_document(os.path.join(self.root, "req"), "REQ", parent="SYS")
+        tree.add_item("SYS").text = "system 1"
+        tree.add_item("SYS").text = "system 2"
+        tree.add_item("REQ").text = "requirement 1"
+        tree.link_items("REQ001", "SYS001")
+        self.cache = cache.get_validation(self.root)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def validate(self):
+        """Validate a freshly built tree and get its issues."""
+        tree = build(root=self.root)
+        return tree, [str(issue) for issue in tree.get_issues()]
+
+    def test_reuse(self):
+        """Verify issues are reused for unchanged items."""
+        _, issues = self.validate()
+        self.assertEqual(3, self.cache.misses)
+        _, issues2 = self.validate()
+        self.assertEqual(3, self.cache.hits)
+        self.assertEqual(0, self.cache.misses)
+        self.assertEqual(issues, issues2)
+
+    def test_recheck_children(self):
+        """Verify items linking to a changed item are checked again."""
+        tree, _ = self.validate()
+        tree.find_item("SYS001").text = "changed"
+        _, issues = self.validate()
+        self.assertEqual(1, self.cache.hits)
+        self.assertEqual(2, self.cache.misses)
+        self.assertIn("REQ: REQ001: suspect link: SYS001", issues)
+
+    def test_recheck_parents(self):
+        """Verify items linked from a deleted item are checked again."""
+        tree, _ = self.validate()
+        tree.find_item("REQ001").delete()
+        _, issues = self.validate()
+        self.assertEqual(1, self.cache.hits)
+        self.assertEqual(1, self.cache.misses)
+        self.assertIn("REQ: no items", issues)
+
+    @patch("doorstop.settings.CACHE_PATHS", False)
+    def test_recheck_refs(self):
+        """Verify items are checked again when a found reference changes."""
+        path = os.path.join(self.root, "src.txt")
+        common.write_text("REF123\n", path)
+        tree, _ = self.validate()
+        tree.find_item("SYS002").ref = "REF123"
+        self.validate()
+        common.write_text("\n", path)
+        _, issues = self.validate()
+        self.assertEqual(2, self.cache.hits)
+        self.assertIn("SYS: SYS002: external reference not found: REF123", issues)
+
+    def test_context_changed(self):
+        """Verify no issues are reused after the settings change."""
+        self.validate()
+        with patch("doorstop.settings.CHECK_SUSPECT_LINKS", False):
+            self.validate()
+        self.assertEqual(0, self.cache.hits)
+
+    def test_save_load(self):
+        """Verify the issues persist between instances."""
+        self.validate()
+        self.cache.save()
+        with patch.dict(cache._validation_caches):  # pylint: disable=W0212
+            cache._validation_caches.clear()  # pylint: disable=W0212
+            self.cache = cache.get_validation(self.root)
+            self.validate()
+        self.assertEqual(3, self.cache.hits)
+
+
+@patch("doorstop.settings.CACHE_PUBLISH", True)
+@patch("doorstop.settings.ADDREMOVE_FILES", False)
+class TestPublishManifest(unittest.TestCase):
+    """Unit tests for the PublishManifest class."""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.output = os.path.join(self.root, "public")
+        common.touch(os.path.join(self.root, ".mockvcs"))
+        self.tree = build(root=self.root)
+        self.tree.create_document(os.path.join(self.root, "sys"), "SYS")
+        self.tree.create_document(os.path.join(self.root, "req"), "REQ", parent="SYS")
+        self.tree.create_document(os.path.join(self.root, "tst"), "TST", parent="SYS")
+        self.tree.add_item("SYS").text = "system"
+        self.tree.add_item("REQ").text = "requirement"
+        self.tree.add_item("TST").text = "test"
+        self.tree.link_items("REQ001", "SYS001")
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def publish(self):
+        """Publish the tree and get the prefixes of the documents written."""
+        with patch(
+            "doorstop.core.publisher._write_document",
+            side_effect=publisher._write_document,  # pylint: disable=W0212
+        ) as mock_write:
+            publisher.publish(self.tree, self.output, ".md")
+        return sorted(str(args[1].prefix) for args, _ in mock_write.call_args_list)
+
+    def test_unchanged(self):
+        """Verify unchanged documents are not published again."""
+        self.assertEqual(["REQ", "SYS", "TST"], self.publish())
+        self.assertEqual([], self.publish())
+
+    def test_changed_item(self):
+        """Verify documents are published again when linked items change."""
+        self.publish()
+        self.tree.find_item("SYS001").text = "changed"
+        self.assertEqual(["REQ", "SYS"], self.publish())
+
+    def test_changed_output(self):
+        """Verify documents are published again when their output changes."""
+        self.publish()
+        common.write_text("edited", os.path.join(self.output, "TST.md"))
+        self.assertEqual(["TST"], self.publish())
+
+    def test_changed_settings(self):
+        """Verify all documents are published again when settings change."""
+        self.publish()
+        with patch("doorstop.settings.PUBLISH_CHILD_LINKS", False):
+            self.assertEqual(["REQ", "SYS", "TST"], self.publish())
@@ -2,9 +2,16 @@
 
 """Unit tests for the doorstop.common module"""
 
+import os
+import shutil
+import tempfile
 import unittest
+from unittest.mock import patch
+
+import yaml
 
 from doorstop import common
+from doorstop.core.types import _Literal
 
 MARKDOW_DEFAULT = """
 ---
@@ -154,3 +161,188 @@ list:
 
 text text text""".lstrip(),
         )
+
+
+@unittest.skipUnless(yaml.__with_libyaml__, "libyaml is not available")
+class TestYAMLIO(unittest.TestCase):
+    """Unit tests for the YAML IO operations."""
+
+    def test_yaml_loader(self):
+        # Act
+        loader = common.yaml_loader()
+
+        # Assert
+        self.assertIs(loader, yaml.CSafeLoader)
+
+    @patch("doorstop.settings.LIBYAML", False)
+    def test_yaml_loader_pure_python(self):
+        # Act
+        loader = common.yaml_loader()
+
+        # Assert
+        self.assertIs(loader, yaml.SafeLoader)
+
+    def test_yaml_dumper(self):
+        # Arrange
+        data = {"text": _Literal("line 1\n\nline 2\n"), "links": [{"SYS1": None}]}
+
+        # Act
+        dumper = common.yaml_dumper(data)
+
+        # Assert
+        self.assertIs(dumper, yaml.CDumper)
+
+    @patch("doorstop.settings.LIBYAML", False)
+    def test_yaml_dumper_pure_python(self):
+        # Act
+        dumper = common.yaml_dumper({"key": "value"})
+
+        # Assert
+        self.assertIs(dumper, yaml.Dumper)
+
+    def test_yaml_dumper_fallback(self):
+        # Arrange
+        values = [
+            "multiple\nlines",
+            "trailing space ",
+            "emoji \U0001f600",
+            _Literal(" indented\n"),
+            _Literal("trailing \n"),
+        ]
+
+        for value in values:
+            # Act
+            dumper = common.yaml_dumper({"key": [value]})
+
+            # Assert
+            self.assertIs(dumper, yaml.Dumper, value)
+
+    def test_dump_yaml_identical(self):
+        # Arrange
+        data = {
+            "active": True,
+            "header": "Header",
+            "level": 1.1,
+            "links": [{"SYS001": "abc123"}],
+            "ref": "",
+            "reviewed": None,
+            "text": _Literal("Some *text* that is long enough to " * 5 + "\n"),
+            "multiple\nlines": "x " * 100,
+        }
+        expected = yaml.dump(
+            data, Dumper=yaml.Dumper, default_flow_style=False, allow_unicode=True
+        )
+
+        # Act
+        text = common.dump_yaml(data)
+
+        # Assert
+        self.assertEqual(expected, text)
+
+    def test_load_yaml_include_loader(self):
+        # Arrange
+        class Loader(common.yaml_loader()):  # type: ignore
+            pass
+
+        Loader.add_constructor("!upper", lambda l, n: l.construct_scalar(n).upper())
+
+        # Act
+        data = common.load_yaml("key: !upper value\n", "path", loader=Loader)
+
+        # Assert
+        self.assertEqual({"key": "VALUE"}, data)
+
+
+class TestCopyDirContents(unittest.TestCase):
+    """Unit tests for copying directories while updating only changes."""
+
+    def setUp(self):
+        self.temp = tempfile.mkdtemp()
+        self.src = os.path.join(self.temp, "src")
+        self.dst = os.path.join(self.temp, "dst")
+        os.makedirs(os.path.join(self.src, "css"))
+        os.makedirs(self.dst)
+        common.write_text("logo", os.path.join(self.src, "logo.png"))
+        common.write_text("body {}", os.path.join(self.src, "css", "main.css"))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp)
+
+    def test_copy_unchanged(self):
+        """Verify unchanged files are not copied again."""
+        common.copy_dir_contents(self.src, self.dst, set())
+        with patch("shutil.copy2") as mock_copy2:
+            common.copy_dir_contents(self.src, self.dst, set())
+        mock_copy2.assert_not_called()
+
+    def test_copy_changed(self):
+        """Verify changed files are copied again."""
+        common.copy_dir_contents(self.src, self.dst, set())
+        path = os.path.join(self.src, "css", "main.css")
+        common.write_text("body { margin: 0 }", path)
+        common.copy_dir_contents(self.src, self.dst, set())
+        path = os.path.join(self.dst, "css", "main.css")
+        self.assertEqual("body { margin: 0 }", common.read_text(path))
+
+    def test_copy_duplicate(self):
+        """Verify files copied earlier are not replaced."""
+        copied = {os.path.join(self.dst, "logo.png")}
+        common.copy_dir_contents(self.src, self.dst, copied)
+        self.assertFalse(os.path.exists(os.path.join(self.dst, "logo.png")))
+
+    def test_delete_contents_keep(self):
+        """Verify only the files that were not copied are deleted."""
+        common.write_text("old", os.path.join(self.dst, "old.png"))
+        os.makedirs(os.path.join(self.dst, "css"))
+        common.write_text("old", os.path.join(self.dst, "css", "old.css"))
+        copied: set = set()
+        common.copy_dir_contents(self.src, self.dst, copied)
+        common.delete_contents(self.dst, keep=copied)
+        self.assertEqual(["css", "logo.png"], sorted(os.listdir(self.dst)))
+        self.assertEqual(["main.css"], os.listdir(os.path.join(self.dst, "css")))
+
+
+class TestTextMatches(unittest.TestCase):
+    """Unit tests for comparing text with a file's contents."""
+
+    def setUp(self):
+        self.temp = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp, "file.txt")
+        common.write_text("a\nb\n", self.path, end="\r\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp)
+
+    def test_text_matches(self):
+        """Verify text is compared with the line endings it would be written with."""
+        self.assertTrue(common.text_matches("a\nb\n", self.path, end="\r\n"))
+        self.assertFalse(common.text_matches("a\nb\n", self.path))
+        self.assertFalse(common.text_matches("a\nc\n", self.path, end="\r\n"))
+
+    def test_text_matches_missing(self):
+        """Verify text never matches a missing file."""
+        self.assertFalse(common.text_matches("", os.path.join(self.temp, "new")))
+
+
+class TestImportPathAsModule(unittest.TestCase):
+    """Unit tests for importing Python files as modules."""
+
+    def setUp(self):
+        self.temp = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp, "validator.py")
+        common.write_text("VALUE = 1", self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp)
+
+    def test_import_cached(self):
+        """Verify an unchanged file is not executed again."""
+        module = common.import_path_as_module(self.path)
+        self.assertIs(module, common.import_path_as_module(self.path))
+        self.assertEqual(1, module.VALUE)
+
+    def test_import_changed(self):
+        """Verify a changed file is executed again."""
+        common.import_path_as_module(self.path)
+        common.write_text("VALUE = 22", self.path)
+        self.assertEqual(22, common.import_path_as_module(self.path).VALUE)
@@ -13,6 +13,7 @@ from unittest.mock import MagicMock, Mock, call, patch
 
 from doorstop import common
 from doorstop.common import DoorstopError, DoorstopInfo, DoorstopWarning
+from doorstop.core.base import add_item, delete_item
 from doorstop.core.document import Document
 from doorstop.core.tests import EMPTY, FILES, NEW, ROOT, MockDocument, MockItem
 from doorstop.core.types import UID, Level
@@ -308,6 +309,15 @@ class TestDocument(unittest.TestCase):
             self.assertIs(self.document, item.document)
             self.assertIs(self.document.tree, item.tree)
 
+    def test_items_level_changed(self):
+        """Verify the item order follows level changes."""
+        first = self.document.items[0]
+        first.auto = False
+        first.level = "99"
+        items = self.document.items
+        self.assertIs(first, items[-1])
+        self.assertEqual(sorted(items), items)
+
     def test_items_cache(self):
         """Verify the items in a document get cached."""
         self.document.tree = Mock()
@@ -389,6 +399,28 @@ class TestDocument(unittest.TestCase):
         self.document.tree.request_next_number = Mock(side_effect=[1, 42])
         self.assertEqual(42, self.document.next_number)
 
+    @patch("doorstop.common.delete", Mock())
+    def test_next_number_tracked(self):
+        """Verify the next item number follows added and deleted items."""
+        self.assertEqual(8, self.document.next_number)
+        item = MockItem(self.document, os.path.join(FILES, "REQ042.yml"))
+        add_item(lambda self: self)(item)
+        self.assertEqual(43, self.document._max_number + 1)
+        self.assertEqual(43, self.document.next_number)
+        delete_item(lambda self: self)(item)
+        self.assertIs(None, self.document._max_number)
+        self.assertEqual(8, self.document.next_number)
+
+    @patch("doorstop.common.delete", Mock())
+    def test_find_item_tracked(self):
+        """Verify items can be found after they are added or deleted."""
+        self.assertEqual("REQ001", self.document.find_item("req1").uid)
+        item = MockItem(self.document, os.path.join(FILES, "REQ042.yml"))
+        add_item(lambda self: self)(item)
+        self.assertIs(item, self.document.find_item("REQ042"))
+        delete_item(lambda self: self)(item)
+        self.assertRaises(DoorstopError, self.document.find_item, "REQ042")
+
     def test_index_get(self):
         """Verify a document's index can be retrieved."""
         self.assertIs(None, self.document.index)
@@ -756,6 +788,22 @@ outline:
         self.document.validate(item_hook=mock_hook)
         self.assertEqual(7, mock_hook.call_count)
 
+    @patch(
+        "doorstop.core.validators.item_validator.ItemValidator.get_issues",
+        Mock(return_value=[]),
+    )
+    def test_validate_extension_batch(self):
+        """Verify an extension can check all items of a document in one call."""
+        items = self.document.items
+        mock_batch = Mock(return_value=[(items[1], DoorstopInfo("batch"))])
+        module = Mock(items_validator=mock_batch)
+        self.document.extensions = {"item_validator": "validator.py"}
+        with patch.object(Document, "_import_validator", Mock(return_value=module)):
+            issues = self.document.issues
+        mock_batch.assert_called_once_with(items)
+        self.assertEqual("{}: batch".format(items[1].uid), str(issues[-1]))
+        self.assertFalse(module.item_validator.called)
+
     @patch("doorstop.core.item.Item.delete")
     @patch("os.rmdir")
     def test_delete(self, mock_delete, mock_item_delete):
@@ -4,17 +4,23 @@
 """Unit tests for the doorstop.core.item module."""
 
 import os
+import shutil
+import tempfile
+import tracemalloc
 import unittest
 from unittest.mock import MagicMock, Mock, patch
 
 import doorstop.core.editor
 from doorstop import common, settings
 from doorstop.common import DoorstopError
+from doorstop.core.document import Document
 from doorstop.core.item import Item, UnknownItem
 from doorstop.core.tests import (
     EMPTY,
+    ENV,
     EXTERNAL,
     FILES,
+    REASON,
     TESTS_ROOT,
     MockItem,
     MockSimpleDocument,
@@ -136,6 +142,21 @@ class TestItem(unittest.TestCase):
         self.item.save()
         self.item._write.assert_called_once_with(YAML_DEFAULT, self.item.path)
 
+    def test_defaults_not_stored(self):
+        """Verify default values are only stored once they change."""
+        self.item._file = YAML_DEFAULT
+        self.item.load()
+        self.assertEqual(["header", "level"], sorted(self.item._data))
+        self.item.active = False
+        self.item.link("SYS001")
+        self.assertIs(False, self.item._data["active"])
+        self.assertEqual(["SYS001"], sorted(self.item._data["links"]))
+        self.item.active = True
+        self.item.links = []
+        self.assertEqual(["header", "level"], sorted(self.item._data))
+        self.item.save()
+        self.assertEqual(YAML_DEFAULT, self.item._file)
+
     def test_set_attributes(self):
         """Verify setting attributes calls write with the attributes."""
         self.item.set_attributes(
@@ -242,6 +263,14 @@ class TestItem(unittest.TestCase):
         self.assertEqual("RQ001", self.item.uid)
         self.assertRaises(AttributeError, setattr, self.item, "uid", "RQ002")
 
+    def test_uid_cached(self):
+        """Verify an item's UID is only rebuilt when its path changes."""
+        uid = self.item.uid
+        self.assertIs(uid, self.item.uid)
+        self.item.path = self.item.path.replace("RQ001", "RQ002")
+        self.assertEqual("RQ002", self.item.uid)
+        self.assertIsNot(uid, self.item.uid)
+
     def test_relpath(self):
         """Verify an item's relative path string can be read but not set."""
         text = "@{}{}".format(os.sep, self.item.path)
@@ -860,6 +889,21 @@ class TestItem(unittest.TestCase):
         stamp = "e0qDli7ZJwhf161b_v7AdGNNl7xHx-bs28aFFk7aqT4="
         self.assertEqual(stamp, self.item.stamp())
 
+    def test_stamp_cached(self):
+        """Verify stamps are reused until the item changes."""
+        calls, hits = Item.stamp_calls, Item.stamp_hits
+        stamp = self.item.stamp()
+        with patch("doorstop.core.item.Stamp") as mock_stamp:
+            self.assertIs(stamp, self.item.stamp())
+            mock_stamp.assert_not_called()
+        self.assertEqual(2, Item.stamp_calls - calls)
+        self.assertEqual(1, Item.stamp_hits - hits)
+        self.item.text = "changed"
+        self.assertNotEqual(stamp, self.item.stamp())
+        stamp = self.item.stamp(links=True)
+        self.item.link("req1")
+        self.assertNotEqual(stamp, self.item.stamp(links=True))
+
     def test_stamp_with_value_one_extended_reviewed(self):
         """Verify fingerprint with value one extended reviewed attribute."""
         self.item.document.extended_reviewed = ["attr"]
@@ -1124,6 +1168,17 @@ class TestUTF8(unittest.TestCase):
         common.write_text(backup, ITEM)
         self.assertEqual(backup, text)
 
+    def test_save_unchanged(self):
+        """Verify saving an unchanged item does not rewrite its file."""
+        ITEM = "doorstop/core/tests/test_fixtures/002-utf8-characters/REQ-MIT.yml"
+        item = Item(None, ITEM)
+        item.tree = Mock()
+        item.load()
+        with patch("doorstop.common.write_text") as mock_write_text:
+            item.save()
+        mock_write_text.assert_not_called()
+        item.tree.vcs.edit.assert_not_called()
+
 
 class TestOSLineSep(unittest.TestCase):
     """Unit tests os dependent line end handling."""
@@ -1146,3 +1201,39 @@ class TestOSLineSep(unittest.TestCase):
         text = common.read_text(ITEM)
         common.write_text(backup, ITEM)
         self.assertEqual(backup, text)
+
+
+@unittest.skipUnless(os.getenv(ENV), REASON)
+class TestItemMemory(unittest.TestCase):
+    """Benchmark of the memory used by loaded items."""
+
+    COUNT = 5000
+    MAXIMUM = 1900  # bytes per item (about 1990 before compaction, 1820 after)
+
+    def setUp(self):
+        self.temp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp)
+
+    def test_bytes_per_item(self):
+        """Report the memory used per loaded item."""
+        document = Document.new(None, self.temp, self.temp, "REQ")
+        for number in range(1, self.COUNT + 1):
+            links = "\n- SYS{:03}: null".format(number) if number % 2 else " []"
+            text = "active: true\nlevel: 1.{}\nlinks:{}\ntext: |\n  Item {}\n"
+            path = os.path.join(self.temp, "REQ{:04}.yml".format(number))
+            common.write_text(text.format(number, links, number), path)
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            items = list(document)
+            for item in items:
+                item.load()
+            used = tracemalloc.get_traced_memory()[0] - before
+        finally:
+            tracemalloc.stop()
+        per_item = used // len(items)
+        print("\n{} bytes per item ({} items)".format(per_item, len(items)))
+        self.assertEqual(self.COUNT, len(items))
+        self.assertLess(per_item, self.MAXIMUM)
@@ -146,6 +146,23 @@ class TestItemValidator(unittest.TestCase):
         # 2) calling item.review()
         self.assertEqual(self.item._write.call_count, 2)
 
+    @patch("doorstop.settings.REVIEW_NEW_ITEMS", True)
+    def test_check_readonly(self):
+        """Verify a read-only check leaves reviews to the original item."""
+        item_validator = MockItemValidator(readonly=True)
+        item_validator.disable_get_issues_document()
+        self.item._write.reset_mock()
+        # Act
+        result = item_validator.check(self.item)
+        # Assert
+        self.assertFalse(self.item._write.called)
+        self.assertFalse(self.item.reviewed)
+        self.assertTrue(result[-1])
+        issues = list(self.item_validator.apply(self.item, result))
+        self.assertEqual(result[0], issues)
+        self.assertTrue(self.item.reviewed)
+        self.assertTrue(self.item._write.called)
+
     def test_validate_nonnormative_with_links(self):
         """Verify a non-normative item with links can be checked."""
         self.item.normative = False
@@ -197,3 +197,17 @@ class TestModule(MockDataMixIn, unittest.TestCase):
         do_index = tmp_publisher.getMatrix()
         # Assert
         self.assertEqual(do_index, False)
+
+    def test_publish_tree_jobs(self):
+        """Verify a tree published by several processes matches a serial publish."""
+        serial = os.path.join(self.dirpath, "serial")
+        parallel = os.path.join(self.dirpath, "parallel")
+        # Act
+        publisher.publish(self.mock_tree, serial, ".md")
+        publisher.publish(self.mock_tree, parallel, ".md", jobs=2)
+        # Assert
+        for name in ("HLT.md", "LLT.md", "REQ.md", "TUT.md"):
+            with open(os.path.join(serial, name), "rb") as file:
+                expected = file.read()
+            with open(os.path.join(parallel, name), "rb") as file:
+                self.assertEqual(expected, file.read())
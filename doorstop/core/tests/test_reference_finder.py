@@ -3,13 +3,24 @@
 
 """Unit tests for the doorstop.core.reference_finder module."""
 
+import linecache
 import os
+import re
 import unittest
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 from doorstop.common import DoorstopError
-from doorstop.core.reference_finder import ReferenceFinder
-from doorstop.core.tests import TESTS_ROOT, MockItem, MockSimpleDocument
+from doorstop.core.reference_finder import (
+    KeywordMatcher,
+    ReferenceFinder,
+    ReferenceIndex,
+)
+from doorstop.core.tests import (
+    EXTERNAL,
+    TESTS_ROOT,
+    MockItem,
+    MockSimpleDocument,
+)
 from doorstop.core.vcs.mockvcs import WorkingCopy
 
 
@@ -109,6 +120,25 @@ class TestReferenceFinder(unittest.TestCase):
         self.assertEqual(path, os.path.join("files", "REQ001.yml"))
         self.assertEqual(line, 12)
 
+    @patch("doorstop.settings.CACHE_PATHS", False)
+    def test_find_file_reference_reads_one_file(self):
+        """Verify only the referenced file is read to find a keyword."""
+        reference_path = "files/REQ006.yml"
+        tree = Mock()
+        tree.vcs = WorkingCopy(TESTS_ROOT)
+        item_path = os.path.join("path", "to", "RQ001.yml")
+
+        with patch("linecache.getlines", wraps=linecache.getlines) as mock_getlines:
+            path, line = ReferenceFinder.find_file_reference(
+                reference_path, TESTS_ROOT, tree, item_path, "REF123"
+            )
+
+        self.assertEqual(path, os.path.join("files", "REQ006.yml"))
+        self.assertEqual(line, 10)
+        mock_getlines.assert_called_once_with(
+            os.path.join(TESTS_ROOT, "files", "REQ006.yml")
+        )
+
     def test_find_file_reference_invalid_keyword_given(self):
         keyword = "Invalid keyword"
         reference_path = "files/REQ001.yml"
@@ -139,3 +169,59 @@ class TestReferenceFinder(unittest.TestCase):
             reference_finder.find_file_reference(reference_path, root, tree, item_path)
 
         self.assertTrue("external reference not found" in str(context.exception))
+
+
+class TestKeywordMatcher(unittest.TestCase):
+    """Unit tests for the KeywordMatcher class."""
+
+    def test_search(self):
+        """Verify keywords match like the boundary regex used for one keyword."""
+        keywords = ["REF1", "REF12", "F1", "a.b", "-x", "é"]
+        matcher = KeywordMatcher(keywords)
+        lines = ["REF12\n", "xREF1 a.b", "(REF1)", "a.bc", "y-x", "-x", "café é", ""]
+        for line in lines:
+            expected = {
+                keyword
+                for keyword in keywords
+                if re.search(r"(\b|\W){}(\b|\W)".format(re.escape(keyword)), line)
+            }
+            self.assertEqual(expected, matcher.search(line), line)
+
+
+class TestReferenceIndex(unittest.TestCase):
+    """Unit tests for the ReferenceIndex class."""
+
+    def setUp(self):
+        self.vcs = WorkingCopy(EXTERNAL)
+        self.index = ReferenceIndex(self.vcs)
+        self.path = os.path.join(EXTERNAL, "text.txt")
+
+    def test_add_single_pass(self):
+        """Verify each file is read once for all references."""
+        with patch("linecache.getlines", Mock(return_value=[])) as mock_getlines:
+            self.index.add(refs=["REF122", "REF123", "REF124"])
+        self.assertEqual(2, mock_getlines.call_count)
+
+    def test_find_ref(self):
+        """Verify references are found with their line numbers."""
+        self.index.add(refs=["REF122", "REF124", "text2.txt", "REF999"])
+        self.assertEqual(("text.txt", 1), self.index.find_ref("REF122", "item"))
+        self.assertEqual(("text.txt", 5), self.index.find_ref("REF124", "item"))
+        self.assertEqual(("text2.txt", None), self.index.find_ref("text2.txt", "x"))
+        self.assertIs(None, self.index.find_ref("REF999", "item"))
+
+    def test_find_ref_skip_item(self):
+        """Verify the item's own file is skipped."""
+        self.index.add(refs=["REF123", "RELEVANT"])
+        self.assertIs(None, self.index.find_ref("REF123", self.path))
+        path = os.path.join(EXTERNAL, "text2.txt")
+        self.assertEqual(("text2.txt", 1), self.index.find_ref("RELEVANT", "item"))
+        self.assertIs(None, self.index.find_ref("RELEVANT", path))
+
+    def test_defer(self):
+        """Verify queued references are searched with the next lookup."""
+        self.index.defer(refs=["REF122"], keywords=[(self.path, "REF124")])
+        self.index.add(refs=["REF123"], keywords=[(self.path, "REF123")])
+        self.assertEqual(("text.txt", 1), self.index.find_ref("REF122", "item"))
+        self.assertEqual(5, self.index.find_keyword(self.path, "REF124"))
+        self.assertEqual(3, self.index.find_keyword(self.path, "REF123"))
@@ -0,0 +1,148 @@
+# SPDX-License-Identifier: LGPL-3.0-only
+
+"""Unit tests for the doorstop.core.report module."""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from doorstop import common
+from doorstop.common import DoorstopWarning
+from doorstop.core import report
+from doorstop.core.document import Document
+from doorstop.core.tree import Tree
+
+
+class TestReport(unittest.TestCase):
+    """Unit tests for the Report class."""
+
+    def test_measure(self):
+        """Verify time is charged to the innermost check."""
+        clock = [0.0]
+
+        def inner():
+            clock[0] += 2
+            yield DoorstopWarning("inner")
+
+        def outer():
+            clock[0] += 1
+            yield from report_.measure("inner", inner())
+            yield DoorstopWarning("outer")
+
+        with patch("time.perf_counter", lambda: clock[0]):
+            report_ = report.Report()
+            issues = list(report_.measure("outer", outer()))
+        self.assertEqual(["inner", "outer"], [issue.check for issue in issues])
+        self.assertEqual({"outer": 1, "inner": 2}, report_.checks)
+
+    def test_timings(self):
+        """Verify timings from another report can be added."""
+        report_ = report.Report()
+        report_.checks = {"links": 1.0}
+        report_.add_timings(({"links": 2.0, "item": 1.0}, {"REQ": 3.0}))
+        self.assertEqual({"links": 3.0, "item": 1.0}, report_.checks)
+        self.assertEqual(
+            ({"links": 3.0, "item": 1.0}, {"REQ": 3.0}), report_.pop_timings()
+        )
+        self.assertEqual({}, report_.checks)
+
+
+class TestModule(unittest.TestCase):
+    """Unit tests for the doorstop.core.report module."""
+
+    def setUp(self):
+        self.temp = tempfile.mkdtemp()
+        parent = Document.new(None, os.path.join(self.temp, "sys"), self.temp, "SYS")
+        child = Document.new(
+            None, os.path.join(self.temp, "req"), self.temp, "REQ", parent="SYS"
+        )
+        self.tree = Tree(parent)
+        self.tree._place(child)  # pylint: disable=protected-access
+        parent.tree = child.tree = self.tree
+        parent.add_item()
+        child.add_item().link("SYS009")
+        self.path = os.path.join(self.temp, "report", "issues")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp)
+
+    def test_check(self):
+        """Verify issues are tagged with their check without a report."""
+        issue = DoorstopWarning("issue")
+        issues = list(report.check("links", report.check("suspect", [issue])))
+        self.assertEqual([issue], issues)
+        self.assertEqual("suspect", issue.check)
+
+    def test_prepend(self):
+        """Verify a prepended issue keeps the details of its check."""
+        issue = report.check("links", [DoorstopWarning("issue")])
+        prepended = report.prepend(next(issue), "REQ001")
+        self.assertIsInstance(prepended, DoorstopWarning)
+        self.assertEqual("REQ001: issue", str(prepended))
+        self.assertEqual("links", prepended.check)
+
+    def test_collect_jsonl(self):
+        """Verify each issue is written as a line followed by a summary."""
+        with report.collect(self.path, "jsonl"):
+            self.assertFalse(self.tree.validate())
+        lines = [json.loads(line) for line in common.read_lines(self.path)]
+        self.assertIn(
+            {
+                "document": "REQ",
+                "uid": "REQ001",
+                "severity": "error",
+                "check": "links",
+                "message": "REQ: REQ001: linked to unknown item: SYS009",
+                "path": "req/REQ001.yml",
+            },
+            lines,
+        )
+        summary = lines[-1]["summary"]
+        self.assertEqual(len(lines) - 1, summary["issues"])
+        self.assertLessEqual(summary["stamps"]["hits"], summary["stamps"]["calls"])
+        self.assertTrue(summary["stamps"]["calls"])
+        self.assertEqual(1, summary["errors"])
+        self.assertIn("links", summary["checks"])
+        self.assertEqual(["REQ", "SYS"], sorted(summary["documents"]))
+        self.assertIs(None, report.get())
+
+    def test_collect_json(self):
+        """Verify issues can be written as a JSON document."""
+        with report.collect(self.path, "json"):
+            self.tree.validate()
+        data = json.loads(common.read_text(self.path))
+        self.assertEqual(len(data["issues"]), data["summary"]["issues"])
+
+    def test_collect_json_error(self):
+        """Verify a JSON report is completed when validation raises."""
+        with self.assertRaises(ValueError):
+            with report.collect(self.path, "json"):
+                self.tree.validate()
+                raise ValueError
+        data = json.loads(common.read_text(self.path))
+        self.assertEqual(len(data["issues"]), data["summary"]["issues"])
+        self.assertIs(None, report.get())
+
+    def test_collect_sarif(self):
+        """Verify issues can be written as a SARIF log."""
+        with report.collect(self.path, "sarif"):
+            self.tree.validate()
+        data = json.loads(common.read_text(self.path))
+        run = data["runs"][0]
+        rules = [rule["id"] for rule in run["tool"]["driver"]["rules"]]
+        self.assertEqual(list(report.CHECKS), rules)
+        levels = {result["level"] for result in run["results"]}
+        self.assertEqual({"error", "warning"}, levels)
+        self.assertEqual(len(run["results"]), run["properties"]["summary"]["issues"])
+
+    def test_collect_workers(self):
+        """Verify checks in worker processes are timed."""
+        with report.collect(self.path, "jsonl"):
+            self.tree.validate(workers=2)
+        lines = [json.loads(line) for line in common.read_lines(self.path)]
+        checks = lines[-1]["summary"]["checks"]
+        self.assertIn("workers", checks)
+        self.assertIn("links", checks)
@@ -7,6 +7,7 @@
 import logging
 import operator
 import os
+import shutil
 import subprocess
 import tempfile
 import unittest
@@ -14,11 +15,16 @@ from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 
+from doorstop import common
 from doorstop.common import DoorstopError, DoorstopInfo, DoorstopWarning
+from doorstop.core import tree as tree_module
 from doorstop.core.builder import build
 from doorstop.core.document import Document
+from doorstop.core.item import Item
+from doorstop.core.reference_finder import ReferenceIndex
 from doorstop.core.tests import EMPTY, FILES, GOLDEN_MASTER_FILES, SYS, MockDocumentSkip
 from doorstop.core.tree import Tree
+from doorstop.core.types import UID
 
 
 @pytest.fixture(autouse=True, scope="class")
@@ -456,6 +462,68 @@ class TestTree(unittest.TestCase):
         item2 = self.tree.find_item("req2-001")
         self.assertIs(item2, item)
 
+    def test_find_item_owner(self):
+        """Verify an item is looked up in the document with its prefix."""
+        with patch.object(self.tree.document, "find_item") as mock_find_item:
+            item = self.tree.find_item("REQ001")
+        self.assertEqual("REQ001", item.uid)
+        mock_find_item.assert_not_called()
+
+    def test_get_traceability_non_normative(self):
+        """Verify traceability paths stop at non-normative items."""
+        item = self.tree.find_item("REQ004")
+        item.auto = False
+        item.normative = False
+        rows = [
+            (self.tree.find_item("SYS001"), self.tree.find_item("REQ001")),
+            (self.tree.find_item("SYS002"), self.tree.find_item("REQ001")),
+            (None, self.tree.find_item("REQ002")),
+        ]
+        self.assertListEqual(rows, self.tree.get_traceability())
+
+    def test_get_link_graph(self):
+        """Verify the links between items can be listed."""
+        graph = self.tree.get_link_graph()
+        self.assertEqual(["SYS001", "SYS002"], graph[UID("REQ001")])
+        self.assertEqual([], graph[UID("SYS001")])
+        self.assertEqual([], self.tree.get_cycles(graph))
+
+    def test_get_cycles(self):
+        """Verify each cycle is reported once as a path of UIDs."""
+        graph = {
+            UID("A1"): [UID("A2")],
+            UID("A2"): [UID("A3"), UID("A4")],
+            UID("A3"): [UID("A1")],
+            UID("A4"): [UID("A4")],
+            UID("A5"): [UID("A1")],
+        }
+        cycles = self.tree.get_cycles(graph)
+        expected = [["A1", "A2", "A3", "A1"], ["A4", "A4"]]
+        self.assertEqual(expected, [[str(uid) for uid in c] for c in cycles])
+
+    def test_get_cycles_deep(self):
+        """Verify cycles are found in chains deeper than the recursion limit."""
+        count = 5000
+        graph = {n: [n + 1] for n in range(count)}
+        graph[count] = [0]
+        cycles = self.tree.get_cycles(graph)
+        self.assertEqual([list(range(count + 1)) + [0]], cycles)
+
+    def test_find_child_items(self):
+        """Verify the items linking to an item can be found."""
+        items = self.tree.find_child_items("sys1")
+        self.assertEqual([self.tree.find_item("REQ001")], items)
+
+    def test_find_child_items_updated(self):
+        """Verify the reverse-link index follows link changes."""
+        self.assertEqual(1, len(self.tree.find_child_items("SYS002")))
+        self.tree.link_items("req2", "sys2")
+        items = self.tree.find_child_items("SYS002")
+        self.assertIn(self.tree.find_item("REQ002"), items)
+        self.tree.unlink_items("req2", "sys2")
+        items = self.tree.find_child_items("SYS002")
+        self.assertNotIn(self.tree.find_item("REQ002"), items)
+
     def test_find_document(self):
         """Verify an document can be found by prefix."""
         # Cache miss
@@ -470,6 +538,18 @@ class TestTree(unittest.TestCase):
         self.tree.load()
         self.tree.load()  # should return immediately
 
+    def test_load_workers(self):
+        """Verify a tree loaded in worker processes matches a serial load."""
+        self.tree.load(workers=2)
+        tree = Tree(Document(SYS))
+        tree._place(Document(FILES))  # pylint: disable=W0212
+        tree.load()
+        for document, expected in zip(self.tree, tree):
+            self.assertEqual(
+                [(i.uid, i.data) for i in expected], [(i.uid, i.data) for i in document]
+            )
+        self.assertIn(UID("REQ001"), self.tree._item_cache)  # pylint: disable=W0212
+
     @patch("doorstop.core.document.Document.delete")
     def test_delete(self, mock_delete):
         """Verify a tree can be deleted."""
@@ -477,3 +557,222 @@ class TestTree(unittest.TestCase):
         self.assertEqual(0, len(self.tree))
         self.assertEqual(2, mock_delete.call_count)
         self.tree.delete()  # ensure a second delete is ignored
+
+
+class TestTreeLoadWorkers(unittest.TestCase):
+    """Unit tests for loading a Tree in worker processes."""
+
+    def setUp(self):
+        self.temp = tempfile.mkdtemp()
+        document = Document.new(None, self.temp, self.temp, "TMP")
+        self.tree = Tree(document)
+        document.tree = self.tree
+
+    def tearDown(self):
+        shutil.rmtree(self.temp)
+
+    def test_load_error(self):
+        """Verify parse errors are reported the same as a serial load."""
+        common.write_text("text: [\n", os.path.join(self.temp, "TMP001.yml"))
+        with self.assertRaises(DoorstopError) as serial:
+            self.tree.load()
+        with self.assertRaises(DoorstopError) as parallel:
+            self.tree.load(reload=True, workers=2)
+        self.assertEqual(str(serial.exception), str(parallel.exception))
+
+
+class TestTreeBatch(unittest.TestCase):
+    """Unit tests for deferring saves in a Tree batch."""
+
+    def setUp(self):
+        self.temp = tempfile.mkdtemp()
+        document = Document.new(None, self.temp, self.temp, "TMP")
+        self.tree = Tree(document)
+        document.tree = self.tree
+        self.item = document.add_item()
+        self.item2 = document.add_item()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp)
+
+    def test_batch(self):
+        """Verify each changed file is written once when a batch ends."""
+        with patch("doorstop.common.write_text", wraps=common.write_text) as mock:
+            with self.tree.batch():
+                self.item.text = "changed"
+                self.item.header = "header"
+                self.item.link("SYS001")
+                mock.assert_not_called()
+        mock.assert_called_once()
+        self.assertTrue(self.item.auto)
+        self.assertIn("changed", common.read_text(self.item.path))
+
+    def test_batch_workers(self):
+        """Verify changed files can be written in threads."""
+        with self.tree.batch(workers=2):
+            self.item.text = "one"
+            self.item2.text = "two"
+        self.assertIn("one", common.read_text(self.item.path))
+        self.assertIn("two", common.read_text(self.item2.path))
+
+    def test_batch_nested(self):
+        """Verify a nested batch waits for the outer batch."""
+        with self.tree.batch() as outer:
+            with self.tree.batch() as inner:
+                self.item.text = "changed"
+            self.assertIs(outer, inner)
+            self.assertNotIn("changed", common.read_text(self.item.path))
+        self.assertIn("changed", common.read_text(self.item.path))
+
+    def test_batch_rollback(self):
+        """Verify changes are discarded when a batch raises."""
+        text = common.read_text(self.item.path)
+        with self.assertRaises(ValueError):
+            with self.tree.batch():
+                self.item.text = "changed"
+                self.item.level = "5"
+                raise ValueError
+        self.assertEqual(text, common.read_text(self.item.path))
+        self.assertEqual("", self.item.text)
+        self.assertEqual([self.item, self.item2], self.tree.document.items)
+
+    def test_batch_rollback_created(self):
+        """Verify items created in a batch are deleted when it raises."""
+        with self.assertRaises(ValueError):
+            with self.tree.batch():
+                item = self.tree.document.add_item()
+                item.text = "new"
+                raise ValueError
+        self.assertFalse(os.path.exists(item.path))
+        self.assertEqual([self.item, self.item2], self.tree.document.items)
+        self.assertRaises(DoorstopError, self.tree.find_item, item.uid)
+
+    def test_batch_save(self):
+        """Verify saving inside a batch does not end the batch for the item."""
+        with patch("doorstop.common.write_text", wraps=common.write_text) as mock:
+            with self.tree.batch():
+                self.item.text = "one"
+                self.item.save()
+                self.assertEqual(1, mock.call_count)
+                self.item.text = "two"
+                self.assertEqual(1, mock.call_count)
+                self.assertIn("one", common.read_text(self.item.path))
+        self.assertEqual(2, mock.call_count)
+        self.assertTrue(self.item.auto)
+        self.assertIn("two", common.read_text(self.item.path))
+
+
+class TestTreeValidateWorkers(unittest.TestCase):
+    """Unit tests for validating a Tree in worker processes."""
+
+    def setUp(self):
+        self.temp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp)
+
+    def _build(self, name):
+        """Create a tree with a parent, a child, and some invalid links."""
+        root = os.path.join(self.temp, name)
+        parent = Document.new(None, os.path.join(root, "sys"), root, "SYS")
+        child = Document.new(None, os.path.join(root, "req"), root, "REQ", parent="SYS")
+        tree = Tree(parent)
+        tree._place(child)  # pylint: disable=protected-access
+        parent.tree = child.tree = tree
+        parent.add_item()
+        parent.add_item()
+        child.add_item().link("SYS001")
+        child.add_item().link("SYS009")
+        child.add_item()
+        return tree
+
+    def test_get_issues_workers(self):
+        """Verify parallel validation reports issues in the serial order."""
+        serial = self._build("serial")
+        parallel = self._build("parallel")
+        expected = [str(issue) for issue in serial.get_issues()]
+        actual = [str(issue) for issue in parallel.get_issues(workers=2)]
+        self.assertTrue(expected)
+        self.assertEqual(expected, actual)
+        for document in parallel:
+            for item in document:
+                self.assertTrue(item.reviewed)
+
+    def test_check_items_stamps(self):
+        """Verify stamps used in worker processes are counted here."""
+        tree = self._build("tree")
+        calls = Item.stamp_calls
+        checked = tree._check_items(list(tree), [], None, 2)  # pylint: disable=W0212
+        self.assertEqual(5, len(checked))
+        self.assertLess(calls, Item.stamp_calls)
+
+    @patch("doorstop.core.tree._checked_tree", None)
+    def test_start_check_worker(self):
+        """Verify a worker rebuilds the tree from its files and links."""
+        tree = self._build("tree")
+        documents, root, links = tree._snapshot()  # pylint: disable=W0212
+        self.assertEqual(tree.root, root)
+        self.assertEqual(2, len(documents))
+        req1 = tree.find_item("REQ001")
+        self.assertEqual([req1.path], links[UID("SYS001").key])
+        index = ReferenceIndex.get(tree.vcs)
+        tree_module._start_check_worker((documents, root, links), index, {})
+        worker = tree_module._checked_tree
+        self.assertIsNot(tree, worker)
+        self.assertEqual(["SYS", "REQ"], [str(d.prefix) for d in worker])
+        items = worker.find_child_items("SYS001")
+        self.assertEqual([req1.path], [item.path for item in items])
+
+
+class TestTreeChangedItems(unittest.TestCase):
+    """Unit tests for validating the items affected by changes."""
+
+    def setUp(self):
+        self.temp = tempfile.mkdtemp()
+        parent = Document.new(None, os.path.join(self.temp, "sys"), self.temp, "SYS")
+        child = Document.new(
+            None, os.path.join(self.temp, "req"), self.temp, "REQ", parent="SYS"
+        )
+        self.tree = Tree(parent)
+        self.tree._place(child)  # pylint: disable=protected-access
+        parent.tree = child.tree = self.tree
+        self.sys1 = parent.add_item()
+        self.sys2 = parent.add_item()
+        self.req1 = child.add_item()
+        self.req1.link("SYS001")
+        self.req2 = child.add_item()
+        self.req2.link("SYS002")
+        self.req3 = child.add_item()
+        self.tree._vcs = Mock()  # pylint: disable=protected-access
+
+    def tearDown(self):
+        shutil.rmtree(self.temp)
+
+    def test_find_changed_items(self):
+        """Verify changed items are expanded to their parents and children."""
+        self.tree.vcs.changed.return_value = [self.req1.path]
+        self.assertEqual([self.sys1, self.req1], self.tree.find_changed_items("main"))
+        self.tree.vcs.changed.assert_called_once_with("main", "HEAD")
+        self.tree.vcs.changed.return_value = [self.sys2.path]
+        self.assertEqual([self.sys2, self.req2], self.tree.find_changed_items("main"))
+
+    def test_find_changed_items_document(self):
+        """Verify changed document settings affect all of its items."""
+        self.tree.vcs.changed.return_value = [self.req1.document.config]
+        items = self.tree.find_changed_items("main")
+        self.assertEqual([self.sys1, self.sys2, self.req1, self.req2, self.req3], items)
+
+    def test_find_changed_items_deleted(self):
+        """Verify items linking to a deleted item are affected."""
+        path = os.path.join(self.temp, "sys", "SYS002.yml")
+        self.sys2.delete()
+        self.tree.vcs.changed.return_value = [path]
+        self.assertEqual([self.req2], self.tree.find_changed_items("main"))
+
+    def test_get_issues_scope(self):
+        """Verify only the items in scope are checked."""
+        issues = self.tree.get_issues(scope={self.req3.path})
+        self.assertEqual(
+            ["REQ: REQ003: no text", "REQ: REQ003: no links to parent document: SYS"],
+            [str(issue) for issue in issues],
+        )
@@ -176,6 +176,26 @@ class TestUID(unittest.TestCase):
         uids = [UID("a"), UID("a1"), UID("a2"), UID("b")]
         self.assertListEqual(uids, sorted(uids))
 
+    def test_split_shared(self):
+        """Verify UIDs with the same value share their parsed parts."""
+        uid1 = UID("REQ-name")
+        uid2 = UID("REQ-name")
+        self.assertIsNot(uid1, uid2)
+        self.assertIs(uid1._prefix, uid2._prefix)
+        self.assertIs(uid1._name, uid2._name)
+        self.assertEqual(hash(uid1), hash(UID("REQ", "-", "name")))
+
+    def test_key(self):
+        """Verify UID keys follow the equality rules."""
+        self.assertEqual(UID("req1").key, self.uid1.key)
+        self.assertNotEqual(UID("REQ002").key, self.uid1.key)
+        self.assertEqual(UID("req").key, UID("REQ").key)
+
+    def test_slots(self):
+        """Verify UIDs do not carry an instance dictionary."""
+        self.assertFalse(hasattr(self.uid4, "__dict__"))
+        self.assertFalse(hasattr(self.uid4.stamp, "__dict__"))
+
     def test_prefix(self):
         """Verify UIDs have prefixes."""
         self.assertEqual("REQ", self.uid1.prefix)
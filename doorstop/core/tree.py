@@ -4,17 +4,24 @@
 
 """Representation of a hierarchy of documents."""
 
+import os
 import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import partial
 from itertools import chain
-from typing import Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from doorstop import common, settings
 from doorstop.common import DoorstopError, DoorstopWarning
-from doorstop.core import vcs
-from doorstop.core.base import BaseValidatable
+from doorstop.core import cache, report, vcs
+from doorstop.core.base import BaseValidatable, Batch
 from doorstop.core.document import Document
-from doorstop.core.item import Item
+from doorstop.core.item import Item, parse_text
+from doorstop.core.reference_finder import ReferenceFinder, ReferenceIndex
 from doorstop.core.types import UID, Prefix
+from doorstop.core.validators.item_validator import ItemValidator
 
 UTF8 = "utf-8"
 CP437 = "cp437"
@@ -31,6 +38,165 @@ BOX = {
 log = common.logger(__name__)
 
 
+def _parse_item_file(key):
+    """Read and parse an item file in a worker process.
+
+    :param key: path and format of the item file
+
+    :return: parsed data or the exception raised while parsing
+
+    """
+    path, itemformat = key
+    try:
+        return parse_text(common.read_text(path), path, itemformat)
+    except Exception as exc:  # pylint: disable=broad-except
+        return exc
+
+
+_checked_tree = None  # tree rebuilt from its files in a worker process
+
+
+def _start_check_worker(snapshot, index, values, timed=False):
+    """Prepare a worker process to check items of a tree rebuilt from files.
+
+    Only the checked items, the items they link to, and the items linking
+    to them are loaded from their files.
+
+    :param snapshot: document paths and reverse links from :meth:`Tree._snapshot`
+    :param index: reference index with every item's references found
+    :param values: settings of the parent process
+    :param timed: collect the time spent on each check for a report
+
+    """
+    global _checked_tree  # pylint: disable=W0603
+    for name, value in values.items():
+        setattr(settings, name, value)
+    ReferenceIndex.set(index)
+    if timed:
+        report.enable()
+    documents, root, links = snapshot
+    tree = Tree.from_list(
+        [Document(path, root, itemformat=itemformat) for path, itemformat in documents],
+        root=root,
+    )
+    items = {item.path: item for document in tree for item in document}
+    # pylint: disable=protected-access
+    tree._child_index = {
+        key: [items[path] for path in paths] for key, paths in links.items()
+    }
+    _checked_tree = tree
+
+
+def _check_item_files(task):
+    """Check items of a document in a worker process.
+
+    :param task: document prefix, paths of the items to check, and the
+        list of document prefixes to skip
+
+    :return: list of results from
+        :meth:`~doorstop.core.validators.item_validator.ItemValidator.check`,
+        the time spent on each check (or None when not timed), and the
+        numbers of item stamps reused and requested
+
+    """
+    prefix, paths, skip = task
+    assert _checked_tree is not None
+    stamp_hits, stamp_calls = Item.stamp_hits, Item.stamp_calls
+    document = _checked_tree.find_document(prefix)
+    items = {item.path: item for item in document}
+    validator = ItemValidator(readonly=True)
+    results = []
+    for path in paths:
+        with report.timer("item", document=document):
+            results.append(validator.check(items[path], skip=skip))
+    timed = report.get()
+    stamps = Item.stamp_hits - stamp_hits, Item.stamp_calls - stamp_calls
+    return results, timed.pop_timings() if timed else None, stamps
+
+
+def _normpath(path):
+    """Normalize a path for comparisons with changed paths."""
+    return os.path.normcase(os.path.normpath(os.path.abspath(path)))
+
+
+def _strongly_connected(graph):
+    """Yield the strongly connected components of a directed graph.
+
+    This is Tarjan's algorithm with an explicit stack so deep chains of
+    links cannot exceed the recursion limit.
+
+    :param graph: dictionary of node to a list of successor nodes
+
+    :return: generator of lists of nodes
+
+    """
+    index: Dict[Any, int] = {}
+    lowlink: Dict[Any, int] = {}
+    stack: List[Any] = []
+    on_stack = set()
+    for root in graph:
+        if root in index:
+            continue
+        index[root] = lowlink[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(graph[root]))]
+        while work:
+            node, successors = work[-1]
+            for successor in successors:
+                if successor not in index:
+                    index[successor] = lowlink[successor] = len(index)
+                    stack.append(successor)
+                    on_stack.add(successor)
+                    work.append((successor, iter(graph[successor])))
+                    break
+                if successor in on_stack:
+                    lowlink[node] = min(lowlink[node], index[successor])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.remove(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    yield component
+
+
+def _find_cycle(graph, start, members):
+    """Get the shortest path of nodes from a node back to itself.
+
+    :param graph: dictionary of node to a list of successor nodes
+    :param start: node to start and end the path
+    :param members: nodes the path may pass through
+
+    :return: list of nodes starting and ending with the start node
+
+    """
+    parents: Dict[Any, Any] = {}
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        for successor in graph[node]:
+            if successor == start:
+                path = [start]
+                while node != start:
+                    path.append(node)
+                    node = parents[node]
+                path.append(start)
+                path[1:-1] = reversed(path[1:-1])
+                return path
+            if successor in members and successor not in parents:
+                parents[successor] = node
+                queue.append(successor)
+    raise ValueError("{} is not part of a cycle".format(start))
+
+
 class Tree(BaseValidatable):  # pylint: disable=R0902
     """A bidirectional tree structure to store a hierarchy of documents.
 
@@ -103,6 +269,8 @@ class Tree(BaseValidatable):  # pylint: disable=R0902
         self._loaded = False
         self._item_cache: Dict[Union[str, UID], Item] = {}
         self._document_cache: Dict[str, Optional[Document]] = {}
+        self._child_index: Optional[Dict[Any, List[Item]]] = None
+        self._batch: Optional[Batch] = None  # changes waiting to be saved
 
     def __repr__(self):
         return "<Tree {}>".format(self._draw_line())
@@ -440,7 +608,7 @@ class Tree(BaseValidatable):  # pylint: disable=R0902
             else:
                 log.trace("found cached unknown: {}".format(uid))  # type: ignore
         except KeyError:
-            for document in self:
+            for document in self._find_item_documents(uid):
                 try:
                     item = document.find_item(uid, _kind=_kind)
                 except DoorstopError:
@@ -462,12 +630,154 @@ class Tree(BaseValidatable):  # pylint: disable=R0902
 
         raise DoorstopError(UID.UNKNOWN_MESSAGE.format(k=_kind, u=uid))
 
-    def get_issues(self, skip=None, document_hook=None, item_hook=None):
+    def _find_item_documents(self, uid):
+        """Yield the documents to search for an item, its own prefix first."""
+        try:
+            owner = self.find_document(uid.prefix)
+        except DoorstopError:
+            owner = None  # search all documents for an unusual UID
+        else:
+            yield owner
+        for document in self:
+            if document is not owner:
+                yield document
+
+    def find_child_items(self, value):
+        """Get the items that link to an item by its UID (reverse links).
+
+        The reverse-link index is built on first use and then kept current
+        as items are linked, unlinked, added, and deleted.
+
+        :param value: item or UID
+
+        :return: list of linking :class:`~doorstop.core.item.Item`
+            (including inactive items)
+
+        """
+        uid = UID(value)
+        if self._child_index is None:
+            self._index_child_links()
+        assert self._child_index is not None
+        return list(self._child_index.get(uid.key, []))
+
+    def _index_child_links(self):
+        """Build the index of parent UIDs to the items that link to them."""
+        log.debug("indexing child links...")
+        index: Dict[Any, List[Item]] = {}
+        for document in self:
+            for item in document:
+                for uid in item.links:
+                    index.setdefault(uid.key, []).append(item)
+        self._child_index = index
+
+    def _update_child_index(self, item, old=(), new=()):
+        """Update the reverse-link index after an item's links change.
+
+        :param item: :class:`~doorstop.core.item.Item` whose links changed
+        :param old: UIDs the item no longer links to
+        :param new: UIDs the item now links to
+
+        """
+        if self._child_index is None:
+            return  # the index will be built from the current links
+        old_keys = {uid.key for uid in old}
+        new_keys = {uid.key for uid in new}
+        for key in old_keys - new_keys:
+            items = self._child_index.get(key, [])
+            if item in items:
+                items.remove(item)
+        for key in new_keys - old_keys:
+            items = self._child_index.setdefault(key, [])
+            if item not in items:
+                items.append(item)
+
+    def _clear_child_index(self):
+        """Force the reverse-link index to be rebuilt on next use."""
+        self._child_index = None
+
+    def find_changed_items(self, since, until="HEAD"):
+        """Get the items affected by changes between two revisions.
+
+        Items are affected when their file changed, when their document's
+        settings changed, or when a file they reference changed. Items
+        linked to or from an affected item (including items linking to a
+        deleted item) are checked as well.
+
+        :param since: revision to compare from (through its merge base
+            with `until`)
+        :param until: revision to compare to
+
+        :raises: :class:`~doorstop.common.DoorstopError` if the working
+            copy cannot compare revisions
+
+        :return: list of affected :class:`~doorstop.core.item.Item`
+            in document order
+
+        """
+        paths = {_normpath(path) for path in self.vcs.changed(since, until)}
+        log.info("{} file(s) changed since {}".format(len(paths), since))
+        changed = []
+        found = set()
+        for document in self:
+            settings_changed = _normpath(document.config) in paths
+            for item in document.items:
+                path = _normpath(item.path)
+                found.add(path)
+                references = [
+                    _normpath(os.path.join(item.root, reference["path"]))
+                    for reference in item.references or []
+                ]
+                if (
+                    settings_changed
+                    or path in paths
+                    or any(reference in paths for reference in references)
+                ):
+                    changed.append(item.uid)
+        # Files deleted from a document's directory were probably items
+        directories = {_normpath(document.path) for document in self}
+        for path in paths - found:
+            if os.path.dirname(path) in directories:
+                stem = os.path.splitext(os.path.basename(path))[0]
+                if not stem.startswith("."):
+                    changed.append(UID(stem))
+        # Check the neighbors of changed items through the link graph
+        affected = set()
+        for uid in changed:
+            neighbors = self.find_child_items(uid)
+            try:
+                item = self.find_item(uid)
+            except DoorstopError:
+                pass  # deleted or inactive item
+            else:
+                neighbors.append(item)
+                for link in item.links:
+                    try:
+                        neighbors.append(self.find_item(link))
+                    except DoorstopError:
+                        pass  # unknown items are reported by the linking item
+            affected.update(_normpath(neighbor.path) for neighbor in neighbors)
+        return [
+            item
+            for document in self
+            for item in document.items
+            if _normpath(item.path) in affected
+        ]
+
+    def get_issues(
+        self,
+        skip=None,
+        document_hook=None,
+        item_hook=None,
+        workers=None,
+        scope=None,
+    ):
         """Yield all the tree's issues.
 
         :param skip: list of document prefixes to skip
         :param document_hook: function to call for custom document validation
         :param item_hook: function to call for custom item validation
+        :param workers: number of processes used to check items
+        :param scope: paths of the items to check (all items when None)
 
         :return: generator of :class:`~doorstop.common.DoorstopError`,
                               :class:`~doorstop.common.DoorstopWarning`,
@@ -476,18 +786,186 @@ class Tree(BaseValidatable):  # pylint: disable=R0902
         """
         hook = document_hook if document_hook else lambda **kwargs: []
         documents = list(self)
+        stamp_calls, stamp_hits = Item.stamp_calls, Item.stamp_hits
+        # Only check the items in scope (e.g. affected by changes)
+        if scope is not None:
+            documents = [
+                document
+                for document in documents
+                if any(item.path in scope for item in document.items)
+            ]
+        # Reuse issues from the last run for items unaffected by changes
+        validation_cache = None
+        if settings.CACHE_VALIDATION and documents and scope is None:
+            validation_cache = cache.get_validation(self.root)
+            validation_cache.start(self, skip=skip)
+        # Search for the external references of all items to check at once
+        if settings.CHECK_REF and documents:
+            items = [
+                item
+                for document in documents
+                if document.prefix not in (skip or [])
+                for item in document.items
+                if scope is None or item.path in scope
+                if not validation_cache or validation_cache.check_needed(item)
+            ]
+            ReferenceFinder.index(self, items)
+        # Check items in worker processes (issues are still yielded in order)
+        checked = None
+        if workers and workers > 1 and documents:
+            with report.timer("workers"):
+                checked = self._check_items(
+                    documents, skip or [], validation_cache, workers, scope
+                )
         # Check for documents
-        if not documents:
+        if not documents and scope is None:
             yield DoorstopWarning("no documents")
         # Check each document
         for document in documents:
             for issue in chain(
-                hook(document=document, tree=self),
-                document.get_issues(skip=skip, item_hook=item_hook),
+                report.check("hooks", partial(hook, document=document, tree=self)),
+                report.check(
+                    "document",
+                    partial(
+                        document.get_issues,
+                        skip=skip,
+                        item_hook=item_hook,
+                        validation_cache=validation_cache,
+                        checked=checked,
+                        scope=scope,
+                    ),
+                    document=document,
+                ),
             ):
                 # Prepend the document's prefix to yielded exceptions
                 if isinstance(issue, Exception):
-                    yield type(issue)("{}: {}".format(document.prefix, issue))
+                    yield report.prepend(issue, document.prefix)
+        if validation_cache:
+            validation_cache.finish()
+        hits, calls = Item.stamp_hits - stamp_hits, Item.stamp_calls - stamp_calls
+        log.info("reused {} of {} item stamps".format(hits, calls))
+        report.count_stamps(hits, calls)
+
+    def _check_items(self, documents, skip, validation_cache, workers, scope=None):
+        """Check the items of documents in a pool of worker processes.
+
+        Workers check a copy of the tree and never write files. Their
+        changes are applied (and saved) in this process when the issues
+        of each item are yielded.
+
+        :param documents: documents to check
+        :param skip: list of document prefixes to skip
+        :param validation_cache: :class:`~doorstop.core.cache.ValidationCache`
+            with issues to reuse for items unaffected by changes (or None)
+        :param workers: number of worker processes
+        :param scope: paths of the items to check (all items when None)
+
+        :return: dictionary of check results keyed by item path
+
+        """
+        tasks = []
+        count = 0
+        for document in documents:
+            if document.prefix in skip:
+                continue
+            paths = [
+                item.path
+                for item in document.items
+                if scope is None or item.path in scope
+                if not validation_cache or validation_cache.check_needed(item)
+            ]
+            count += len(paths)
+            tasks.append((document.prefix, paths))
+        checked: Dict[str, Any] = {}
+        if not count:
+            return checked
+        log.info("checking {} item(s) in {} processes...".format(count, workers))
+        chunksize = max(1, count // (workers * 4))
+        chunks = [
+            (prefix, paths[start : start + chunksize], skip)
+            for prefix, paths in tasks
+            for start in range(0, len(paths), chunksize)
+        ]
+        # Share the references found so far instead of searching again
+        index = ReferenceIndex.get(self.vcs)
+        with report.timer("references"):
+            index.search()
+        values = {name: getattr(settings, name) for name in dir(settings)}
+        values = {name: value for name, value in values.items() if name.isupper()}
+        timed = report.get()
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_start_check_worker,
+            initargs=(self._snapshot(), index, values, timed is not None),
+        ) as executor:
+            for (_, paths, _), (results, timings, stamps) in zip(
+                chunks, executor.map(_check_item_files, chunks)
+            ):
+                checked.update(zip(paths, results))
+                if timed and timings:
+                    timed.add_timings(timings)
+                # Count the stamps of workers with the stamps of this process
+                Item.stamp_hits += stamps[0]
+                Item.stamp_calls += stamps[1]
+        return checked
+
+    def _snapshot(self):
+        """Get what a worker process needs to rebuild the tree from files.
+
+        :return: paths and item formats of the documents, the root of the
+            tree, and the paths of the items linking to each UID
+
+        """
+        documents = [(document.path, document.itemformat) for document in self]
+        if self._child_index is None:
+            self._index_child_links()
+        assert self._child_index is not None
+        links = {
+            key: [item.path for item in items]
+            for key, items in self._child_index.items()
+        }
+        return documents, self.root, links
+
+    def get_link_graph(self):
+        """Get the links between the tree's active items.
+
+        :return: dictionary of item UID to the UIDs of the items it
+            links to (unknown and inactive items are left out)
+
+        """
+        uids: Dict[Any, UID] = {}
+        for document in self:
+            for item in document.items:
+                uids.setdefault(item.uid.key, item.uid)
+        graph: Dict[UID, List[UID]] = {}
+        for document in self:
+            for item in document.items:
+                if item.uid not in graph:
+                    graph[item.uid] = [
+                        uids[uid.key] for uid in item.links if uid.key in uids
+                    ]
+        return graph
+
+    def get_cycles(self, graph=None):
+        """Get the cycles of links between the tree's items.
+
+        One cycle is reported for each group of items that link to each
+        other, starting and ending with the group's first item.
+
+        :param graph: link graph from :meth:`get_link_graph` (or None)
+
+        :return: list of lists of item UIDs
+
+        """
+        graph = self.get_link_graph() if graph is None else graph
+        order = {uid: position for position, uid in enumerate(graph)}
+        cycles = []
+        for component in _strongly_connected(graph):
+            start = min(component, key=order.__getitem__)
+            if len(component) > 1 or start in graph[start]:
+                cycles.append(_find_cycle(graph, start, set(component)))
+        cycles.sort(key=lambda cycle: order[cycle[0]])
+        return cycles
 
     def get_traceability(self):
         """Return sorted rows of traceability slices.
@@ -506,17 +984,29 @@ class Tree(BaseValidatable):  # pylint: disable=R0902
             return row2
 
         # Create mapping of document prefix to slice index
+        documents = self.documents
         mapping = {}
-        for index, document in enumerate(self.documents):
+        for index, document in enumerate(documents):
             mapping[document.prefix] = index
 
-        # Collect all rows
+        # Create mapping of each document to its child documents
+        child_documents = {}
+        for document in documents:
+            child_documents[id(document)] = {
+                id(document2)
+                for document2 in documents
+                if document2.parent == document.prefix
+            }
+
+        # Collect all rows from the items without parents
         rows = set()
-        for index, document in enumerate(self.documents):
+        child_items: Dict[int, List[Item]] = {}
+        for document in documents:
             for item in document:
-                if item.active:
-                    for row in self._iter_rows(item, mapping):
-                        rows.add(row)
+                if item.active and item.normative and not item.links:
+                    rows.update(
+                        self._iter_rows(item, mapping, child_documents, child_items)
+                    )
 
         # Sort rows
         return sorted(rows, key=by_uid)
@@ -530,57 +1020,56 @@ class Tree(BaseValidatable):  # pylint: disable=R0902
         children = [c.document.prefix for c in self.children]
         return children
 
-    def _iter_rows(
-        self, item, mapping, parent=True, child=True, row=None
-    ):  # pylint: disable=R0913
-        """Generate all traceability row slices.
+    def _iter_rows(self, item, mapping, child_documents, child_items):
+        """Generate the traceability rows of every path down from an item.
+
+        The paths are walked depth first while filling in a single row, so
+        paths that share a prefix share the work of building it. A row is
+        complete when its last item has no child items. A path that reaches
+        an inactive or non-normative item is dropped.
 
-        :param item: base :class:`~doorstop.core.item.Item` for slicing
+        :param item: :class:`~doorstop.core.item.Item` without parent items
         :param mapping: `dict` of document prefix to slice index
-        :param parent: indicate recursion is in the parent direction
-        :param child: indicates recursion is in the child direction
-        :param row: currently generated row
+        :param child_documents: `dict` of document ID to child document IDs
+        :param child_items: `dict` of item ID to child items (filled in here)
 
         """
 
-        class Row(list):
-            """List type that tracks upper and lower boundaries."""
-
-            def __init__(self, *args, parent=False, child=False, **kwargs):
-                super().__init__(*args, **kwargs)
-                # Flags to indicate upper and lower bounds have been hit
-                self.parent = parent
-                self.child = child
-
-        if item.normative:
-            # Start the next row or copy from recursion
-            if row is None:
-                row = Row([None] * len(mapping))
+        def get_child_items(item):
+            if id(item) not in child_items:
+                documents = child_documents[id(item.document)]
+                child_items[id(item)] = [
+                    item2
+                    for item2 in self.find_child_items(item.uid)
+                    if id(item2.document) in documents
+                ]
+            return child_items[id(item)]
+
+        row: List[Optional[Item]] = [None] * len(mapping)
+        index = mapping[item.document.prefix]
+        row[index] = item
+        if not get_child_items(item):
+            yield tuple(row)
+            return
+        stack = [(index, iter(get_child_items(item)))]
+        while stack:
+            index, items = stack[-1]
+            for item2 in items:
+                if item2.active and item2.normative:
+                    break
+            else:
+                row[index] = None
+                stack.pop()
+                continue
+            index = mapping[item2.document.prefix]
+            row[index] = item2
+            if get_child_items(item2):
+                stack.append((index, iter(get_child_items(item2))))
             else:
-                row = Row(row, parent=row.parent, child=row.child)
-
-            # Add the current item to the row
-            row[mapping[item.document.prefix]] = item
-
-            # Recurse to the next parent/child item
-            if parent:
-                items = item.parent_items
-                for item2 in items:
-                    yield from self._iter_rows(item2, mapping, child=False, row=row)
-                if not items:
-                    row.parent = True
-            if child:
-                items = item.child_items
-                for item2 in items:
-                    yield from self._iter_rows(item2, mapping, parent=False, row=row)
-                if not items:
-                    row.child = True
-
-            # Yield the row if both boundaries have been hit
-            if row.parent and row.child:
                 yield tuple(row)
+                row[index] = None
 
-    def load(self, reload=False):
+    def load(self, reload=False, workers=None):
         """Load the tree's documents and items.
 
         Unlike the :class:`~doorstop.core.document.Document` and
@@ -589,15 +1078,80 @@ class Tree(BaseValidatable):  # pylint: disable=R0902
         content in large trees where lazy loading may cause long delays
         late in processing.
 
+        :param reload: reload the tree if already loaded
+        :param workers: number of processes used to parse item files
+
         """
         if self._loaded and not reload:
             return
         log.info("loading the tree...")
+        parsed = self._parse_items(workers) if workers and workers > 1 else None
         for document in self:
-            document.load(reload=True)
+            document.load(reload=True, parsed=parsed)
         # Set meta attributes
         self._loaded = True
 
+    def _parse_items(self, workers):
+        """Parse the tree's item files in a pool of worker processes.
+
+        :param workers: number of worker processes
+
+        :return: dictionary of parsed data (or the exception raised while
+            parsing) keyed by item path and format
+
+        """
+        parsed: Dict[Tuple[str, str], Any] = {}
+        keys = []
+        filecaches = {}
+        for document in self:
+            itemformat = document.itemformat
+            filecache = cache.get(document.root) if settings.CACHE_FILES else None
+            for path in document._iter_item_paths():  # pylint: disable=W0212
+                data = filecache.get(path, itemformat) if filecache else None
+                if data is None:
+                    keys.append((path, itemformat))
+                    filecaches[path] = filecache
+                else:
+                    parsed[(path, itemformat)] = data
+        if not keys:
+            return parsed
+        msg = "parsing {} item file(s) in {} processes...".format(len(keys), workers)
+        log.info(msg)
+        chunksize = max(1, len(keys) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(_parse_item_file, keys, chunksize=chunksize)
+            for (path, itemformat), data in zip(keys, results):
+                parsed[(path, itemformat)] = data
+                filecache = filecaches[path]
+                if filecache and not isinstance(data, Exception):
+                    filecache.set(path, itemformat, data)
+        return parsed
+
+    @contextmanager
+    def batch(self, workers=None):
+        """Defer automatic saves of the tree's items and documents.
+
+        Each changed file is written once when the block exits. If the
+        block raises an exception, the changed objects are reloaded from
+        their files instead.
+
+        :param workers: number of threads used to write changed files
+
+        """
+        if self._batch is not None:
+            yield self._batch
+            return
+        batch = self._batch = Batch()
+        try:
+            yield batch
+        except BaseException:
+            self._batch = None
+            log.info("discarding {} unsaved change(s)...".format(len(batch)))
+            batch.rollback()
+            raise
+        self._batch = None
+        batch.save(workers=workers)
+
     def draw(self, encoding=None, html_links=False):
         """Get the tree structure as text.
 
@@ -2,9 +2,11 @@
 
 """Common classes and functions for the `doorstop.core` package."""
 
+import functools
 import hashlib
 import os
 import re
+import sys
 from base64 import urlsafe_b64encode
 from typing import Union
 
@@ -19,6 +21,8 @@ log = common.logger(__name__)
 class Prefix(str):
     """Unique document prefixes."""
 
+    __slots__ = ()
+
     UNKNOWN_MESSAGE = "no document with prefix: {}"
 
     def __new__(cls, value=""):
@@ -64,6 +68,8 @@ class UID:
 
     UNKNOWN_MESSAGE = "no{k} item with UID: {u}"  # k='parent'|'child', u=UID
 
+    __slots__ = ("stamp", "value", "_prefix", "_number", "_name", "_exc")
+
     def __new__(cls, *args, **kwargs):  # pylint: disable=W0613
         if args and isinstance(args[0], UID):
             return args[0]
@@ -189,6 +195,13 @@ class UID:
         self.check()
         return self._name
 
+    @property
+    def key(self):
+        """Get a hashable key that follows the UID's equality rules."""
+        if self._exc:
+            return self.value.lower()
+        return self._prefix.lower(), self._number, self._name
+
     @property
     def string(self):
         """Convert the UID and stamp to a single string."""
@@ -225,18 +238,10 @@ class UID:
         (Prefix('REQ2'), -1, '123NAME', None)
 
         """
-        m = re.match("([\\w.-]+)[" + settings.SEP_CHARS + "](\\w+)", value)
-        if m:
-            try:
-                num = int(m.group(2))
-                return Prefix(m.group(1)), num, "", None
-            except ValueError:
-                return Prefix(m.group(1)), -1, m.group(2), None
-        m = re.match(r"([\w.-]*\D)(\d+)", value)
-        if m:
-            num = int(m.group(2))
-            return Prefix(m.group(1).rstrip(settings.SEP_CHARS)), num, "", None
-        return None, None, None, DoorstopError("invalid UID: {}".format(value))
+        prefix, number, name, message = _split_uid(value, settings.SEP_CHARS)
+        if message:
+            return None, None, None, DoorstopError(message)
+        return prefix, number, name, None
 
     @staticmethod
     def join_uid_4(prefix, sep, number, digits):
@@ -260,23 +265,56 @@ class UID:
         return "{}{}{}".format(prefix, sep, name)
 
 
+@functools.lru_cache(maxsize=None)
+def _uid_patterns(sep_chars):
+    """Get the compiled patterns that split UIDs with the given separators."""
+    return (
+        re.compile("([\\w.-]+)[" + sep_chars + "](\\w+)"),
+        re.compile(r"([\w.-]*\D)(\d+)"),
+    )
+
+
+@functools.lru_cache(maxsize=65536)
+def _split_uid(value, sep_chars):
+    """Split a UID string into a prefix, number, name, and error message."""
+    with_sep, without_sep = _uid_patterns(sep_chars)
+    m = with_sep.match(value)
+    if m:
+        try:
+            num = int(m.group(2))
+            return Prefix(m.group(1)), num, "", None
+        except ValueError:
+            return Prefix(m.group(1)), -1, sys.intern(m.group(2)), None
+    m = without_sep.match(value)
+    if m:
+        num = int(m.group(2))
+        return Prefix(m.group(1).rstrip(sep_chars)), num, "", None
+    return None, None, None, "invalid UID: {}".format(value)
+
+
 class _Literal(str):
     """Custom type for text which should be dumped in the literal style."""
 
+    __slots__ = ()
+
     @staticmethod
     def representer(dumper, data):
         """Return a custom dumper that formats str in the literal style."""
         return dumper.represent_scalar(
-            "tag:yaml.org,2002:str", data, style="|" if data else ""
+            "tag:yaml.org,2002:str", str(data), style="|" if data else ""
         )
 
 
 yaml.add_representer(_Literal, _Literal.representer)
+if yaml.__with_libyaml__:
+    yaml.add_representer(_Literal, _Literal.representer, Dumper=yaml.CDumper)
 
 
 class Text(str):
     """Markdown text paragraph."""
 
+    __slots__ = ()
+
     def __new__(cls, value=""):
         assert not isinstance(value, Text)
         obj = super(Text, cls).__new__(cls, Text.load_text(value))  # type: ignore
@@ -321,6 +359,8 @@ class Level:
     identifying "heading" levels when written to file.
     """
 
+    __slots__ = ("_parts", "heading")
+
     def __init__(self, value=None, heading=None):
         """Initialize an item level from a sequence of numbers.
 
@@ -547,6 +587,8 @@ class Stamp:
 
     """
 
+    __slots__ = ("value",)
+
     def __init__(self, *values):
         if not values:
             self.value = None
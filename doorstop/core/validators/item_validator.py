@@ -4,6 +4,7 @@
 
 from doorstop import common, settings
 from doorstop.common import DoorstopError, DoorstopInfo, DoorstopWarning
+from doorstop.core import report
 from doorstop.core.types import UID, Stamp
 
 log = common.logger(__name__)
@@ -12,6 +13,12 @@ log = common.logger(__name__)
 class ItemValidator:
     """Class for validation of Item objects."""
 
+    def __init__(self, readonly=False):
+        self.found_refs = []  # relative paths found for the last item's refs
+        self.reformatted = 0  # number of item files rewritten when reformatting
+        self.readonly = readonly  # leave saving and reviewing items to the caller
+        self.review = False  # the last item must be reviewed by the caller
+
     def validate(self, item, skip=None, document_hook=None, item_hook=None):
         """Check the object for validity.
 
@@ -57,6 +64,8 @@ class ItemValidator:
         skip = [] if skip is None else skip
 
         log.info("checking item %s...", item)
+        self.found_refs = []
+        self.review = False
 
         # Verify the file can be parsed
         item.load()
@@ -66,8 +75,8 @@ class ItemValidator:
             log.info("skipped inactive item: %s", item)
             return
 
-        # Delay item save if reformatting
-        if settings.REFORMAT:
+        # Delay item save if reformatting (or never save a read-only check)
+        if settings.REFORMAT or self.readonly:
             item.auto = False
 
         # Check text
@@ -76,31 +85,34 @@ class ItemValidator:
 
         # Check external refs and references
         if settings.CHECK_REF:
-            try:
-                item.find_ref()
-                item.find_references()
-            except DoorstopError as exc:
-                yield exc
+            yield from report.check("references", self._get_issues_refs(item))
 
         # Check links
         if not item.normative and item.links:
             yield DoorstopWarning("non-normative, but has links")
 
         # Check links against the document
-        yield from self._get_issues_document(item, item.document, skip)
+        yield from report.check(
+            "links", self._get_issues_document(item, item.document, skip)
+        )
 
         if item.tree:
             # Check links against the tree
-            yield from self._get_issues_tree(item, item.tree)
+            yield from report.check("links", self._get_issues_tree(item, item.tree))
 
             # Check links against both document and tree
-            yield from self._get_issues_both(item, item.document, item.tree, skip)
+            yield from report.check(
+                "child-links",
+                self._get_issues_both(item, item.document, item.tree, skip),
+            )
 
         # Check review status
         if not item.reviewed:
             if settings.CHECK_REVIEW_STATUS:
                 if not item.is_reviewed():
-                    if settings.REVIEW_NEW_ITEMS:
+                    if settings.REVIEW_NEW_ITEMS and self.readonly:
+                        self.review = True
+                    elif settings.REVIEW_NEW_ITEMS:
                         item.review()
                     else:
                         yield DoorstopInfo("needs initial review")
@@ -108,9 +120,76 @@ class ItemValidator:
                     yield DoorstopWarning("unreviewed changes")
 
         # Reformat the file
+        if settings.REFORMAT and not self.readonly:
+            self._reformat(item)
+
+    def check(self, item, skip=None):
+        """Check a copy of an item without saving or reviewing it.
+
+        :param item: item to check (in a read-only validator)
+        :param skip: list of document prefixes to skip
+
+        :return: result to pass to :meth:`apply` for the original item
+
+        """
+        assert self.readonly
+        issues = list(self.get_issues(item, skip=skip))
+        return issues, self.found_refs, item.links, self.review
+
+    def apply(self, item, result):
+        """Yield the issues found by :meth:`check` and update the item.
+
+        The item's links are updated like a serial check would, then the
+        item is reviewed and reformatted here so that only the process
+        owning the item writes its file.
+
+        :param item: original item checked by :meth:`check`
+        :param result: result of :meth:`check`
+
+        :return: generator of :class:`~doorstop.common.DoorstopError`,
+                              :class:`~doorstop.common.DoorstopWarning`,
+                              :class:`~doorstop.common.DoorstopInfo`
+
+        """
+        issues, self.found_refs, links, review = result
+        yield from issues
+
+        if not item.active:
+            return
+
         if settings.REFORMAT:
-            log.debug("reformatting item %s...", item)
-            item.save()
+            item.auto = False
+
+        # Keep new link stamps and reformatted UIDs in memory only
+        if [(str(uid), uid.stamp) for uid in links] != [
+            (str(uid), uid.stamp) for uid in item.links
+        ]:
+            auto, item.auto = item.auto, False
+            item.links = links
+            item.auto = auto
+
+        if not item.reviewed and review:
+            item.review()
+
+        if settings.REFORMAT:
+            self._reformat(item)
+
+    def _reformat(self, item):
+        """Save an item's file in the standard format."""
+        log.debug("reformatting item %s...", item)
+        item.save()
+        if not item._unchanged:  # pylint: disable=protected-access
+            self.reformatted += 1
+
+    def _get_issues_refs(self, item):
+        """Yield all the item's issues with its external references."""
+        try:
+            found = [item.find_ref(), *(item.find_references() or [])]
+        except DoorstopError as exc:
+            self.found_refs = None
+            yield exc
+        else:
+            self.found_refs = [ref[0] for ref in found if ref and ref[0]]
 
     @staticmethod
     def _get_issues_document(item, document, skip):
@@ -173,14 +252,7 @@ class ItemValidator:
                     msg = "linked to non-normative item: {}".format(parent)
                     yield DoorstopWarning(msg)
                 # check the link status
-                if uid.stamp == Stamp(True):
-                    uid.stamp = parent.stamp()
-                elif not str(uid.stamp) and settings.STAMP_NEW_LINKS:
-                    uid.stamp = parent.stamp()
-                elif uid.stamp != parent.stamp():
-                    if settings.CHECK_SUSPECT_LINKS:
-                        msg = "suspect link: {}".format(parent)
-                        yield DoorstopWarning(msg)
+                yield from report.check("suspect", self._get_issues_stamp(uid, parent))
                 # reformat the item's UID
                 identifiers.add(UID(parent.uid, stamp=uid.stamp))
 
@@ -188,6 +260,18 @@ class ItemValidator:
         if settings.REFORMAT:
             item.links = identifiers
 
+    @staticmethod
+    def _get_issues_stamp(uid, parent):
+        """Yield the issues of a link's stamp (updating new stamps)."""
+        if uid.stamp == Stamp(True):
+            uid.stamp = parent.stamp()
+        elif not str(uid.stamp) and settings.STAMP_NEW_LINKS:
+            uid.stamp = parent.stamp()
+        elif uid.stamp != parent.stamp():
+            if settings.CHECK_SUSPECT_LINKS:
+                msg = "suspect link: {}".format(parent)
+                yield DoorstopWarning(msg)
+
     def _get_issues_both(self, item, document, tree, skip):
         """Yield all the item's issues against its document and tree."""
         log.debug("getting issues against document and tree...")
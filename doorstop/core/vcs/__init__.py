@@ -3,6 +3,7 @@
 """Interfaces to version control systems."""
 
 import os
+from contextlib import contextmanager
 
 from doorstop import common
 from doorstop.common import DoorstopError
@@ -18,6 +19,8 @@ DIRECTORIES = {
 
 log = common.logger(__name__)
 
+_queued = None  # working copies loaded while operations are queued
+
 
 def find_root(cwd):
     """Find the root of the working copy.
@@ -48,7 +51,29 @@ def load(path):
     """Return a working copy for the specified path."""
     for directory in os.listdir(path):
         if directory in DIRECTORIES:
-            return DIRECTORIES[directory](path)  # type: ignore
-
-    log.warning("no working copy found at: {}".format(path))
-    return DEFAULT(path)
+            working_copy = DIRECTORIES[directory](path)  # type: ignore
+            break
+    else:
+        log.warning("no working copy found at: {}".format(path))
+        working_copy = DEFAULT(path)
+
+    if _queued is not None:
+        working_copy.start()
+        _queued.append(working_copy)
+    return working_copy
+
+
+@contextmanager
+def queued():
+    """Queue file operations of working copies loaded until the block exits."""
+    global _queued  # pylint: disable=W0603
+    if _queued is not None:
+        yield
+        return
+    _queued = []
+    try:
+        yield
+    finally:
+        working_copies, _queued = _queued, None
+        for working_copy in working_copies:
+            working_copy.flush()
@@ -4,9 +4,11 @@
 
 import fnmatch
 import os
+import re
 import subprocess
 from abc import ABCMeta, abstractmethod
-from typing import List, Optional, Tuple
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Pattern, Tuple
 
 from doorstop import common, settings
 
@@ -18,11 +20,27 @@ class BaseWorkingCopy(metaclass=ABCMeta):
 
     DIRECTORY: Optional[str] = None  # special hidden directory for the working copy
     IGNORES: Tuple = ()  # hidden filenames containing ignore patterns
+    BATCH = 100  # maximum number of paths passed to a single command
+    # operation left for a file after queuing another one (None: nothing to do)
+    COLLAPSE = {
+        ("add", "add"): "add",
+        ("add", "edit"): "add",
+        ("add", "delete"): None,
+        ("edit", "add"): "add",
+        ("edit", "edit"): "edit",
+        ("edit", "delete"): "delete",
+        ("delete", "add"): "edit",
+        ("delete", "edit"): "edit",
+        ("delete", "delete"): "delete",
+    }
 
     def __init__(self, path):
         self.path = path
+        self._queue: Optional[Dict[str, str]] = None  # operation by path
         self._ignores_cache: Optional[List[str]] = None
+        self._ignores_regex: Optional[Pattern] = None
         self._path_cache: Optional[List[Tuple[str, str, str]]] = None
+        self._path_index: Optional[Dict[str, str]] = None
 
     @staticmethod
     def relpath(path):
@@ -46,19 +64,31 @@ class BaseWorkingCopy(metaclass=ABCMeta):
         """Pull, update, and lock a file for editing."""
         raise NotImplementedError
 
-    @abstractmethod
-    def edit(self, path):  # pragma: no cover (abstract method)
+    def edit(self, path):
         """Mark a file as modified."""
+        self._run("edit", path)
+
+    def add(self, path):
+        """Start tracking a file."""
+        self._run("add", path)
+
+    def delete(self, path):
+        """Stop tracking a file."""
+        self._run("delete", path)
+
+    @abstractmethod
+    def _edit(self, paths):  # pragma: no cover (abstract method)
+        """Mark files as modified (returning a nonzero code on failure)."""
         raise NotImplementedError
 
     @abstractmethod
-    def add(self, path):  # pragma: no cover (abstract method)
-        """Start tracking a file."""
+    def _add(self, paths):  # pragma: no cover (abstract method)
+        """Start tracking files (returning a nonzero code on failure)."""
         raise NotImplementedError
 
     @abstractmethod
-    def delete(self, path):  # pragma: no cover (abstract method)
-        """Stop tracking a file."""
+    def _delete(self, paths):  # pragma: no cover (abstract method)
+        """Stop tracking files (returning a nonzero code on failure)."""
         raise NotImplementedError
 
     @abstractmethod
@@ -66,6 +96,77 @@ class BaseWorkingCopy(metaclass=ABCMeta):
         """Unlock files, commit, and push."""
         raise NotImplementedError
 
+    def changed(self, since, until="HEAD"):
+        """Get the files changed between two revisions.
+
+        :param since: revision to compare from (through its merge base
+            with `until`)
+        :param until: revision to compare to
+
+        :raises: :class:`~doorstop.common.DoorstopError` if the working
+            copy cannot compare revisions
+
+        :return: list of absolute paths (including deleted files)
+
+        """
+        name = type(self).__module__.rsplit(".", 1)[-1]
+        msg = "comparing revisions is not supported with {}".format(name)
+        raise common.DoorstopError(msg)
+
+    @contextmanager
+    def queued(self):
+        """Collect edited, added, and deleted files until the block exits."""
+        if self._queue is not None:
+            yield
+            return
+        self.start()
+        try:
+            yield
+        finally:
+            self.flush()
+
+    def start(self):
+        """Start collecting edited, added, and deleted files."""
+        if self._queue is None:
+            self._queue = {}
+
+    def flush(self):
+        """Process collected files in batches and stop collecting.
+
+        Each file gets the single operation that leaves it in its final
+        state (e.g. a file deleted and added again is only edited).
+
+        """
+        queue, self._queue = self._queue, None
+        for name in ("delete", "add", "edit"):
+            paths = [path for path, _name in (queue or {}).items() if _name == name]
+            if paths:
+                log.debug("processing %s queued file(s) to %s...", len(paths), name)
+            for index in range(0, len(paths), self.BATCH):
+                self._process(name, paths[index : index + self.BATCH])
+
+    def _run(self, name, path):
+        """Run an operation on a file now or queue it for a batch."""
+        if self._queue is None:
+            self._process(name, [path])
+        elif path in self._queue:
+            collapsed = self.COLLAPSE[self._queue.pop(path), name]
+            if collapsed:
+                self._queue[path] = collapsed
+        else:
+            self._queue[path] = name
+
+    def _process(self, name, paths):
+        """Run an operation on files (one at a time if the batch fails)."""
+        if not getattr(self, "_" + name)(paths):
+            return
+        if len(paths) > 1:
+            log.debug("unable to %s files together, trying one at a time...", name)
+            for path in paths:
+                self._process(name, [path])
+        else:
+            log.warning("unable to {} file: {}".format(name, paths[0]))
+
     @property
     def ignores(self):
         """Yield glob expressions to ignore."""
@@ -87,22 +188,53 @@ class BaseWorkingCopy(metaclass=ABCMeta):
         if self._path_cache is None or not settings.CACHE_PATHS:
             log.debug("reading and caching all file paths...")
             self._path_cache = []
-            for dirpath, _, filenames in os.walk(self.path):
-                for filename in filenames:
-                    path = os.path.join(dirpath, filename)
-                    relpath = os.path.relpath(path, self.path)
-                    # Skip ignored paths
-                    if self.ignored(relpath):
-                        continue
-                    # Skip hidden paths
-                    if os.path.sep + "." in os.path.sep + relpath:
-                        continue
-                    self._path_cache.append((path, filename, relpath))
+            self._path_index = {}
+            for path, filename, relpath in self._list_paths():
+                # Skip hidden paths
+                if os.path.sep + "." in os.path.sep + relpath:
+                    continue
+                self._path_cache.append((path, filename, relpath))
+                self._path_index[self._normpath(path)] = relpath
         yield from self._path_cache
 
+    def _list_paths(self):
+        """Yield (path, filename, relpath) for every non-ignored file."""
+        for dirpath, _, filenames in os.walk(self.path):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                relpath = os.path.relpath(path, self.path)
+                # Skip ignored paths
+                if self.ignored(relpath):
+                    continue
+                yield path, filename, relpath
+
     def ignored(self, path):
         """Determine if a path matches an ignored pattern."""
-        for pattern in self.ignores:
-            if fnmatch.fnmatch(path, pattern):
-                return True
-        return False
+        if self._ignores_regex is None:
+            patterns = [fnmatch.translate(os.path.normcase(p)) for p in self.ignores]
+            self._ignores_regex = re.compile("|".join(patterns) or r"(?!)")
+        return self._ignores_regex.match(os.path.normcase(path)) is not None
+
+    def find_path(self, path):
+        """Get the relative path of a non-ignored file in the working copy.
+
+        :param path: absolute path to a file
+
+        :return: relative path or None (when the file is not a working
+            copy path)
+
+        """
+        if (
+            self._path_cache is None
+            or self._path_index is None
+            or not settings.CACHE_PATHS
+        ):
+            self._path_index = {
+                self._normpath(_path): relpath for _path, _, relpath in self.paths
+            }
+        return self._path_index.get(self._normpath(path))
+
+    @staticmethod
+    def _normpath(path):
+        """Normalize a path for lookups in the path index."""
+        return os.path.normpath(os.path.abspath(path))
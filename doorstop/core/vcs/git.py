@@ -2,6 +2,9 @@
 
 """Plug-in module to store requirements in a Git repository."""
 
+import os
+import subprocess
+
 from doorstop import common
 from doorstop.core.vcs.base import BaseWorkingCopy
 
@@ -18,16 +21,70 @@ class WorkingCopy(BaseWorkingCopy):
         log.debug("`git` does not support locking: %s", path)
         self.call("git", "pull")
 
-    def edit(self, path):
-        self.call("git", "add", self.relpath(path))
+    def _edit(self, paths):
+        return self.call("git", "add", *map(self.relpath, paths))
 
-    def add(self, path):
-        self.call("git", "add", self.relpath(path))
+    def _add(self, paths):
+        return self.call("git", "add", *map(self.relpath, paths))
 
-    def delete(self, path):
-        self.call("git", "rm", self.relpath(path), "--force", "--quiet")
+    def _delete(self, paths):
+        return self.call("git", "rm", *map(self.relpath, paths), "--force", "--quiet")
 
     def commit(self, message=None):
         message = message or input("Commit message: ")
         self.call("git", "commit", "--all", "--message", message)
         self.call("git", "push")
+
+    def changed(self, since, until="HEAD"):
+        args = (
+            "git",
+            "-C",
+            self.path,
+            "diff",
+            "--name-only",
+            "--no-renames",
+            "-z",
+            "{}...{}".format(since, until),
+        )
+        log.debug("$ %s", " ".join(args))
+        try:
+            output = subprocess.check_output(args, stderr=subprocess.PIPE)
+        except FileNotFoundError:
+            raise common.DoorstopError("Command not found: git")
+        except subprocess.CalledProcessError as exc:
+            error = os.fsdecode(exc.stderr).strip().split("\n")[0]
+            msg = "unable to compare {} with {}: {}".format(since, until, error)
+            raise common.DoorstopError(msg) from None
+        return [
+            os.path.join(self.path, os.path.normpath(name))
+            for name in os.fsdecode(output).split("\0")
+            if name
+        ]
+
+    def _list_paths(self):
+        args = (
+            "git",
+            "-C",
+            self.path,
+            "ls-files",
+            "-z",
+            "--cached",
+            "--others",
+            "--exclude-standard",
+        )
+        log.debug("$ %s", " ".join(args))
+        try:
+            output = subprocess.check_output(args, stderr=subprocess.DEVNULL)
+        except (OSError, subprocess.CalledProcessError) as exc:
+            log.debug("unable to list files with `git`: %s", exc)
+            yield from super()._list_paths()
+            return
+        for name in sorted(set(os.fsdecode(output).split("\0"))):
+            if not name:
+                continue
+            relpath = os.path.normpath(name)
+            path = os.path.join(self.path, relpath)
+            # Skip tracked files deleted from the working copy
+            if not os.path.isfile(path):
+                continue
+            yield path, os.path.basename(relpath), relpath
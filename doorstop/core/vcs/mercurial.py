@@ -18,14 +18,14 @@ class WorkingCopy(BaseWorkingCopy):
         log.debug("`hg` does not support locking: {}".format(path))
         self.call("hg", "pull", "-u")
 
-    def edit(self, path):
-        self.call("hg", "add", path)
+    def _edit(self, paths):
+        return self.call("hg", "add", *paths)
 
-    def add(self, path):
-        self.call("hg", "add", path)
+    def _add(self, paths):
+        return self.call("hg", "add", *paths)
 
-    def delete(self, path):
-        self.call("hg", "remove", path, "--force")
+    def _delete(self, paths):
+        return self.call("hg", "remove", *paths, "--force")
 
     def commit(self, message=None):
         message = message or input("Commit message: ")
@@ -22,15 +22,21 @@ class WorkingCopy(BaseWorkingCopy):
     def lock(self, path):
         log.debug("$ simulated lock on: {}...".format(path))
 
-    def edit(self, path):
-        log.debug("$ simulated edit on: {}...".format(path))
+    def _edit(self, paths):
+        for path in paths:
+            log.debug("$ simulated edit on: {}...".format(path))
 
-    def add(self, path):
-        log.debug("$ simulated add on: {}...".format(path))
+    def _add(self, paths):
+        for path in paths:
+            log.debug("$ simulated add on: {}...".format(path))
 
     def delete(self, path):
         os.remove(path)
-        log.debug("$ Deleted {}...".format(path))
+        super().delete(path)
+
+    def _delete(self, paths):
+        for path in paths:
+            log.debug("$ Deleted {}...".format(path))
 
     def commit(self, message=None):
         log.debug("$ simulated commit")
@@ -20,14 +20,14 @@ class WorkingCopy(BaseWorkingCopy):
         self.call("svn", "update")
         self.call("svn", "lock", path)
 
-    def edit(self, path):
+    def _edit(self, paths):
         log.debug("`svn` adds all changes")
 
-    def add(self, path):
-        self.call("svn", "add", path)
+    def _add(self, paths):
+        return self.call("svn", "add", *paths)
 
-    def delete(self, path):
-        self.call("svn", "delete", path)
+    def _delete(self, paths):
+        return self.call("svn", "delete", *paths)
 
     def commit(self, message=None):
         message = message or input("Commit message: ")
@@ -20,14 +20,14 @@ class SampleWorkingCopy(BaseWorkingCopy):
     def lock(self, path):
         print(path)
 
-    def edit(self, path):
-        print(path)
+    def _edit(self, paths):
+        print(paths)
 
-    def add(self, path):
-        print(path)
+    def _add(self, paths):
+        print(paths)
 
-    def delete(self, path):
-        print(path)
+    def _delete(self, paths):
+        print(paths)
 
     def commit(self, message=None):
         print(message)
@@ -47,6 +47,12 @@ class TestSampleWorkingCopy(unittest.TestCase):
         self.assertTrue(self.wc.ignored("path/to/published.html"))
         self.assertTrue(self.wc.ignored("build/path/to/anything"))
 
+    def test_ignored_no_patterns(self):
+        """Verify nothing is ignored without patterns."""
+        wc = SampleWorkingCopy(None)
+        wc._ignores_cache = []
+        self.assertFalse(wc.ignored("anything.txt"))
+
     @patch("os.environ", {})
     def test_paths(self):
         """Verify that paths are cached correctly."""
@@ -56,3 +62,13 @@ class TestSampleWorkingCopy(unittest.TestCase):
         self.assertNotEqual(
             [], [x for x in paths if x.startswith(os.path.join("doorstop", ""))]
         )
+
+    @patch("os.environ", {})
+    def test_find_path(self):
+        """Verify paths are looked up by their normalized absolute path."""
+        wc = SampleWorkingCopy(ROOT)
+        relpath = os.path.join("doorstop", "__init__.py")
+        path = os.path.join(ROOT, "doorstop", "core", "..", "__init__.py")
+        self.assertEqual(relpath, wc.find_path(path))
+        self.assertIsNone(wc.find_path(os.path.join(ROOT, "unknown.txt")))
+        self.assertIsNone(wc.find_path(os.path.join(ROOT, ".git", "HEAD")))
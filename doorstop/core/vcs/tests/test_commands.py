@@ -2,11 +2,57 @@
 
 """Unit tests for the doorstop.vcs plugin modules."""
 
+import os
+import shutil
+import subprocess
+import tempfile
 import unittest
 from unittest.mock import Mock, call, patch
 
+from doorstop import common
 from doorstop.common import DoorstopError
-from doorstop.core.vcs import load
+from doorstop.core.vcs import load, queued
+
+
+@patch("subprocess.call")
+class TestQueued(unittest.TestCase):
+    """Tests for queuing operations across working copies."""
+
+    def test_load(self, mock_call):
+        """Verify working copies loaded in the block are flushed on exit."""
+        mock_call.return_value = 0
+        with patch("os.listdir", Mock(return_value=[".git"])):
+            with queued():
+                wc = load(".")
+                wc.add("a.txt")
+                wc.add("b.txt")
+                mock_call.assert_not_called()
+        mock_call.assert_called_once_with(("git", "add", "a.txt", "b.txt"))
+        wc.add("c.txt")
+        mock_call.assert_called_with(("git", "add", "c.txt"))
+
+
+class TestMockVCS(unittest.TestCase):
+    """Tests for the simulated working copy."""
+
+    def setUp(self):
+        self.temp = tempfile.mkdtemp()
+        os.mkdir(os.path.join(self.temp, ".mockvcs"))
+        self.path = os.path.join(self.temp, "a.yml")
+        common.touch(self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp)
+
+    def test_queued_delete_then_add(self):
+        """Verify a file deleted and created again in a batch is kept."""
+        with queued():
+            wc = load(self.temp)
+            wc.delete(self.path)
+            self.assertFalse(os.path.exists(self.path))
+            common.touch(self.path)
+            wc.add(self.path)
+        self.assertTrue(os.path.isfile(self.path))
 
 
 class BaseTestCase:
@@ -78,6 +124,77 @@ class TestGit(BaseTestCase, unittest.TestCase):
         calls = [call(("git", "rm", self.path, "--force", "--quiet"))]
         mock_call.assert_has_calls(calls)
 
+    def test_queued(self, mock_call):
+        """Verify Git adds and removes queued files in batches."""
+        mock_call.return_value = 0
+        with self.wc.queued():
+            self.wc.add("a.txt")
+            self.wc.edit("b.txt")
+            self.wc.edit("a.txt")
+            self.wc.delete("c.txt")
+            self.wc.delete("d.txt")
+            mock_call.assert_not_called()
+        calls = [
+            call(("git", "rm", "c.txt", "d.txt", "--force", "--quiet")),
+            call(("git", "add", "a.txt")),
+            call(("git", "add", "b.txt")),
+        ]
+        self.assertEqual(calls, mock_call.call_args_list)
+
+    def test_queued_delete_then_add(self, mock_call):
+        """Verify a file deleted and added again in a batch is kept."""
+        mock_call.return_value = 0
+        with self.wc.queued():
+            self.wc.delete("a.txt")
+            self.wc.add("a.txt")
+            self.wc.add("b.txt")
+            self.wc.delete("b.txt")
+            self.wc.edit("c.txt")
+            self.wc.delete("c.txt")
+        calls = [
+            call(("git", "rm", "c.txt", "--force", "--quiet")),
+            call(("git", "add", "a.txt")),
+        ]
+        self.assertEqual(calls, mock_call.call_args_list)
+
+    @patch("doorstop.core.vcs.base.log")
+    def test_queued_failure(self, mock_log, mock_call):
+        """Verify files are retried one at a time when a batch fails."""
+        mock_call.side_effect = lambda args: int("bad.txt" in args)
+        with self.wc.queued():
+            self.wc.add("a.txt")
+            self.wc.add("bad.txt")
+            self.wc.add("b.txt")
+        calls = [
+            call(("git", "add", "a.txt", "bad.txt", "b.txt")),
+            call(("git", "add", "a.txt")),
+            call(("git", "add", "bad.txt")),
+            call(("git", "add", "b.txt")),
+        ]
+        self.assertEqual(calls, mock_call.call_args_list)
+        mock_log.warning.assert_called_once_with("unable to add file: bad.txt")
+
+    def test_queued_chunks(self, mock_call):
+        """Verify Git splits large batches across commands."""
+        mock_call.return_value = 0
+        self.wc.BATCH = 2
+        with self.wc.queued():
+            for name in "abcde":
+                self.wc.add(name)
+        calls = [
+            call(("git", "add", "a", "b")),
+            call(("git", "add", "c", "d")),
+            call(("git", "add", "e")),
+        ]
+        self.assertEqual(calls, mock_call.call_args_list)
+
+    def test_queued_missing_command(self, mock_call):
+        """Verify a missing command is reported when the batch runs."""
+        mock_call.side_effect = FileNotFoundError
+        with self.assertRaises(DoorstopError):
+            with self.wc.queued():
+                self.add()
+
     def test_commit(self, mock_call):
         """Verify Git can commit files."""
         self.commit()
@@ -87,6 +204,48 @@ class TestGit(BaseTestCase, unittest.TestCase):
         ]
         mock_call.assert_has_calls(calls)
 
+    @patch("os.path.isfile", Mock(side_effect=lambda path: "deleted" not in path))
+    @patch("subprocess.check_output")
+    def test_paths(self, mock_check_output, _):
+        """Verify Git lists files in a single command."""
+        mock_check_output.return_value = b"b.txt\0a/deleted.txt\0.hidden\0a/c.md\0"
+        paths = [relpath for _, _, relpath in self.wc.paths]
+        self.assertEqual([os.path.join("a", "c.md"), "b.txt"], paths)
+        mock_check_output.assert_called_once()
+        args = mock_check_output.call_args[0][0]
+        self.assertEqual(
+            ("ls-files", "-z", "--cached", "--others", "--exclude-standard"),
+            args[3:],
+        )
+
+    @patch("doorstop.core.vcs.base.BaseWorkingCopy._list_paths")
+    @patch("subprocess.check_output", Mock(side_effect=FileNotFoundError))
+    def test_paths_missing_command(self, mock_list_paths, _):
+        """Verify Git falls back to walking the working copy."""
+        mock_list_paths.return_value = [("path/a.txt", "a.txt", "a.txt")]
+        paths = [relpath for _, _, relpath in self.wc.paths]
+        self.assertEqual(["a.txt"], paths)
+
+    @patch("subprocess.check_output")
+    def test_changed(self, mock_check_output, _):
+        """Verify Git lists the files changed since a revision."""
+        mock_check_output.return_value = b"a/b.yml\0c.yml\0"
+        paths = self.wc.changed("main")
+        expected = [os.path.join(".", "a", "b.yml"), os.path.join(".", "c.yml")]
+        self.assertEqual(expected, paths)
+        args = mock_check_output.call_args[0][0]
+        self.assertEqual(("diff", "--name-only", "--no-renames", "-z"), args[3:7])
+        self.assertEqual("main...HEAD", args[-1])
+
+    @patch("subprocess.check_output")
+    def test_changed_error(self, mock_check_output, _):
+        """Verify an unknown revision is reported."""
+        mock_check_output.side_effect = subprocess.CalledProcessError(
+            128, "git", stderr=b"fatal: bad revision\nmore"
+        )
+        with self.assertRaisesRegex(DoorstopError, "fatal: bad revision$"):
+            self.wc.changed("unknown")
+
 
 @patch("subprocess.call")
 class TestSubversion(BaseTestCase, unittest.TestCase):
@@ -100,6 +259,10 @@ class TestSubversion(BaseTestCase, unittest.TestCase):
         calls = [call(("svn", "update")), call(("svn", "lock", self.path))]
         mock_call.assert_has_calls(calls)
 
+    def test_changed(self, _):
+        """Verify Subversion cannot compare revisions."""
+        self.assertRaises(DoorstopError, self.wc.changed, "1")
+
     def test_edit(self, mock_call):
         """Verify Subversion can (fake) edit files."""
         self.edit()
@@ -154,6 +317,15 @@ class TestMercurial(BaseTestCase, unittest.TestCase):
         calls = [call(("hg", "remove", self.path, "--force"))]
         mock_call.assert_has_calls(calls)
 
+    def test_queued(self, mock_call):
+        """Verify Mercurial removes queued files in one command."""
+        mock_call.return_value = 0
+        with self.wc.queued():
+            self.wc.delete("a.txt")
+            self.wc.delete("b.txt")
+        calls = [call(("hg", "remove", "a.txt", "b.txt", "--force"))]
+        self.assertEqual(calls, mock_call.call_args_list)
+
     def test_commit(self, mock_call):
         """Verify Mercurial can commit files."""
         self.commit()
@@ -27,6 +27,9 @@ PLACEHOLDER_COUNT = 1  # number of placeholders to include on export
 # Formatting settings
 MAX_LINE_LENGTH = 79  # line length to trigger multiline on extended attributes
 
+# Parsing settings
+LIBYAML = True  # use the libyaml C bindings for YAML when available
+
 # Validation settings
 REFORMAT = True  # reformat item files during validation
 REORDER = False  # reorder document levels during validation
@@ -59,6 +62,9 @@ ADDREMOVE_FILES = True  # automatically add/remove new/changed files
 CACHE_ITEMS = True  # cache items in documents and trees
 CACHE_DOCUMENTS = True  # cache documents in trees
 CACHE_PATHS = True  # cache file/directory paths and contents
+CACHE_FILES = False  # persist parsed item files between runs (CLI default)
+CACHE_VALIDATION = False  # reuse issues of unchanged items between runs (CLI default)
+CACHE_PUBLISH = False  # skip publishing unchanged documents (CLI default)
 
 # Server settings
 SERVER_HOST = None  # '' = server not specified, None = no server in use
@@ -7,10 +7,39 @@ from random import random
 from doorstop import DoorstopError, DoorstopInfo, DoorstopWarning
 
 
+def items_validator(items):
+    # Look up the repository root once for all items of the document
+    repo_root = None
+    for item in items:
+        if getattr(item, "references") == None:
+            continue
+        if repo_root is None:
+            repo_root = _get_repo_root()
+        for issue in _get_issues(item, repo_root):
+            yield item, issue
+
+
 def item_validator(item):
     if getattr(item, "references") == None:
         return []
 
+    yield from _get_issues(item, _get_repo_root())
+
+
+def _get_repo_root():
+    # Get repository root using cross-platform method
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--show-toplevel"],
+            text=True,
+            stderr=subprocess.DEVNULL
+        ).strip()
+    except subprocess.CalledProcessError:
+        # Fallback if not in git repo
+        return os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+
+def _get_issues(item, repo_root):
     for ref in item.references:
         if ref['sha'] != item._hash_reference(ref['path']):
             yield DoorstopWarning("Hash has changed and it was not reviewed properly")
@@ -18,18 +47,7 @@ def item_validator(item):
         if 'modified' in ref['path']:
             temp_item = copy(item)
             current_value = item.is_reviewed()
-            
-            # Get repository root using cross-platform method
-            try:
-                repo_root = subprocess.check_output(
-                    ["git", "rev-parse", "--show-toplevel"],
-                    text=True,
-                    stderr=subprocess.DEVNULL
-                ).strip()
-            except subprocess.CalledProcessError:
-                # Fallback if not in git repo
-                repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
-            
+
             test_file = os.path.join(repo_root, "reqs", "ext", "test-modified.file")
             
             # Write test content using Python file operations (cross-platform)